@@ -1,7 +1,12 @@
 # import monkeypatch  # noqa  # noreorder  # isort: skip
+import atexit
 import os
+import time
 from typing import Dict
 
+from flask import Response
+from flask import g
+from flask import request
 from slackeventsapi import SlackEventAdapter
 
 from src.code.const import api
@@ -10,8 +15,14 @@ from src.code.const import create_app
 from src.code.const import swagger
 from src.code.db import db
 from src.code.logger import create_logger
+from src.code.model.queued_event import QueuedEvent
 from src.code.scheduler.manager import SchedulerManager
-from src.code.utils.custom_event_adapter import CustomEventAdapter
+from src.code.utils.db_pool import DbPoolMetrics
+from src.code.utils.event_dispatcher import EventDispatcher
+from src.code.utils.event_dispatcher import EventQueueWorkerPool
+from src.code.utils.metrics import CONTENT_TYPE
+from src.code.utils.metrics import Metrics
+from src.code.utils.slack_webclient import SlackWebclient
 from src.code.utils.utils import required_envar
 
 logger = create_logger(__name__)
@@ -19,26 +30,31 @@ logger = create_logger(__name__)
 app = create_app("src.code.config.Config")
 slack_event_adapter = SlackEventAdapter(required_envar("SIGNING_SECRET"), "/slack/events", app)
 db.init_app(app)
+SlackWebclient.resolve_bot_id(client)
 if "SCHEDULER_LOADED" not in os.environ:
     os.environ["SCHEDULER_LOADED"] = "TRUE"
     scheduler_manager = SchedulerManager(app)
     scheduler_manager.start()
+if EventDispatcher.queue_mode:
+    event_queue_worker_pool = EventQueueWorkerPool(app, client)
+    event_queue_worker_pool.start()
+    atexit.register(event_queue_worker_pool.stop)
 
 
 # Reacting on a new message or a thread message
 @slack_event_adapter.on("message")
 def message(payload: Dict) -> None:
-    CustomEventAdapter.message(payload, client)
+    EventDispatcher.dispatch("message", payload, client)
 
 
 @slack_event_adapter.on("reaction_added")
 def add_reaction_to_request(payload) -> None:
-    CustomEventAdapter.add_reaction_to_request(payload, client)
+    EventDispatcher.dispatch("reaction_added", payload, client)
 
 
 @slack_event_adapter.on("reaction_removed")
 def remove_reaction_from_request(payload) -> None:
-    CustomEventAdapter.remove_reaction_from_request(payload, client)
+    EventDispatcher.dispatch("reaction_removed", payload, client)
 
 
 @app.route("/health", methods=["GET", "POST"])
@@ -51,6 +67,33 @@ def live():
     return "Success", 200
 
 
+@app.route("/db_pool", methods=["GET"])
+def db_pool():
+    return DbPoolMetrics.stats(db.engine.pool), 200
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    if EventDispatcher.queue_mode:
+        Metrics.set_gauge("event_queue_depth", QueuedEvent().get_queue_depth())
+    pool_stats = DbPoolMetrics.stats(db.engine.pool)
+    Metrics.set_gauge("db_pool_checked_out", pool_stats.get("checked_out", 0), pid=str(os.getpid()))
+    Metrics.set_gauge("db_pool_utilisation", pool_stats.get("utilisation", 0), pid=str(os.getpid()))
+    return Response(Metrics.render(), content_type=CONTENT_TYPE)
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def observe_request_latency(response):
+    if request.endpoint not in (None, "metrics", "health", "live") and "request_start" in g:
+        Metrics.observe("http_request_seconds", time.perf_counter() - g.request_start, endpoint=request.endpoint)
+    return response
+
+
 from src.code.admin_panel.error_handling import bad_request  # noqa
 from src.code.admin_panel.error_handling import conflict  # noqa
 from src.code.admin_panel.error_handling import error_server  # noqa
@@ -17,6 +17,7 @@ CREATE TABLE requests (
     completion_reactions JSON,
     form_answers JSON,
     request_types JSON,
+    rollup_request_types JSON,
     autoclose_status varchar(64),
     blocks_id INT
 );
@@ -40,7 +41,8 @@ CREATE TABLE control_panels (
     deactivation_ts DECIMAL(16, 6),
     label_questions varchar(1000),
     form_questions JSON,
-    channel_properties JSON
+    channel_properties JSON,
+    daily_report_version int NOT NULL DEFAULT 0
 );
 
 CREATE TABLE distributed_lock(
@@ -52,8 +54,96 @@ CREATE TABLE distributed_lock(
 
 CREATE TABLE blocks (id int primary key auto_increment, blocks json not null);
 
+CREATE TABLE requestor_profiles (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    requestor_id varchar(64) NOT NULL UNIQUE,
+    requestor_email varchar(1000),
+    requestor_team_id varchar(64),
+    updated_datetime_utc datetime NOT NULL
+);
+
+CREATE TABLE event_queue (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    event_type varchar(64) NOT NULL,
+    slack_channel_id varchar(64) NOT NULL,
+    payload JSON NOT NULL,
+    status varchar(64) NOT NULL,
+    attempts int NOT NULL DEFAULT 0,
+    claimed_by varchar(255),
+    claimed_datetime_utc datetime,
+    created_datetime_utc datetime NOT NULL
+);
+
+CREATE TABLE processed_events (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    event_id varchar(64) NOT NULL UNIQUE,
+    retry_num int,
+    received_datetime_utc datetime NOT NULL
+);
+
+CREATE TABLE autoclose_cursors (
+    slack_channel_id varchar(64) PRIMARY KEY,
+    latest_ts decimal(16,6) NOT NULL,
+    full_scan_datetime_utc datetime NOT NULL
+);
+
+CREATE TABLE autoclose_threads (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    slack_channel_id varchar(64) NOT NULL,
+    thread_ts decimal(16,6) NOT NULL,
+    latest_reply_ts decimal(16,6),
+    message JSON NOT NULL,
+    latest_reply JSON,
+    stale boolean NOT NULL DEFAULT FALSE
+);
+
+CREATE TABLE request_daily_rollups (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    slack_channel_id varchar(64) NOT NULL,
+    rollup_date date NOT NULL,
+    request_type varchar(100) NOT NULL,
+    created_count int NOT NULL DEFAULT 0,
+    started_count int NOT NULL DEFAULT 0,
+    completed_count int NOT NULL DEFAULT 0,
+    time_to_start_sketch JSON,
+    time_to_complete_sketch JSON
+);
+
+CREATE TABLE request_rollup_deltas (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    slack_channel_id varchar(64) NOT NULL,
+    rollup_date date NOT NULL,
+    request_types JSON NOT NULL,
+    metric varchar(16) NOT NULL,
+    delta int NOT NULL,
+    seconds decimal(16,6)
+);
+
+CREATE INDEX ind_processed_events_received on processed_events(received_datetime_utc);
+CREATE INDEX ind_event_queue_status_channel on event_queue(status, slack_channel_id, id);
 CREATE INDEX ind_blocks_id on requests(blocks_id);
 CREATE INDEX ind_blocks_id on thread_messages(blocks_id);
+CREATE UNIQUE INDEX ind_requests_channel_event_ts on requests(slack_channel_id, event_ts);
+CREATE INDEX ind_thread_messages_event_ts on thread_messages(event_ts);
+CREATE INDEX ind_thread_messages_request_event_ts on thread_messages(request_table_id, event_ts);
+CREATE INDEX ind_control_panels_channel_id on control_panels(slack_channel_id);
+CREATE UNIQUE INDEX ind_autoclose_threads_channel_thread_ts on autoclose_threads(slack_channel_id, thread_ts);
+CREATE UNIQUE INDEX ind_request_daily_rollups_channel_date_type on request_daily_rollups(slack_channel_id, rollup_date, request_type);
+
+-- versions of src/code/migrations already included in this script
+CREATE TABLE schema_migrations (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    version varchar(64) NOT NULL UNIQUE,
+    description varchar(255) NOT NULL,
+    applied_datetime_utc datetime NOT NULL
+);
+INSERT INTO schema_migrations (version, description, applied_datetime_utc) VALUES ('001', 'requestor_profiles', UTC_TIMESTAMP());
+INSERT INTO schema_migrations (version, description, applied_datetime_utc) VALUES ('002', 'event_queue', UTC_TIMESTAMP());
+INSERT INTO schema_migrations (version, description, applied_datetime_utc) VALUES ('003', 'processed_events', UTC_TIMESTAMP());
+INSERT INTO schema_migrations (version, description, applied_datetime_utc) VALUES ('004', 'hot_path_indexes', UTC_TIMESTAMP());
+INSERT INTO schema_migrations (version, description, applied_datetime_utc) VALUES ('005', 'autoclose_scan_state', UTC_TIMESTAMP());
+INSERT INTO schema_migrations (version, description, applied_datetime_utc) VALUES ('006', 'daily_report_version', UTC_TIMESTAMP());
+INSERT INTO schema_migrations (version, description, applied_datetime_utc) VALUES ('007', 'request_daily_rollups', UTC_TIMESTAMP());
 
 
 DELIMITER //
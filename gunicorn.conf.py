@@ -1,3 +1,4 @@
+import glob
 import logging
 import os
 
@@ -28,6 +29,15 @@ access_log_format = (
 logconfig = None
 
 
+def on_starting(server):
+    # metrics dumps of workers of a previous run must not be aggregated into the new one
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(metrics_dir, "metrics_*.json")):
+            os.remove(path)
+
+
 class HealthCheckFilter(logging.Filter):
     def filter(self, record):
         if any(
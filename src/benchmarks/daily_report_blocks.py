@@ -0,0 +1,117 @@
+"""Build time of the daily report blocks, the str.replace templates against DailyReportBlocks.
+
+    python -m src.benchmarks.daily_report_blocks --items 5000 --repeat 20
+
+Both implementations produce the JSON payloads of the pieces of one report; the blocks are serialised as the Slack
+client does with them.
+
+With 5000 items the medians of both are within the run to run noise, between about 20 and 30 ms each on a laptop.
+DailyReportBlocks is kept for producing valid JSON, not for speed.
+"""
+import argparse
+import datetime
+import json
+import statistics
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+
+from src.code.const import SLACK_DATETIME_FMT
+from src.code.report.daily_report_blocks import DailyReportBlocks
+from src.code.utils.utils import get_emojis_str_from_list
+
+# the templates the daily report was built from before DailyReportBlocks
+DAILY_REPORT_TEMPLATE = (
+    '[{"type":"header","text":'
+    '{"type":"plain_text","text":"$channel_name_placeholder","emoji":true}},'
+    '{"type":"section","text":{"type":"mrkdwn",'
+    '"text":"*Last Day $last_day_date_placeholder*\\n '
+    '*$last_day_completed_count_placeholder* completed | *$last_day_open_count_placeholder* open"}},'
+    '{"type":"divider"},'
+    '{"type":"section",'
+    '"text":{"type":"mrkdwn","text":"*Last day open items:*\\n $last_day_items_placeholder"}}'
+    "]"
+)
+DAILY_REPORT_TEMPLATE_CONT = (
+    "["
+    '{"type":"section",'
+    '"text":{"type":"mrkdwn","text":"*Last day open items - continuation:*\\n $last_day_items_placeholder"}}'
+    "]"
+)
+DAILY_REPORT_ITEM_TEMPLATE = (
+    "* _$start_datetime_utc_placeholder_  |  <$request_link_placeholder|request link>  |  $event_type_placeholder"
+)
+
+
+def _templates(items: List[Dict]) -> List[str]:
+    main_block = (
+        DAILY_REPORT_TEMPLATE.replace("$channel_name_placeholder", "channel")
+        .replace("$last_day_date_placeholder", "2022-04-21")
+        .replace("$last_day_completed_count_placeholder", "0")
+        .replace("$last_day_open_count_placeholder", str(len(items)))
+    )
+    main_block_limit = 3001 - len(main_block)
+    extra_block_limit = 3001 - len(DAILY_REPORT_TEMPLATE_CONT)
+    list_of_blocks: List[str] = []
+    temp = ""
+    temp_count = 0
+    for item in items:
+        adding_item = (
+            DAILY_REPORT_ITEM_TEMPLATE.replace(
+                "$start_datetime_utc_placeholder", item["start_datetime_utc"].strftime(SLACK_DATETIME_FMT)
+            )
+            .replace("$request_link_placeholder", item["request_link"])
+            .replace("$event_type_placeholder", get_emojis_str_from_list(item["event_type"]))
+        ) + "\n"
+        temp_count += len(adding_item)
+        if temp_count > (main_block_limit if len(list_of_blocks) == 0 else extra_block_limit):
+            list_of_blocks.append(temp)
+            temp_count = 0
+            temp = ""
+        temp += adding_item
+    list_of_blocks.append(temp)
+    return [
+        main_block.replace("$last_day_items_placeholder", block)
+        if idx == 0
+        else DAILY_REPORT_TEMPLATE_CONT.replace("$last_day_items_placeholder", block)
+        for idx, block in enumerate(list_of_blocks)
+    ]
+
+
+def _block_builder(items: List[Dict]) -> List[str]:
+    return [json.dumps(piece) for piece in DailyReportBlocks("channel", "2022-04-21", 0, len(items)).build(items)]
+
+
+def _measure(build: Callable[[List[Dict]], list], items: List[Dict], repeat: int) -> List[float]:
+    durations_ms: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(items)
+        durations_ms.append((time.perf_counter() - start) * 1000)
+    return durations_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    start_datetime_utc = datetime.datetime(2022, 4, 21, 8, 0, 21)
+    items = [
+        {
+            "start_datetime_utc": start_datetime_utc,
+            "request_link": f"https://workspace.slack.com/archives/C00000001/p{1650528021000000 + idx}",
+            "event_type": ["cloud-pr", "cloud-bug"],
+            "requestor": "U00000001",
+        }
+        for idx in range(args.items)
+    ]
+    for label, build in (("str.replace templates", _templates), ("DailyReportBlocks", _block_builder)):
+        durations_ms = _measure(build, items, args.repeat)
+        print(f"{label:<24} median={statistics.median(durations_ms):10.3f} ms  min={min(durations_ms):10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+from src.code.utils.db_pool import get_engine_options
 from src.code.utils.utils import required_envar
 
 
@@ -11,3 +12,4 @@ class Config:
     SLACK_TOKEN = required_envar("SLACK_TOKEN")
     SQLALCHEMY_TRACK_MODIFICATIONS = True
     SQLALCHEMY_DATABASE_URI = f"mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_database}"
+    SQLALCHEMY_ENGINE_OPTIONS = get_engine_options()
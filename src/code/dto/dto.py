@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
 
@@ -19,6 +20,12 @@ class NewRecordDto:
     request_types: Optional[Dict] = None
 
 
+@dataclass(frozen=True)
+class RequestorProfileDto:
+    email: str
+    team_id: str
+
+
 @dataclass(frozen=True)
 class CompletionReactionDto:
     completion_reactions: list[str]
@@ -36,6 +43,20 @@ class ReportDto:
     last_working_date: str
     last_day_total: int
     last_day_completed: int
-    last_day_completed_items: list
     last_day_open: int
-    last_day_open_items: list
+    last_day_open_items: Iterable
+
+
+@dataclass(frozen=True)
+class RequestStatsDto:
+    request_type: str
+    created: int
+    started: int
+    completed: int
+    # seconds, within the relative accuracy of PercentileSketch
+    time_to_start_p50: Optional[float]
+    time_to_start_p90: Optional[float]
+    time_to_start_p99: Optional[float]
+    time_to_complete_p50: Optional[float]
+    time_to_complete_p90: Optional[float]
+    time_to_complete_p99: Optional[float]
@@ -1,34 +1,200 @@
+import atexit
+import copy
+import importlib
 import json
 import logging
 import os
-from collections import OrderedDict
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 
 LOG_LEVEL: int = logging.INFO if os.getenv("DEBUG", "false") == "false" else logging.DEBUG
+# the module loggers hand their records to a queue that a listener thread writes out
+LOG_ASYNC: bool = os.getenv("LOG_ASYNC", "true").lower() == "true"
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+
+class JsonFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__(datefmt=DATE_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "@timestamp": self.formatTime(record, self.datefmt),
+            "logger_name": "slack-bot-app",
+            "module_name": record.module,
+            "function": record.funcName,
+            "pid": record.process,
+            "pname": record.processName,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        suppressed: Optional[int] = getattr(record, "suppressed", None)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        return json.dumps(entry, default=str)
+
+
+class RepeatedLogFilter(logging.Filter):
+    """Lets through at most `limit` INFO and DEBUG lines of a message template per logger and window.
+
+    The first line of the template in the next window carries the number of lines dropped in the previous one.
+    Warnings and errors are never dropped.
+    """
+
+    limit: int = int(os.getenv("LOG_REPEAT_LIMIT", 100))
+    window_seconds: float = float(os.getenv("LOG_REPEAT_WINDOW_SECONDS", 60))
+    max_templates: int = 10000
+    suppressed_total: int = 0
+    # (logger name, message template) -> [window start, lines in the window, lines dropped in the window]
+    _windows: Dict[Tuple[str, str], List[float]] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno > logging.INFO:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = RepeatedLogFilter._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                if window is None and len(RepeatedLogFilter._windows) >= self.max_templates:
+                    # messages formatted before logging make a template per line
+                    RepeatedLogFilter._windows.clear()
+                if window is not None and window[2]:
+                    setattr(record, "suppressed", int(window[2]))
+                RepeatedLogFilter._windows[key] = [now, 1, 0]
+                return True
+            if window[1] < self.limit:
+                window[1] += 1
+                return True
+            window[2] += 1
+            RepeatedLogFilter.suppressed_total += 1
+            return False
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._windows = {}
+            cls.suppressed_total = 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {"templates": len(cls._windows), "suppressed": cls.suppressed_total}
+
+
+class JsonQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the message is merged in the calling thread, the JSON encoding and the write happen in the listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = JsonFormatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _get_native(module: str, name: str) -> Any:
+    """The attribute as it was before gevent monkey patching, where threading.Thread would start a greenlet."""
+    monkey = sys.modules.get("gevent.monkey")
+    if monkey is not None:
+        return monkey.get_original(module, name)
+    return getattr(importlib.import_module(module), name)
+
+
+class NativeQueueListener(QueueListener):
+    """A QueueListener on an OS thread, also in a gevent worker.
+
+    Its queue is a native SimpleQueue the greenlets put to without blocking, and a slow write of the listener holds up
+    neither the hub nor the logging greenlets.
+    """
+
+    def __init__(self, *handlers: logging.Handler) -> None:
+        super().__init__(_get_native("queue", "SimpleQueue")(), *handlers)
+        for handler in handlers:
+            handler.lock = _get_native("_thread", "RLock")()
+        self._running: Optional[Any] = None
+
+    def start(self) -> None:
+        running = self._running = _get_native("_thread", "allocate_lock")()
+        running.acquire()
+        _get_native("_thread", "start_new_thread")(self._run, (running,))
+
+    def stop(self) -> None:
+        """Writes out the queued records and waits for the thread to end, a no-op when not running."""
+        if self._running is None:
+            return
+        self.enqueue_sentinel()
+        self._running.acquire()
+        self._running = None
+
+    def _run(self, running: Any) -> None:
+        try:
+            while True:
+                record = self.dequeue(True)
+                # enqueue_sentinel puts None
+                if record is None:
+                    break
+                self.handle(record)
+        finally:
+            running.release()
+
+
+class LogPipeline:
+    """The handler shared by all the module loggers, a queue handler in front of a listener thread by default."""
+
+    handler: Optional[logging.Handler] = None
+    _listener: Optional[NativeQueueListener] = None
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def get_handler(cls) -> logging.Handler:
+        with cls._lock:
+            if cls.handler is None:
+                stream_handler = logging.StreamHandler()
+                stream_handler.setFormatter(JsonFormatter())
+                if LOG_ASYNC:
+                    cls._listener = NativeQueueListener(stream_handler)
+                    cls.handler = JsonQueueHandler(cls._listener.queue)
+                    cls._listener.start()
+                    atexit.register(cls.stop)
+                    os.register_at_fork(after_in_child=cls._restart_listener)
+                else:
+                    cls.handler = stream_handler
+                cls.handler.addFilter(RepeatedLogFilter())
+            return cls.handler
+
+    @classmethod
+    def stop(cls) -> None:
+        """Writes out the queued records, called at exit."""
+        if cls._listener is not None:
+            cls._listener.stop()
+
+    @classmethod
+    def _restart_listener(cls) -> None:
+        # a forked worker has the queue but not the listener thread of its parent
+        if cls._listener is None or not isinstance(cls.handler, QueueHandler):
+            return
+        cls._listener = NativeQueueListener(*cls._listener.handlers)
+        cls.handler.queue = cls._listener.queue
+        cls._listener.start()
 
 
 def create_logger(name: str) -> logging.Logger:
     logger: logging.Logger = logging.getLogger(name)
     logger.setLevel(LOG_LEVEL)
-    logger.handlers = []
+    logger.handlers = [LogPipeline.get_handler()]
     logger.propagate = False
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter(
-        json.dumps(
-            OrderedDict(
-                [
-                    ("@timestamp", "%(asctime)s"),
-                    ("logger_name", "slack-bot-app"),
-                    ("module_name", "%(module)s"),
-                    ("function", "%(funcName)s"),
-                    ("pid", "%(process)d"),
-                    ("pname", "%(processName)s"),
-                    ("level", "%(levelname)s"),
-                    ("message", "%(message)s"),
-                ]
-            )
-        ),
-        "%Y-%m-%dT%H:%M:%S%z",
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
     return logger
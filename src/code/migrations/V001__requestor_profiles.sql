@@ -0,0 +1,8 @@
+-- emails and team ids of the requestors, cached to spare the users_info calls
+CREATE TABLE IF NOT EXISTS requestor_profiles (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    requestor_id varchar(64) NOT NULL UNIQUE,
+    requestor_email varchar(1000),
+    requestor_team_id varchar(64),
+    updated_datetime_utc datetime NOT NULL
+);
@@ -0,0 +1,13 @@
+-- Slack events waiting for the worker pool, claimed per channel
+CREATE TABLE IF NOT EXISTS event_queue (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    event_type varchar(64) NOT NULL,
+    slack_channel_id varchar(64) NOT NULL,
+    payload JSON NOT NULL,
+    status varchar(64) NOT NULL,
+    attempts int NOT NULL DEFAULT 0,
+    claimed_by varchar(255),
+    claimed_datetime_utc datetime,
+    created_datetime_utc datetime NOT NULL,
+    INDEX ind_event_queue_status_channel (status, slack_channel_id, id)
+);
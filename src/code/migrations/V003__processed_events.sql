@@ -0,0 +1,8 @@
+-- ids of the Slack events already handled, retries of the same event are dropped
+CREATE TABLE IF NOT EXISTS processed_events (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    event_id varchar(64) NOT NULL UNIQUE,
+    retry_num int,
+    received_datetime_utc datetime NOT NULL,
+    INDEX ind_processed_events_received (received_datetime_utc)
+);
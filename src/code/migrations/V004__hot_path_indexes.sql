@@ -0,0 +1,22 @@
+-- requests registered twice by concurrent events are merged into the oldest one before the unique index is built
+UPDATE thread_messages
+JOIN requests ON thread_messages.request_table_id = requests.id
+JOIN (
+    SELECT slack_channel_id, event_ts, MIN(id) AS kept_id FROM requests
+    GROUP BY slack_channel_id, event_ts HAVING COUNT(*) > 1
+) duplicates ON requests.slack_channel_id = duplicates.slack_channel_id AND requests.event_ts = duplicates.event_ts
+SET thread_messages.request_table_id = duplicates.kept_id
+WHERE requests.id <> duplicates.kept_id;
+DELETE requests FROM requests
+JOIN (
+    SELECT slack_channel_id, event_ts, MIN(id) AS kept_id FROM requests
+    GROUP BY slack_channel_id, event_ts HAVING COUNT(*) > 1
+) duplicates ON requests.slack_channel_id = duplicates.slack_channel_id AND requests.event_ts = duplicates.event_ts
+WHERE requests.id <> duplicates.kept_id;
+-- requests are looked up by (slack_channel_id, event_ts) on every event
+CREATE UNIQUE INDEX ind_requests_channel_event_ts ON requests(slack_channel_id, event_ts);
+-- replies are looked up by event_ts, joined to their request
+CREATE INDEX ind_thread_messages_event_ts ON thread_messages(event_ts);
+CREATE INDEX ind_thread_messages_request_event_ts ON thread_messages(request_table_id, event_ts);
+-- channel properties are looked up by slack_channel_id
+CREATE INDEX ind_control_panels_channel_id ON control_panels(slack_channel_id);
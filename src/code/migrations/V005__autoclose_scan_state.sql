@@ -0,0 +1,17 @@
+-- high-water mark of the conversations_history scans of every channel
+CREATE TABLE autoclose_cursors (
+    slack_channel_id varchar(64) PRIMARY KEY,
+    latest_ts decimal(16,6) NOT NULL,
+    full_scan_datetime_utc datetime NOT NULL
+);
+-- main messages of the scanned channels, with the latest reply autoclose has seen
+CREATE TABLE autoclose_threads (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    slack_channel_id varchar(64) NOT NULL,
+    thread_ts decimal(16,6) NOT NULL,
+    latest_reply_ts decimal(16,6),
+    message JSON NOT NULL,
+    latest_reply JSON,
+    stale boolean NOT NULL DEFAULT FALSE
+);
+CREATE UNIQUE INDEX ind_autoclose_threads_channel_thread_ts ON autoclose_threads(slack_channel_id, thread_ts);
@@ -0,0 +1,2 @@
+-- bumped on every change of the daily report config of a control panel
+ALTER TABLE control_panels ADD COLUMN daily_report_version int NOT NULL DEFAULT 0;
@@ -0,0 +1,25 @@
+-- counts and duration percentile sketches of the requests per channel, UTC day and request type
+CREATE TABLE request_daily_rollups (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    slack_channel_id varchar(64) NOT NULL,
+    rollup_date date NOT NULL,
+    request_type varchar(100) NOT NULL,
+    created_count int NOT NULL DEFAULT 0,
+    started_count int NOT NULL DEFAULT 0,
+    completed_count int NOT NULL DEFAULT 0,
+    time_to_start_sketch JSON,
+    time_to_complete_sketch JSON
+);
+CREATE UNIQUE INDEX ind_request_daily_rollups_channel_date_type ON request_daily_rollups(slack_channel_id, rollup_date, request_type);
+-- request changes not yet applied to request_daily_rollups
+CREATE TABLE request_rollup_deltas (
+    id int AUTO_INCREMENT PRIMARY KEY,
+    slack_channel_id varchar(64) NOT NULL,
+    rollup_date date NOT NULL,
+    request_types JSON NOT NULL,
+    metric varchar(16) NOT NULL,
+    delta int NOT NULL,
+    seconds decimal(16,6)
+);
+-- the request types every request is counted with, to take it back from the same rollups
+ALTER TABLE requests ADD COLUMN rollup_request_types JSON;
@@ -0,0 +1,38 @@
+import argparse
+import datetime
+
+from src.code.const import create_app
+from src.code.db import db
+from src.code.model.request import Request
+from src.code.model.request_rollup import RequestDailyRollup
+from src.code.model.schema_migration import SchemaMigration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--dry-run", action="store_true", help="only list the pending migrations")
+    parser.add_argument(
+        "--rebuild-request-rollups-since",
+        type=datetime.date.fromisoformat,
+        metavar="YYYY-MM-DD",
+        help="after migrating, rebuild the request rollups of the days since the date from the requests",
+    )
+    args = parser.parse_args()
+
+    app = create_app("src.code.config.Config")
+    db.init_app(app)
+    with app.app_context():
+        if args.dry_run:
+            for migration in SchemaMigration().get_pending_migrations():
+                print(f"V{migration.version} {migration.description}")
+        else:
+            SchemaMigration().apply_pending()
+            if args.rebuild_request_rollups_since is not None:
+                RequestDailyRollup().rebuild(
+                    Request().stream_changed_since(args.rebuild_request_rollups_since),
+                    args.rebuild_request_rollups_since,
+                )
+
+
+if __name__ == "__main__":
+    main()
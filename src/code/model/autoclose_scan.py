@@ -0,0 +1,168 @@
+from datetime import datetime
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from sqlalchemy import JSON
+from sqlalchemy import Boolean
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Index
+from sqlalchemy import Integer
+from sqlalchemy import Numeric
+from sqlalchemy import String
+from sqlalchemy import and_
+from sqlalchemy import func
+from sqlalchemy import or_
+
+from src.code.db import db
+from src.code.logger import create_logger
+from src.code.model.custom_enums import RequestStatusEnum
+from src.code.model.request import Request
+from src.code.model.request import ThreadMessage
+
+logger = create_logger(__name__)
+
+# only the fields autoclose decides on are kept, not the text and blocks of the messages
+MESSAGE_FIELDS = ("ts", "thread_ts", "latest_reply", "reactions", "user")
+REPLY_FIELDS = ("ts", "user", "bot_id")
+
+
+class AutocloseCursor(db.Model):
+    __tablename__ = "autoclose_cursors"
+
+    slack_channel_id = Column(String(64), primary_key=True)
+    latest_ts = Column(Numeric(16, 6), nullable=False)
+    full_scan_datetime_utc = Column(DateTime, nullable=False)
+
+    def get_cursor(self, channel_id: str) -> Optional["AutocloseCursor"]:
+        return db.session.get(AutocloseCursor, channel_id)
+
+    def save_cursor(self, channel_id: str, latest_ts: float, full_scan: bool) -> None:
+        record = self.get_cursor(channel_id)
+        if record is None:
+            record = AutocloseCursor(slack_channel_id=channel_id, full_scan_datetime_utc=datetime.utcnow())
+            db.session.add(record)
+        elif full_scan:
+            record.full_scan_datetime_utc = datetime.utcnow()
+        record.latest_ts = latest_ts
+        db.session.commit()
+
+
+class AutocloseThread(db.Model):
+    __tablename__ = "autoclose_threads"
+    __table_args__ = (Index("ind_autoclose_threads_channel_thread_ts", "slack_channel_id", "thread_ts", unique=True),)
+
+    id = Column(Integer, primary_key=True)
+    slack_channel_id = Column(String(64), nullable=False)
+    thread_ts = Column(Numeric(16, 6), nullable=False)
+    latest_reply_ts = Column(Numeric(16, 6))
+    message = Column(JSON, nullable=False)
+    latest_reply = Column(JSON)
+    stale = Column(Boolean, nullable=False, default=False)
+
+    def save_messages(self, channel_id: str, messages: Iterable[Dict], replace: bool = False) -> None:
+        if replace:
+            db.session.query(AutocloseThread).filter_by(slack_channel_id=channel_id).delete()
+            existing: Dict[str, AutocloseThread] = {}
+        else:
+            messages = list(messages)
+            existing = {
+                str(record.thread_ts): record
+                for record in db.session.query(AutocloseThread).filter(
+                    AutocloseThread.slack_channel_id == channel_id,
+                    AutocloseThread.thread_ts.in_([message["ts"] for message in messages]),
+                )
+            }
+        for message in messages:
+            record = existing.get(message["ts"])
+            if record is None:
+                record = AutocloseThread(slack_channel_id=channel_id, thread_ts=message["ts"])
+                db.session.add(record)
+                existing[message["ts"]] = record
+            if record.latest_reply_ts is None or str(record.latest_reply_ts) != message.get("latest_reply"):
+                record.latest_reply = None
+            record.latest_reply_ts = message.get("latest_reply")
+            record.message = {key: message[key] for key in MESSAGE_FIELDS if key in message}
+            record.stale = False
+        db.session.commit()
+
+    def get_messages(self, channel_id: str, oldest_ts: float) -> List[Dict]:
+        # threads completed since they were cached are not reminded, even if the cached reactions are outdated
+        records = (
+            db.session.query(AutocloseThread.message)
+            .outerjoin(
+                Request,
+                and_(
+                    Request.slack_channel_id == AutocloseThread.slack_channel_id,
+                    Request.event_ts == AutocloseThread.thread_ts,
+                ),
+            )
+            .filter(
+                AutocloseThread.slack_channel_id == channel_id,
+                AutocloseThread.thread_ts >= oldest_ts,
+                or_(Request.id.is_(None), Request.request_status != RequestStatusEnum.COMPLETED.value),
+            )
+            .order_by(AutocloseThread.thread_ts.desc())
+        )
+        return [record.message for record in records]
+
+    def get_stale_thread_timestamps(self, channel_id: str) -> List[str]:
+        # a reply stored from the events is newer than the latest reply the cache knows about
+        latest_stored_reply_ts = (
+            db.session.query(func.max(ThreadMessage.event_ts))
+            .join(Request, Request.id == ThreadMessage.request_table_id)
+            .filter(
+                Request.slack_channel_id == AutocloseThread.slack_channel_id,
+                Request.event_ts == AutocloseThread.thread_ts,
+            )
+            .scalar_subquery()
+        )
+        records = db.session.query(AutocloseThread.thread_ts).filter(
+            AutocloseThread.slack_channel_id == channel_id,
+            or_(
+                AutocloseThread.stale.is_(True),
+                latest_stored_reply_ts > func.coalesce(AutocloseThread.latest_reply_ts, 0),
+            ),
+        )
+        return [str(record.thread_ts) for record in records]
+
+    def mark_stale(self, channel_id: str, thread_ts: str) -> None:
+        db.session.query(AutocloseThread).filter_by(slack_channel_id=channel_id, thread_ts=thread_ts).update(
+            {"stale": True}, synchronize_session=False
+        )
+        db.session.commit()
+
+    def remove_threads(self, channel_id: str, thread_timestamps: List[str]) -> None:
+        if thread_timestamps:
+            db.session.query(AutocloseThread).filter(
+                AutocloseThread.slack_channel_id == channel_id, AutocloseThread.thread_ts.in_(thread_timestamps)
+            ).delete(synchronize_session=False)
+            db.session.commit()
+
+    def remove_older_than(self, channel_id: str, oldest_ts: float) -> None:
+        removed = (
+            db.session.query(AutocloseThread)
+            .filter(AutocloseThread.slack_channel_id == channel_id, AutocloseThread.thread_ts < oldest_ts)
+            .delete(synchronize_session=False)
+        )
+        db.session.commit()
+        logger.debug("%s threads older than the scan limit removed for channel_id %s", str(removed), channel_id)
+
+    def get_latest_reply(self, channel_id: str, thread_ts: str, latest_reply_ts: str) -> Optional[Dict]:
+        record = (
+            db.session.query(AutocloseThread.latest_reply)
+            .filter_by(slack_channel_id=channel_id, thread_ts=thread_ts, latest_reply_ts=latest_reply_ts)
+            .first()
+        )
+        return record.latest_reply if record is not None else None
+
+    def save_latest_reply(self, channel_id: str, thread_ts: str, latest_reply: Dict) -> None:
+        cached_reply = {key: latest_reply[key] for key in REPLY_FIELDS if key in latest_reply}
+        # the reminder and close decisions only read the text of the first block
+        cached_reply["blocks"] = latest_reply.get("blocks", [])[:1]
+        db.session.query(AutocloseThread).filter_by(
+            slack_channel_id=channel_id, thread_ts=thread_ts, latest_reply_ts=latest_reply["ts"]
+        ).update({"latest_reply": cached_reply}, synchronize_session=False)
+        db.session.commit()
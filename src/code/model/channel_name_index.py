@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+from src.code.logger import create_logger
+
+logger = create_logger(__name__)
+
+
+class ChannelNameIndex:
+    ttl_seconds: float = float(os.getenv("CHANNEL_NAME_INDEX_TTL_SECONDS", 300))
+    hits: int = 0
+    misses: int = 0
+    _id_by_name: Dict[str, str] = {}
+    _name_by_id: Dict[str, str] = {}
+    _expires_at: float = 0.0
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def is_loaded(cls) -> bool:
+        return cls._expires_at > time.monotonic()
+
+    @classmethod
+    def load(cls, channels: Iterable[Tuple[str, str]]) -> None:
+        id_by_name: Dict[str, str] = {}
+        name_by_id: Dict[str, str] = {}
+        for channel_id, channel_name in channels:
+            id_by_name[cls._normalize(channel_name)] = channel_id
+            name_by_id[channel_id] = channel_name
+        with cls._lock:
+            cls._id_by_name = id_by_name
+            cls._name_by_id = name_by_id
+            cls._expires_at = time.monotonic() + cls.ttl_seconds
+        logger.info("Channel name index loaded with %s channels", str(len(name_by_id)))
+
+    @classmethod
+    def get_channel_id(cls, channel_name: str) -> Optional[str]:
+        channel_id = cls._id_by_name.get(cls._normalize(channel_name))
+        cls._count(channel_id)
+        return channel_id
+
+    @classmethod
+    def get_channel_name(cls, channel_id: str) -> Optional[str]:
+        channel_name = cls._name_by_id.get(channel_id)
+        cls._count(channel_name)
+        return channel_name
+
+    @classmethod
+    def put(cls, channel_id: str, channel_name: str) -> None:
+        with cls._lock:
+            previous_name = cls._name_by_id.get(channel_id)
+            if previous_name is not None:
+                cls._id_by_name.pop(cls._normalize(previous_name), None)
+            cls._id_by_name[cls._normalize(channel_name)] = channel_id
+            cls._name_by_id[channel_id] = channel_name
+
+    @classmethod
+    def remove(cls, channel_id: str) -> None:
+        with cls._lock:
+            channel_name = cls._name_by_id.pop(channel_id, None)
+            if channel_name is not None:
+                cls._id_by_name.pop(cls._normalize(channel_name), None)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._id_by_name = {}
+            cls._name_by_id = {}
+            cls._expires_at = 0.0
+        cls.hits = 0
+        cls.misses = 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {"hits": cls.hits, "misses": cls.misses, "size": len(cls._name_by_id)}
+
+    @classmethod
+    def _count(cls, result: Optional[str]) -> None:
+        if result is None:
+            cls.misses += 1
+        else:
+            cls.hits += 1
+
+    @staticmethod
+    def _normalize(channel_name: str) -> str:
+        return channel_name.lstrip("#")
@@ -0,0 +1,57 @@
+import os
+import threading
+import time
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from src.code.logger import create_logger
+from src.code.model.schemas import ChannelProperties
+
+logger = create_logger(__name__)
+
+
+class ChannelPropertiesCache:
+    ttl_seconds: float = float(os.getenv("CHANNEL_PROPERTIES_CACHE_TTL_SECONDS", 60))
+    hits: int = 0
+    misses: int = 0
+    _entries: Dict[str, Tuple[float, ChannelProperties]] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def get(cls, channel_id: str) -> Optional[ChannelProperties]:
+        with cls._lock:
+            entry = cls._entries.get(channel_id)
+            if entry is not None and entry[0] > time.monotonic():
+                cls.hits += 1
+                return entry[1]
+            if entry is not None:
+                del cls._entries[channel_id]
+            cls.misses += 1
+            return None
+
+    @classmethod
+    def put(cls, channel_id: str, channel_properties: ChannelProperties) -> None:
+        if cls.ttl_seconds <= 0:
+            return
+        with cls._lock:
+            cls._entries[channel_id] = (time.monotonic() + cls.ttl_seconds, channel_properties)
+
+    @classmethod
+    def invalidate(cls, channel_id: Optional[str] = None) -> None:
+        with cls._lock:
+            if channel_id is None:
+                cls._entries.clear()
+            else:
+                cls._entries.pop(channel_id, None)
+        logger.debug("Channel properties cache invalidated for %s", channel_id or "all channels")
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.invalidate()
+        cls.hits = 0
+        cls.misses = 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {"hits": cls.hits, "misses": cls.misses, "size": len(cls._entries)}
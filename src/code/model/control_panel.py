@@ -4,18 +4,23 @@ from datetime import timezone
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from sqlalchemy import JSON
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import Numeric
 from sqlalchemy import String
 from sqlalchemy import and_
+from sqlalchemy import func
 from sqlalchemy.orm.attributes import flag_modified
 
 from src.code.const import SLACK_DATETIME_FMT
 from src.code.db import db
+from src.code.model.channel_name_index import ChannelNameIndex
+from src.code.model.channel_properties_cache import ChannelPropertiesCache
 from src.code.model.schemas import ChannelProperties
 from src.code.model.schemas import channel_properties_schema
 
@@ -24,6 +29,7 @@ logger = logging.getLogger(__name__)
 
 class ControlPanel(db.Model):
     __tablename__ = "control_panels"
+    __table_args__ = (Index("ind_control_panels_channel_id", "slack_channel_id"),)
 
     id = Column(Integer, primary_key=True)
     slack_channel_name = Column(String(80), nullable=False)
@@ -33,16 +39,29 @@ class ControlPanel(db.Model):
     form_questions = Column(JSON)
     creation_ts = Column(Numeric(16, 6), nullable=False)
     deactivation_ts = Column(Numeric(16, 6))
+    # bumped on every change of the daily report config, so the schedulers know when to reload their schedules
+    daily_report_version = Column(Integer, nullable=False, default=0)
 
     def get_channel_properties_by_channel_id(self, channel_id: str) -> ChannelProperties:
-        channel = self._get_control_panel_by_channel_id_or_throw_exception(channel_id)
-        return channel_properties_schema.load(data=channel.channel_properties)
+        channel_properties = ChannelPropertiesCache.get(channel_id)
+        if channel_properties is None:
+            channel = self._get_control_panel_by_channel_id_or_throw_exception(channel_id)
+            channel_properties = channel_properties_schema.load(data=channel.channel_properties)
+            ChannelPropertiesCache.put(channel_id, channel_properties)
+        return channel_properties
 
     def get_channel_name(self, channel_id: str) -> str:
-        control_panel = self._get_control_panel_by_channel_id_or_throw_exception(channel_id)
-        return control_panel.slack_channel_name
+        self._load_channel_name_index()
+        channel_name = ChannelNameIndex.get_channel_name(channel_id)
+        if channel_name is None:
+            channel_name = self._get_control_panel_by_channel_id_or_throw_exception(channel_id).slack_channel_name
+        return channel_name
 
     def get_channel_id_by_channel_name(self, channel_name: str) -> str:
+        self._load_channel_name_index()
+        channel_id = ChannelNameIndex.get_channel_id(channel_name)
+        if channel_id is not None:
+            return channel_id
         control_panel = (
             db.session.query(ControlPanel).filter(ControlPanel.slack_channel_name.like(f"%{channel_name}")).first()
         )
@@ -50,6 +69,14 @@ class ControlPanel(db.Model):
             raise ValueError(f"Channel for {channel_name} not found")
         return control_panel.slack_channel_id
 
+    def _load_channel_name_index(self) -> None:
+        if not ChannelNameIndex.is_loaded():
+            ChannelNameIndex.load(
+                db.session.query(ControlPanel.slack_channel_id, ControlPanel.slack_channel_name)
+                .filter(ControlPanel.deactivation_ts == None)  # noqa: E711
+                .all()
+            )
+
     def _get_control_panel_by_channel_id_or_throw_exception(self, channel_id: Optional[str]) -> "ControlPanel":
         control_panel = db.session.query(ControlPanel).filter_by(slack_channel_id=channel_id).first()
         if control_panel is None:
@@ -63,9 +90,18 @@ class ControlPanel(db.Model):
     def get_control_panel_by_channel_id(self, channel_id: Optional[str]) -> "ControlPanel":
         return db.session.query(ControlPanel).filter_by(slack_channel_id=channel_id).first()
 
+    def get_daily_report_version(self) -> Tuple[int, int]:
+        control_panels_count, version_sum = db.session.query(
+            func.count(ControlPanel.id), func.coalesce(func.sum(ControlPanel.daily_report_version), 0)
+        ).one()
+        return int(control_panels_count), int(version_sum)
+
     def activate_control_panel(self, control_panel: "ControlPanel") -> None:
         control_panel.deactivation_ts = None
+        self._bump_daily_report_version(control_panel)
         db.session.commit()
+        ChannelPropertiesCache.invalidate(control_panel.slack_channel_id)
+        ChannelNameIndex.put(control_panel.slack_channel_id, control_panel.slack_channel_name)
 
     def add_control_panel(self, channel_id: str, channel_name: str) -> None:
         db.session.add(
@@ -77,6 +113,8 @@ class ControlPanel(db.Model):
             )
         )
         db.session.commit()
+        ChannelPropertiesCache.invalidate(channel_id)
+        ChannelNameIndex.put(channel_id, channel_name)
 
     def get_active_control_panel_details(self, channel_id: str) -> Optional["ControlPanel"]:
         channel = (
@@ -92,7 +130,10 @@ class ControlPanel(db.Model):
 
     def soft_delete_control_panel(self, control_panel: "ControlPanel") -> None:
         control_panel.deactivation_ts = datetime.now(timezone.utc).timestamp()
+        self._bump_daily_report_version(control_panel)
         db.session.commit()
+        ChannelPropertiesCache.invalidate(control_panel.slack_channel_id)
+        ChannelNameIndex.remove(control_panel.slack_channel_id)
 
     def update_channel_property(self, channel_id: str, property: str, feature_properties: Union[Dict, List]):
         cp = self._get_control_panel_by_channel_id_or_throw_exception(channel_id)
@@ -101,7 +142,10 @@ class ControlPanel(db.Model):
         )
         cp.channel_properties[property] = feature_properties
         flag_modified(cp, "channel_properties")
+        if property == "_daily_report":
+            self._bump_daily_report_version(cp)
         db.session.commit()
+        ChannelPropertiesCache.invalidate(channel_id)
 
     def toggle_feature(self, channel_id: str, feature: str, toggle: bool) -> None:
         cp = self._get_control_panel_by_channel_id_or_throw_exception(channel_id)
@@ -110,7 +154,10 @@ class ControlPanel(db.Model):
         )
         cp.channel_properties["features"][feature]["enabled"] = toggle
         flag_modified(cp, "channel_properties")
+        if feature == "daily_report":
+            self._bump_daily_report_version(cp)
         db.session.commit()
+        ChannelPropertiesCache.invalidate(channel_id)
 
     def modify_daily_report(self, schedules: List[str], time_zone: str, output_channel_name: str) -> None:
         channel_properties: ChannelProperties = channel_properties_schema.load(self.channel_properties)
@@ -122,7 +169,9 @@ class ControlPanel(db.Model):
             ]
             self.channel_properties = channel_properties_schema.dump(channel_properties)
             flag_modified(self, "channel_properties")
+            self._bump_daily_report_version(self)
             db.session.commit()
+            ChannelPropertiesCache.invalidate(self.slack_channel_id)
 
     def update_last_report_datetime_utc_field(self, index: int, channel_id: str, utc_now: datetime):
         control_panel: ControlPanel = self._get_control_panel_by_channel_id_or_throw_exception(channel_id)
@@ -134,5 +183,11 @@ class ControlPanel(db.Model):
             control_panel.channel_properties = channel_properties_schema.dump(channel_properties)
             flag_modified(control_panel, "channel_properties")
             db.session.commit()
+            ChannelPropertiesCache.invalidate(channel_id)
         else:
             raise ValueError(f"Last report data for {channel_id} not updated properly")
+
+    @staticmethod
+    def _bump_daily_report_version(control_panel: "ControlPanel") -> None:
+        # the last report times are not part of the version, the scheduler that sends a report reschedules it itself
+        control_panel.daily_report_version = (control_panel.daily_report_version or 0) + 1
@@ -7,6 +7,7 @@ from typing import List
 from typing import Optional
 
 from src.code.db import db
+from src.code.model.channel_properties_cache import ChannelPropertiesCache
 from src.code.model.control_panel import ControlPanel
 from src.code.model.schemas import ChannelProperties
 from src.code.model.schemas import Question
@@ -45,6 +46,7 @@ class ControlPanelQuestionForm:
         properties.question_forms = question_form_schema.dump(form)
         cp.channel_properties = channel_properties_schema.dump(properties)
         db.session.commit()
+        ChannelPropertiesCache.invalidate(cp.slack_channel_id)
 
     def modify_question_form(
         self,
@@ -64,6 +66,7 @@ class ControlPanelQuestionForm:
         properties.question_forms = question_form_schema.dump(form)
         cp.channel_properties = channel_properties_schema.dump(properties)
         db.session.commit()
+        ChannelPropertiesCache.invalidate(cp.slack_channel_id)
 
     def modify_question(
         self,
@@ -89,6 +92,7 @@ class ControlPanelQuestionForm:
         fetched_questions[modify_question_index] = question
         cp.channel_properties = channel_properties_schema.dump(properties)
         db.session.commit()
+        ChannelPropertiesCache.invalidate(cp.slack_channel_id)
 
     def modify_recommendation(self, cp: ControlPanel, recommendation: Dict) -> None:
         # fetching properties and form
@@ -100,6 +104,7 @@ class ControlPanelQuestionForm:
         fetched_recommendations[recommendation_key] = recommendation[recommendation_key]
         cp.channel_properties = channel_properties_schema.dump(properties)
         db.session.commit()
+        ChannelPropertiesCache.invalidate(cp.slack_channel_id)
 
     def delete_recommendation(self, cp: ControlPanel, recommendation_name: str) -> None:
         # fetching properties and form
@@ -110,3 +115,4 @@ class ControlPanelQuestionForm:
         del fetched_recommendations[recommendation_name]
         cp.channel_properties = channel_properties_schema.dump(properties)
         db.session.commit()
+        ChannelPropertiesCache.invalidate(cp.slack_channel_id)
@@ -32,3 +32,9 @@ class QuestionState(Enum):
 class AutocloseStatus(Enum):
     REMINDER = "REMINDER"
     CLOSED = "CLOSED"
+
+
+class QueuedEventStatus(Enum):
+    PENDING = "PENDING"
+    PROCESSING = "PROCESSING"
+    FAILED = "FAILED"
@@ -0,0 +1,46 @@
+from datetime import datetime
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy.exc import IntegrityError
+
+from src.code.db import db
+from src.code.logger import create_logger
+
+logger = create_logger(__name__)
+
+
+class ProcessedEvent(db.Model):
+    __tablename__ = "processed_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_id = Column(String(64), nullable=False, unique=True)
+    retry_num = Column(Integer)
+    received_datetime_utc = Column(DateTime, nullable=False)
+
+    def mark_processed(self, event_id: str, retry_num: Optional[int]) -> bool:
+        db.session.add(ProcessedEvent(event_id=event_id, retry_num=retry_num, received_datetime_utc=datetime.utcnow()))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return False
+        return True
+
+    def forget(self, event_id: str) -> None:
+        db.session.query(ProcessedEvent).filter_by(event_id=event_id).delete(synchronize_session=False)
+        db.session.commit()
+
+    def purge_older_than(self, window: timedelta) -> int:
+        purged = (
+            db.session.query(ProcessedEvent)
+            .filter(ProcessedEvent.received_datetime_utc < datetime.utcnow() - window)
+            .delete(synchronize_session=False)
+        )
+        db.session.commit()
+        logger.info("%s processed events purged", str(purged))
+        return purged
@@ -0,0 +1,148 @@
+import os
+from datetime import datetime
+from datetime import timedelta
+from typing import Dict
+from typing import Optional
+
+from sqlalchemy import JSON
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import and_
+from sqlalchemy import func
+
+from src.code.db import db
+from src.code.logger import create_logger
+from src.code.model.custom_enums import QueuedEventStatus
+
+logger = create_logger(__name__)
+
+
+class QueuedEvent(db.Model):
+    __tablename__ = "event_queue"
+
+    # failed events are kept for a look at what failed, then purged with the processed events
+    failed_retention: timedelta = timedelta(hours=int(os.getenv("EVENT_QUEUE_FAILED_RETENTION_HOURS", 168)))
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_type = Column(String(64), nullable=False)
+    slack_channel_id = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(64), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    claimed_by = Column(String(255))
+    claimed_datetime_utc = Column(DateTime)
+    created_datetime_utc = Column(DateTime, nullable=False)
+
+    def enqueue(self, event_type: str, payload: Dict) -> None:
+        event: Dict = payload.get("event", {})
+        channel_id: str = event.get("channel") or event.get("item", {}).get("channel") or ""
+        db.session.add(
+            QueuedEvent(
+                event_type=event_type,
+                slack_channel_id=channel_id,
+                payload=payload,
+                status=QueuedEventStatus.PENDING.value,
+                attempts=0,
+                created_datetime_utc=datetime.utcnow(),
+            )
+        )
+        db.session.commit()
+
+    def claim_next(self, worker_id: str, batch_size: int = 10) -> Optional["QueuedEvent"]:
+        # Only the oldest pending event of a channel can be claimed and only if no other event
+        # of that channel is being processed, which keeps events ordered within a channel.
+        oldest_pending_per_channel = (
+            db.session.query(func.min(QueuedEvent.id))
+            .filter(QueuedEvent.status == QueuedEventStatus.PENDING.value)
+            .group_by(QueuedEvent.slack_channel_id)
+        )
+        processing_channels = db.session.query(QueuedEvent.slack_channel_id).filter(
+            QueuedEvent.status == QueuedEventStatus.PROCESSING.value
+        )
+        candidate_ids = [
+            row.id
+            for row in db.session.query(QueuedEvent.id)
+            .filter(
+                and_(
+                    QueuedEvent.id.in_(oldest_pending_per_channel),
+                    QueuedEvent.slack_channel_id.notin_(processing_channels),
+                )
+            )
+            .order_by(QueuedEvent.id)
+            .limit(batch_size)
+        ]
+        db.session.commit()
+        for candidate_id in candidate_ids:
+            claimed = (
+                db.session.query(QueuedEvent)
+                .filter(QueuedEvent.id == candidate_id, QueuedEvent.status == QueuedEventStatus.PENDING.value)
+                .update(
+                    {
+                        QueuedEvent.status: QueuedEventStatus.PROCESSING.value,
+                        QueuedEvent.claimed_by: worker_id,
+                        QueuedEvent.claimed_datetime_utc: datetime.utcnow(),
+                        QueuedEvent.attempts: QueuedEvent.attempts + 1,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.session.commit()
+            if claimed == 1:
+                return db.session.query(QueuedEvent).filter_by(id=candidate_id).first()
+        return None
+
+    def complete(self, event_id: int) -> None:
+        db.session.query(QueuedEvent).filter_by(id=event_id).delete(synchronize_session=False)
+        db.session.commit()
+
+    def fail(self, event_id: int, max_attempts: int) -> None:
+        record: Optional[QueuedEvent] = db.session.query(QueuedEvent).filter_by(id=event_id).first()
+        if record is None:
+            return
+        if record.attempts >= max_attempts:
+            logger.error("Event %s failed %s times, giving up", str(event_id), str(record.attempts))
+            record.status = QueuedEventStatus.FAILED.value
+        else:
+            record.status = QueuedEventStatus.PENDING.value
+        record.claimed_by = None
+        record.claimed_datetime_utc = None
+        db.session.commit()
+
+    def release_stale_claims(self, claim_timeout: timedelta) -> int:
+        released = (
+            db.session.query(QueuedEvent)
+            .filter(
+                QueuedEvent.status == QueuedEventStatus.PROCESSING.value,
+                QueuedEvent.claimed_datetime_utc < datetime.utcnow() - claim_timeout,
+            )
+            .update(
+                {
+                    QueuedEvent.status: QueuedEventStatus.PENDING.value,
+                    QueuedEvent.claimed_by: None,
+                    QueuedEvent.claimed_datetime_utc: None,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.session.commit()
+        if released:
+            logger.warning("%s stale queued events released", str(released))
+        return released
+
+    def purge_failed(self) -> int:
+        purged = (
+            db.session.query(QueuedEvent)
+            .filter(
+                QueuedEvent.status == QueuedEventStatus.FAILED.value,
+                QueuedEvent.created_datetime_utc < datetime.utcnow() - self.failed_retention,
+            )
+            .delete(synchronize_session=False)
+        )
+        db.session.commit()
+        logger.info("%s failed queued events purged", str(purged))
+        return purged
+
+    def get_queue_depth(self) -> int:
+        return db.session.query(QueuedEvent).filter(QueuedEvent.status == QueuedEventStatus.PENDING.value).count()
@@ -1,17 +1,25 @@
+import json
+from datetime import date
 from datetime import datetime
+from datetime import time
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
+from typing import Optional
 
 from pytz import timezone
 from sqlalchemy import JSON
 from sqlalchemy import Column
 from sqlalchemy import DateTime
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import Numeric
 from sqlalchemy import String
 from sqlalchemy import and_
+from sqlalchemy import func
+from sqlalchemy import or_
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.attributes import flag_modified
 
@@ -23,6 +31,7 @@ from src.code.logger import create_logger
 from src.code.model.block import Block
 from src.code.model.custom_enums import AutocloseStatus
 from src.code.model.custom_enums import RequestStatusEnum
+from src.code.model.request_rollup import RequestDailyRollup
 from src.code.utils.utils import dto_to_json
 from src.code.utils.utils import get_last_business_day_holidays_not_included
 from src.code.utils.utils import get_timestamp_range_from_date
@@ -32,6 +41,7 @@ logger = create_logger(__name__)
 
 class Request(db.Model):
     __tablename__ = "requests"
+    __table_args__ = (Index("ind_requests_channel_event_ts", "slack_channel_id", "event_ts", unique=True),)
 
     id = Column(Integer, primary_key=True)
     slack_channel_name = Column(String(80), nullable=False)
@@ -44,6 +54,8 @@ class Request(db.Model):
     start_work_datatime_utc = Column(DateTime)
     completion_datetime_utc = Column(DateTime)
     request_types = Column(JSON)
+    # the request types the request is counted with in the daily rollups, per metric
+    rollup_request_types = Column(JSON)
     completion_reactions = Column(JSON)
     form_answers = Column(JSON)
     blocks_id = Column(Integer, ForeignKey("blocks.id"))
@@ -52,6 +64,11 @@ class Request(db.Model):
     thread_message = relationship("ThreadMessage", cascade="all, delete")
     blocks_table = relationship("Block", cascade="all, delete")
 
+    @property
+    def blocks(self) -> Optional[str]:
+        # blocks are loaded lazily, only the callers reading them pay for the query
+        return json.dumps(self.blocks_table.blocks) if self.blocks_table else None
+
     def get_request_or_throw_exception(self, channel_id: str, event_ts: str) -> "Request":
         record = self.get_request(channel_id, event_ts)
         if record is None:
@@ -59,10 +76,12 @@ class Request(db.Model):
         return record
 
     def get_request(self, channel_id: str, event_ts: str) -> "Request":
-        record = db.session.query(Request).filter_by(slack_channel_id=channel_id, event_ts=event_ts).first()
-        if record:
-            record.blocks = Block().get_blocks(record.blocks_id)
-        return record
+        return db.session.query(Request).filter_by(slack_channel_id=channel_id, event_ts=event_ts).first()
+
+    def request_exists(self, channel_id: str, event_ts: str) -> bool:
+        return (
+            db.session.query(Request.id).filter_by(slack_channel_id=channel_id, event_ts=event_ts).first() is not None
+        )
 
     def update_or_register_new_record(self, new_record: NewRecordDto):
         record = self.get_request(new_record.channel_id, new_record.event_ts)
@@ -76,6 +95,7 @@ class Request(db.Model):
             blocks_id = Block().create_or_update_existing_blocks(new_record.blocks)
             record = self._create_initial_record(new_record, blocks_id)
             db.session.add(record)
+            RequestDailyRollup().record_created(record)
         else:
             logger.info(
                 "Updating %s record for channel %s with details %s",
@@ -98,39 +118,60 @@ class Request(db.Model):
 
     def close_request(self, channel_id: str, request_ts: str, reaction_ts: str, reaction: str):
         record = self.get_request_or_throw_exception(channel_id, request_ts)
+        self.close_record(record, reaction_ts, reaction)
+        db.session.commit()
+
+    def close_record(self, record: "Request", reaction_ts: str, reaction: str) -> None:
+        if record.request_status == RequestStatusEnum.COMPLETED.value:
+            # the completion time moves to the latest completion reaction
+            RequestDailyRollup().record_reopened(record, record.completion_datetime_utc)
         record.request_status = RequestStatusEnum.COMPLETED.value
         record.completion_datetime_utc = datetime.fromtimestamp(float(reaction_ts), tz=timezone("UTC"))
         self._add_complete_reaction_to_record(record, reaction)
-        db.session.commit()
+        RequestDailyRollup().record_completed(record)
 
     def remove_request(self, channel_id: str, event_ts: str) -> None:
-        channel = self.get_request_or_throw_exception(channel_id, event_ts)
-        db.session.delete(channel)
+        self.remove_record(self.get_request_or_throw_exception(channel_id, event_ts))
+
+    def remove_record(self, record: "Request") -> None:
+        RequestDailyRollup().record_removed(record)
+        db.session.delete(record)
         db.session.commit()
 
     def add_reaction_to_request_types(self, channel_id: str, request_ts: str, reaction: str):
         record = self.get_request_or_throw_exception(channel_id, request_ts)
-        record.request_types = self._add_reaction_to_request_types(record, reaction)
+        self.add_reaction_to_record_types(record, reaction)
         db.session.commit()
 
+    def add_reaction_to_record_types(self, record: "Request", reaction: str) -> None:
+        record.request_types = self._add_reaction_to_request_types(record, reaction)
+
     def remove_completion_reaction(self, channel_id: str, request_ts: str, reaction: str):
         record = self.get_request(channel_id, request_ts)
         if record is not None:
-            completion_reactions_set: set = self._remove_complete_reaction_from_record(record, reaction)
-            if len(completion_reactions_set) == 0:
-                record.request_status = RequestStatusEnum.WORKING.value
-                record.completion_datetime_utc = None
-            record.completion_reactions = dto_to_json(
-                CompletionReactionDto(completion_reactions=list(completion_reactions_set))
-            )
+            self.remove_completion_reaction_from_record(record, reaction)
             db.session.commit()
 
+    def remove_completion_reaction_from_record(self, record: "Request", reaction: str) -> None:
+        completion_reactions_set: set = self._remove_complete_reaction_from_record(record, reaction)
+        if len(completion_reactions_set) == 0:
+            if record.request_status == RequestStatusEnum.COMPLETED.value:
+                RequestDailyRollup().record_reopened(record, record.completion_datetime_utc)
+            record.request_status = RequestStatusEnum.WORKING.value
+            record.completion_datetime_utc = None
+        record.completion_reactions = dto_to_json(
+            CompletionReactionDto(completion_reactions=list(completion_reactions_set))
+        )
+
     def remove_reaction_from_request_types(self, channel_id: str, request_ts: str, reaction: str):
         record = self.get_request(channel_id, request_ts)
         if record is not None:
-            record.request_types = self._remove_reaction_from_request_types(record, reaction)
+            self.remove_reaction_from_record_types(record, reaction)
             db.session.commit()
 
+    def remove_reaction_from_record_types(self, record: "Request", reaction: str) -> None:
+        record.request_types = self._remove_reaction_from_request_types(record, reaction)
+
     def _create_initial_record(self, new_record: NewRecordDto, blocks_id: int) -> "Request":  # create new record
         return Request(
             slack_channel_name=new_record.channel_name,
@@ -151,12 +192,14 @@ class Request(db.Model):
         record.requestor_email = requestor_email
         Block().create_or_update_existing_blocks(blocks, record.blocks_id)
 
-    def start_work(self, record, event_ts: str) -> None:
+    def start_work(self, record, event_ts: str, commit: bool = True) -> None:
         if record.request_status == RequestStatusEnum.NEW_RECORD.value and record.start_work_datatime_utc is None:
             record.request_status = RequestStatusEnum.WORKING.value
             record.start_work_datatime_utc = datetime.fromtimestamp(float(event_ts), tz=timezone("UTC"))
+            RequestDailyRollup().record_started(record)
             logger.info("Current main message status has been changed to %s", RequestStatusEnum.WORKING.value)
-            db.session.commit()
+            if commit:
+                db.session.commit()
 
     def _add_reaction_to_request_types(self, record, reaction: str) -> Dict[Any, Any]:
         current_request_types = record.request_types
@@ -193,6 +236,43 @@ class Request(db.Model):
         record.autoclose_status = status.value
         db.session.commit()
 
+    def get_idle_thread_candidates(
+        self,
+        channel_id: str,
+        oldest_ts: float,
+        created_before_ts: float,
+        reminder_before_ts: float,
+        close_before_ts: float,
+    ) -> List[str]:
+        # bot replies are not stored, so whether the reminder is old enough to close is confirmed on Slack
+        latest_reply_ts = (
+            db.session.query(func.max(ThreadMessage.event_ts))
+            .filter(ThreadMessage.request_table_id == Request.id)
+            .scalar_subquery()
+        )
+        rows = (
+            db.session.query(Request.event_ts)
+            .filter(
+                Request.slack_channel_id == channel_id,
+                Request.event_ts >= oldest_ts,
+                Request.event_ts < created_before_ts,
+                Request.request_status != RequestStatusEnum.COMPLETED.value,
+                or_(
+                    and_(
+                        Request.autoclose_status.is_(None),
+                        or_(latest_reply_ts.is_(None), latest_reply_ts < reminder_before_ts),
+                    ),
+                    and_(
+                        Request.autoclose_status == AutocloseStatus.REMINDER.value,
+                        or_(latest_reply_ts.is_(None), latest_reply_ts < max(reminder_before_ts, close_before_ts)),
+                    ),
+                ),
+            )
+            .order_by(Request.event_ts)
+            .all()
+        )
+        return [str(row.event_ts) for row in rows]
+
     # form functions
     def get_form_answers(self, channel_id: str, event_ts: str):
         record = self.get_request_or_throw_exception(channel_id, event_ts)
@@ -217,25 +297,68 @@ class Request(db.Model):
         self.init_form_answers(channel_id, main_ts)
 
     def get_last_working_day_records_sorted_by_date(self, channel_id: str, utc_now: datetime) -> list[Any]:
-        last_working_data = get_last_business_day_holidays_not_included(utc_now)
-        start_of_last_working_data_timestamp, end_of_last_working_data_timestamp = get_timestamp_range_from_date(
-            last_working_data
+        return (
+            Request.query.filter(self._last_working_day_filter(channel_id, utc_now))
+            .order_by(Request.event_ts.desc())
+            .all()
         )
+
+    def get_last_working_day_status_counts(self, channel_id: str, utc_now: datetime) -> Dict[str, int]:
+        rows = (
+            db.session.query(Request.request_status, func.count(Request.id))
+            .filter(self._last_working_day_filter(channel_id, utc_now))
+            .group_by(Request.request_status)
+            .all()
+        )
+        return {request_status: count for request_status, count in rows}
+
+    def stream_last_working_day_open_items(
+        self, channel_id: str, utc_now: datetime, batch_size: int = 500
+    ) -> Iterator[Any]:
+        # only the columns of a report line are fetched, in batches, newest first
         return (
-            Request.query.filter(
-                and_(
-                    Request.slack_channel_id == channel_id,
-                    Request.event_ts >= start_of_last_working_data_timestamp,
-                    Request.event_ts <= end_of_last_working_data_timestamp,
-                )
+            db.session.query(Request.event_ts, Request.request_link, Request.request_types, Request.requestor_id)
+            .filter(
+                self._last_working_day_filter(channel_id, utc_now),
+                Request.request_status != RequestStatusEnum.COMPLETED.value,
             )
             .order_by(Request.event_ts.desc())
-            .all()
+            .yield_per(batch_size)
+        )
+
+    def stream_changed_since(self, since: date, batch_size: int = 500) -> Iterator["Request"]:
+        since_datetime = datetime.combine(since, time.min)
+        return (
+            db.session.query(Request)
+            .filter(
+                or_(
+                    Request.event_ts >= timezone("UTC").localize(since_datetime).timestamp(),
+                    Request.start_work_datatime_utc >= since_datetime,
+                    Request.completion_datetime_utc >= since_datetime,
+                )
+            )
+            .order_by(Request.id)
+            .yield_per(batch_size)
+        )
+
+    def _last_working_day_filter(self, channel_id: str, utc_now: datetime):
+        last_working_data = get_last_business_day_holidays_not_included(utc_now)
+        start_of_last_working_data_timestamp, end_of_last_working_data_timestamp = get_timestamp_range_from_date(
+            last_working_data
+        )
+        return and_(
+            Request.slack_channel_id == channel_id,
+            Request.event_ts >= start_of_last_working_data_timestamp,
+            Request.event_ts <= end_of_last_working_data_timestamp,
         )
 
 
 class ThreadMessage(db.Model):
     __tablename__ = "thread_messages"
+    __table_args__ = (
+        Index("ind_thread_messages_event_ts", "event_ts"),
+        Index("ind_thread_messages_request_event_ts", "request_table_id", "event_ts"),
+    )
 
     id = Column(Integer, primary_key=True)
     author_id = Column(String(64), nullable=False)
@@ -244,9 +367,12 @@ class ThreadMessage(db.Model):
     request_table_id = Column(Integer, ForeignKey("requests.id"))
     blocks_table = relationship("Block", cascade="all, delete")
 
+    @property
+    def blocks(self) -> Optional[str]:
+        return json.dumps(self.blocks_table.blocks) if self.blocks_table else None
+
     def add_reply(self, request: Request, event_ts: str, author_id: str, blocks: dict):
-        record = self._get_reply(request.slack_channel_id, event_ts)
-        if record:
+        if self._reply_exists(request.id, event_ts):
             raise ValueError(
                 f"Record for channel_id {request.slack_channel_id} and thread event_ts {event_ts} exists already"
             )
@@ -271,13 +397,49 @@ class ThreadMessage(db.Model):
             Block().create_or_update_existing_blocks(blocks, record.blocks_id)
             db.session.commit()
 
-    def _get_reply(self, channel_id: str, event_ts: str):
-        result = (
+    def get_latest_replies(self, channel_id: str, thread_timestamps: List[str]) -> Dict[str, Dict]:
+        # latest stored reply of every thread, keyed by the main message ts and shaped like a Slack message
+        if not thread_timestamps:
+            return {}
+        latest = (
+            db.session.query(ThreadMessage.request_table_id, func.max(ThreadMessage.event_ts).label("latest_reply_ts"))
+            .join(Request, Request.id == ThreadMessage.request_table_id)
+            .filter(Request.slack_channel_id == channel_id, Request.event_ts.in_(thread_timestamps))
+            .group_by(ThreadMessage.request_table_id)
+            .subquery()
+        )
+        rows = (
+            db.session.query(
+                Request.event_ts.label("thread_ts"), ThreadMessage.event_ts, ThreadMessage.author_id, Block.blocks
+            )
+            .join(ThreadMessage, ThreadMessage.request_table_id == Request.id)
+            .join(
+                latest,
+                and_(
+                    latest.c.request_table_id == ThreadMessage.request_table_id,
+                    latest.c.latest_reply_ts == ThreadMessage.event_ts,
+                ),
+            )
+            .outerjoin(Block, Block.id == ThreadMessage.blocks_id)
+            .all()
+        )
+        return {
+            str(row.thread_ts): {"ts": str(row.event_ts), "user": row.author_id, "blocks": row.blocks or []}
+            for row in rows
+        }
+
+    def _get_reply(self, channel_id: str, event_ts: str) -> Optional["ThreadMessage"]:
+        return (
             db.session.query(ThreadMessage)
             .join(Request)
             .filter(Request.slack_channel_id == channel_id, ThreadMessage.event_ts == event_ts)
             .first()
         )
-        if result:
-            result.blocks = Block().get_blocks(result.blocks_id)
-        return result
+
+    def _reply_exists(self, request_id: int, event_ts: str) -> bool:
+        return (
+            db.session.query(ThreadMessage.id)
+            .filter(ThreadMessage.request_table_id == request_id, ThreadMessage.event_ts == event_ts)
+            .first()
+            is not None
+        )
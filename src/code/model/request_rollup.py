@@ -0,0 +1,308 @@
+import os
+import threading
+from datetime import date
+from datetime import datetime
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import pytz
+from sqlalchemy import JSON
+from sqlalchemy import Column
+from sqlalchemy import Date
+from sqlalchemy import Index
+from sqlalchemy import Integer
+from sqlalchemy import Numeric
+from sqlalchemy import String
+
+from src.code.db import db
+from src.code.dto.dto import RequestStatsDto
+from src.code.logger import create_logger
+from src.code.utils.percentile_sketch import PercentileSketch
+
+logger = create_logger(__name__)
+
+# the row of a day that counts every request once, whatever its types
+ALL_REQUEST_TYPES = "all"
+# the durations a rollup row keeps a sketch of, per metric
+SKETCH_COLUMNS = {"started": "time_to_start_sketch", "completed": "time_to_complete_sketch"}
+PERCENTILES = (50, 90, 99)
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, datetime):
+        # datetimes are stored in UTC without a time zone
+        return (value if value.tzinfo is not None else pytz.UTC.localize(value)).timestamp()
+    return float(value)
+
+
+def _utc_date(timestamp: float) -> date:
+    return datetime.fromtimestamp(timestamp, tz=pytz.UTC).date()
+
+
+def _request_types(record: Any) -> List[str]:
+    request_types = record.request_types or {}
+    return sorted(set(request_types.get("message", [])).union(request_types.get("reaction", [])))
+
+
+class RequestRollupDelta(db.Model):
+    """A change of the counts of a request, added in the transaction of the change and applied to the rollups later.
+
+    Adding a delta is a single insert that locks nothing, while updating the rollup rows directly would lock the
+    all types row of the day on every event of the channel.
+    """
+
+    __tablename__ = "request_rollup_deltas"
+
+    id = Column(Integer, primary_key=True)
+    slack_channel_id = Column(String(64), nullable=False)
+    rollup_date = Column(Date, nullable=False)
+    request_types = Column(JSON, nullable=False)
+    metric = Column(String(16), nullable=False)
+    delta = Column(Integer, nullable=False)
+    seconds = Column(Numeric(16, 6))
+
+
+class RequestDailyRollup(db.Model):
+    """Counts and durations of the requests of a channel per UTC day and request type.
+
+    A request is counted as created on the day it was posted, as started on the day work started and as completed on
+    the day it was completed, with the request types it had at that moment. The types a request is counted with are
+    kept on the request, so reopening or removing it takes it back from the same rows. The time to start and the time
+    to complete are kept as PercentileSketch of the day, so the percentiles of any date range are read from the merged
+    sketches of its days. The changes are recorded as RequestRollupDelta rows and applied by the scheduler, so only one
+    process writes the rollup rows.
+    """
+
+    __tablename__ = "request_daily_rollups"
+    __table_args__ = (
+        Index(
+            "ind_request_daily_rollups_channel_date_type",
+            "slack_channel_id",
+            "rollup_date",
+            "request_type",
+            unique=True,
+        ),
+    )
+
+    apply_interval_seconds: int = int(os.getenv("REQUEST_ROLLUP_APPLY_INTERVAL_SECONDS", 300))
+    _apply_lock: threading.Lock = threading.Lock()
+
+    id = Column(Integer, primary_key=True)
+    slack_channel_id = Column(String(64), nullable=False)
+    rollup_date = Column(Date, nullable=False)
+    request_type = Column(String(100), nullable=False)
+    created_count = Column(Integer, nullable=False, default=0)
+    started_count = Column(Integer, nullable=False, default=0)
+    completed_count = Column(Integer, nullable=False, default=0)
+    time_to_start_sketch = Column(JSON)
+    time_to_complete_sketch = Column(JSON)
+
+    def record_created(self, record: Any) -> None:
+        self._add_delta(record, "created", _timestamp(record.event_ts), 1)
+
+    def record_started(self, record: Any) -> None:
+        self._add_delta(record, "started", _timestamp(record.start_work_datatime_utc), 1)
+
+    def record_completed(self, record: Any) -> None:
+        self._add_delta(record, "completed", _timestamp(record.completion_datetime_utc), 1)
+
+    def record_reopened(self, record: Any, completion_datetime_utc: Optional[datetime]) -> None:
+        if completion_datetime_utc is not None:
+            self._add_delta(record, "completed", _timestamp(completion_datetime_utc), -1)
+
+    def record_removed(self, record: Any) -> None:
+        self._add_delta(record, "created", _timestamp(record.event_ts), -1)
+        if record.start_work_datatime_utc is not None:
+            self._add_delta(record, "started", _timestamp(record.start_work_datatime_utc), -1)
+        if record.completion_datetime_utc is not None:
+            self._add_delta(record, "completed", _timestamp(record.completion_datetime_utc), -1)
+
+    def apply_pending_deltas(self, batch_size: int = 1000) -> int:
+        applied = 0
+        with self._apply_lock:
+            while True:
+                deltas: List[RequestRollupDelta] = (
+                    db.session.query(RequestRollupDelta)
+                    .order_by(RequestRollupDelta.id)
+                    .limit(batch_size)
+                    .with_for_update()
+                    .all()
+                )
+                if not deltas:
+                    break
+                rows = self._get_rows(deltas)
+                # the sketches are decoded once per batch and row, not once per delta
+                sketches: Dict[Tuple[Tuple[str, date, str], str], PercentileSketch] = {}
+                for delta in deltas:
+                    for request_type in [ALL_REQUEST_TYPES] + list(delta.request_types):
+                        self._apply_delta(
+                            rows, (delta.slack_channel_id, delta.rollup_date, request_type), delta, sketches
+                        )
+                for (key, column), sketch in sketches.items():
+                    setattr(rows[key], column, sketch.to_dict())
+                db.session.query(RequestRollupDelta).filter(
+                    RequestRollupDelta.id.in_([delta.id for delta in deltas])
+                ).delete(synchronize_session=False)
+                db.session.commit()
+                applied += len(deltas)
+                if len(deltas) < batch_size:
+                    break
+        if applied:
+            logger.info("%s request rollup deltas applied", str(applied))
+        return applied
+
+    def get_period_stats(self, channel_id: str, date_from: date, date_to: date) -> List[RequestStatsDto]:
+        rows_by_type: Dict[str, List[RequestDailyRollup]] = {}
+        for row in self._get_period_rows(channel_id, date_from, date_to):
+            rows_by_type.setdefault(row.request_type, []).append(row)
+        stats: List[RequestStatsDto] = []
+        for request_type, type_rows in rows_by_type.items():
+            time_to_start = PercentileSketch.merged(row.time_to_start_sketch for row in type_rows)
+            time_to_complete = PercentileSketch.merged(row.time_to_complete_sketch for row in type_rows)
+            stats.append(
+                RequestStatsDto(
+                    request_type=request_type,
+                    created=sum(row.created_count for row in type_rows),
+                    started=sum(row.started_count for row in type_rows),
+                    completed=sum(row.completed_count for row in type_rows),
+                    time_to_start_p50=time_to_start.percentile(50),
+                    time_to_start_p90=time_to_start.percentile(90),
+                    time_to_start_p99=time_to_start.percentile(99),
+                    time_to_complete_p50=time_to_complete.percentile(50),
+                    time_to_complete_p90=time_to_complete.percentile(90),
+                    time_to_complete_p99=time_to_complete.percentile(99),
+                )
+            )
+        # the all types row first, then by the number of requests
+        return sorted(
+            stats, key=lambda item: (item.request_type != ALL_REQUEST_TYPES, -item.created, item.request_type)
+        )
+
+    def get_percentiles(
+        self,
+        channel_id: str,
+        date_from: date,
+        date_to: date,
+        metric: str,
+        request_type: str = ALL_REQUEST_TYPES,
+        percentiles: Iterable[float] = PERCENTILES,
+    ) -> Dict[float, Optional[float]]:
+        """Percentiles in seconds of the time to start or complete ("started" or "completed") over the date range."""
+        column = SKETCH_COLUMNS[metric]
+        sketch = PercentileSketch.merged(
+            getattr(row, column) for row in self._get_period_rows(channel_id, date_from, date_to, request_type)
+        )
+        return {percentile: sketch.percentile(percentile) for percentile in percentiles}
+
+    def rebuild(self, records: Iterable[Any], date_from: date) -> int:
+        """Replaces the rollups from date_from on with the counts of the given requests, for a backfill."""
+        self.apply_pending_deltas()
+        db.session.query(RequestDailyRollup).filter(RequestDailyRollup.rollup_date >= date_from).delete(
+            synchronize_session=False
+        )
+        rebuilt = 0
+        for record in records:
+            if _utc_date(_timestamp(record.event_ts)) >= date_from:
+                self.record_created(record)
+            for metric, value in (
+                ("started", record.start_work_datatime_utc),
+                ("completed", record.completion_datetime_utc),
+            ):
+                if value is not None and _utc_date(_timestamp(value)) >= date_from:
+                    self._add_delta(record, metric, _timestamp(value), 1)
+            rebuilt += 1
+        db.session.commit()
+        self.apply_pending_deltas()
+        logger.info("Request rollups rebuilt from %s requests since %s", str(rebuilt), date_from.isoformat())
+        return rebuilt
+
+    def _add_delta(self, record: Any, metric: str, metric_ts: float, delta: int) -> None:
+        seconds = max(metric_ts - _timestamp(record.event_ts), 0.0) if metric != "created" else None
+        rollup_request_types: Dict[str, List[str]] = dict(record.rollup_request_types or {})
+        if delta > 0:
+            request_types = rollup_request_types[metric] = _request_types(record)
+        elif metric in rollup_request_types:
+            request_types = rollup_request_types.pop(metric)
+        else:
+            # requests counted before their types were kept fall back to their current types
+            request_types = _request_types(record)
+        record.rollup_request_types = rollup_request_types
+        db.session.add(
+            RequestRollupDelta(
+                slack_channel_id=record.slack_channel_id,
+                rollup_date=_utc_date(metric_ts),
+                request_types=request_types,
+                metric=metric,
+                delta=delta,
+                seconds=seconds,
+            )
+        )
+
+    def _apply_delta(
+        self,
+        rows: Dict[Tuple[str, date, str], "RequestDailyRollup"],
+        key: Tuple[str, date, str],
+        delta: RequestRollupDelta,
+        sketches: Dict[Tuple[Tuple[str, date, str], str], PercentileSketch],
+    ) -> None:
+        row = rows[key]
+        count_column = f"{delta.metric}_count"
+        count = getattr(row, count_column) + delta.delta
+        if count < 0:
+            logger.warning(
+                "Request rollup %s of channel %s, day %s and type %s is negative: %s",
+                count_column,
+                key[0],
+                key[1].isoformat(),
+                key[2],
+                str(count),
+            )
+        setattr(row, count_column, count)
+        if delta.metric == "created":
+            return
+        column = SKETCH_COLUMNS[delta.metric]
+        sketch = sketches.get((key, column))
+        if sketch is None:
+            sketch = sketches[(key, column)] = PercentileSketch.from_dict(getattr(row, column))
+        sketch.add(float(delta.seconds), delta.delta)
+
+    def _get_period_rows(
+        self, channel_id: str, date_from: date, date_to: date, request_type: Optional[str] = None
+    ) -> List["RequestDailyRollup"]:
+        query = db.session.query(RequestDailyRollup).filter(
+            RequestDailyRollup.slack_channel_id == channel_id,
+            RequestDailyRollup.rollup_date >= date_from,
+            RequestDailyRollup.rollup_date <= date_to,
+        )
+        if request_type is not None:
+            query = query.filter(RequestDailyRollup.request_type == request_type)
+        return query.all()
+
+    def _get_rows(self, deltas: List[RequestRollupDelta]) -> Dict[Tuple[str, date, str], "RequestDailyRollup"]:
+        keys = {
+            (delta.slack_channel_id, delta.rollup_date, request_type)
+            for delta in deltas
+            for request_type in [ALL_REQUEST_TYPES] + list(delta.request_types)
+        }
+        rows = {
+            (row.slack_channel_id, row.rollup_date, row.request_type): row
+            for row in db.session.query(RequestDailyRollup).filter(
+                RequestDailyRollup.slack_channel_id.in_({key[0] for key in keys}),
+                RequestDailyRollup.rollup_date.in_({key[1] for key in keys}),
+            )
+        }
+        for key in keys - rows.keys():
+            rows[key] = RequestDailyRollup(
+                slack_channel_id=key[0],
+                rollup_date=key[1],
+                request_type=key[2],
+                created_count=0,
+                started_count=0,
+                completed_count=0,
+            )
+            db.session.add(rows[key])
+        return rows
@@ -0,0 +1,51 @@
+from datetime import datetime
+from datetime import timedelta
+from typing import Dict
+from typing import Optional
+
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Integer
+from sqlalchemy import String
+
+from src.code.db import db
+from src.code.dto.dto import RequestorProfileDto
+from src.code.logger import create_logger
+
+logger = create_logger(__name__)
+
+
+class RequestorProfile(db.Model):
+    __tablename__ = "requestor_profiles"
+
+    id = Column(Integer, primary_key=True)
+    requestor_id = Column(String(64), nullable=False, unique=True)
+    requestor_email = Column(String(1000))
+    requestor_team_id = Column(String(64))
+    updated_datetime_utc = Column(DateTime, nullable=False)
+
+    def get_fresh_profile(self, requestor_id: str, max_age: timedelta) -> Optional[RequestorProfileDto]:
+        record = db.session.query(RequestorProfile).filter_by(requestor_id=requestor_id).first()
+        if record is None or record.updated_datetime_utc < datetime.utcnow() - max_age:
+            return None
+        return RequestorProfileDto(email=record.requestor_email, team_id=record.requestor_team_id)
+
+    def save_profile(self, requestor_id: str, profile: RequestorProfileDto) -> None:
+        self.save_profiles({requestor_id: profile})
+
+    def save_profiles(self, profiles: Dict[str, RequestorProfileDto]) -> None:
+        existing: Dict[str, RequestorProfile] = {
+            record.requestor_id: record
+            for record in db.session.query(RequestorProfile).filter(RequestorProfile.requestor_id.in_(profiles.keys()))
+        }
+        utc_now = datetime.utcnow()
+        for requestor_id, profile in profiles.items():
+            record = existing.get(requestor_id)
+            if record is None:
+                record = RequestorProfile(requestor_id=requestor_id)
+                db.session.add(record)
+            record.requestor_email = profile.email
+            record.requestor_team_id = profile.team_id
+            record.updated_datetime_utc = utc_now
+        db.session.commit()
+        logger.debug("%s requestor profiles saved", str(len(profiles)))
@@ -0,0 +1,85 @@
+import os
+import re
+from datetime import datetime
+from typing import List
+from typing import NamedTuple
+from typing import Set
+
+from sqlalchemy import Column
+from sqlalchemy import DateTime
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import text
+
+from src.code.db import db
+from src.code.logger import create_logger
+
+logger = create_logger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+_MIGRATION_FILE_PATTERN = re.compile(r"^V(?P<version>\d+)__(?P<description>\w+)\.sql$")
+
+
+class MigrationFile(NamedTuple):
+    version: str
+    description: str
+    path: str
+
+
+class SchemaMigration(db.Model):
+    __tablename__ = "schema_migrations"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    version = Column(String(64), nullable=False, unique=True)
+    description = Column(String(255), nullable=False)
+    applied_datetime_utc = Column(DateTime, nullable=False)
+
+    def get_migration_files(self, migrations_dir: str = MIGRATIONS_DIR) -> List[MigrationFile]:
+        migration_files: List[MigrationFile] = []
+        for file_name in os.listdir(migrations_dir):
+            match = _MIGRATION_FILE_PATTERN.match(file_name)
+            if match:
+                migration_files.append(
+                    MigrationFile(
+                        version=match.group("version"),
+                        description=match.group("description"),
+                        path=os.path.join(migrations_dir, file_name),
+                    )
+                )
+        return sorted(migration_files, key=lambda migration: int(migration.version))
+
+    def get_applied_versions(self) -> Set[str]:
+        SchemaMigration.__table__.create(bind=db.engine, checkfirst=True)
+        return {row.version for row in db.session.query(SchemaMigration.version)}
+
+    def get_pending_migrations(self, migrations_dir: str = MIGRATIONS_DIR) -> List[MigrationFile]:
+        applied_versions = self.get_applied_versions()
+        return [
+            migration
+            for migration in self.get_migration_files(migrations_dir)
+            if migration.version not in applied_versions
+        ]
+
+    def apply_pending(self, migrations_dir: str = MIGRATIONS_DIR) -> List[str]:
+        applied: List[str] = []
+        for migration in self.get_pending_migrations(migrations_dir):
+            logger.info("Applying schema migration V%s %s", migration.version, migration.description)
+            with open(migration.path) as file:
+                for statement in self._split_statements(file.read()):
+                    db.session.execute(text(statement))
+            db.session.add(
+                SchemaMigration(
+                    version=migration.version,
+                    description=migration.description,
+                    applied_datetime_utc=datetime.utcnow(),
+                )
+            )
+            db.session.commit()
+            applied.append(migration.version)
+        logger.info("%s schema migrations applied", str(len(applied)))
+        return applied
+
+    @staticmethod
+    def _split_statements(script: str) -> List[str]:
+        lines = [line for line in script.splitlines() if not line.strip().startswith("--")]
+        return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
@@ -1,14 +1,16 @@
+from dataclasses import FrozenInstanceError
 from dataclasses import dataclass
 from dataclasses import field
+from types import MappingProxyType
 from typing import Dict
+from typing import FrozenSet
 from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
 
 from marshmallow_dataclass import class_schema
 
-from src.code.logger import create_logger
-
-logger = create_logger(__name__)
-
 
 @dataclass
 class ChannelPropertiesFeature:
@@ -72,6 +74,68 @@ class DailyReport:
     time_zone: str = field(default="UTC")
 
 
+@dataclass(frozen=True)
+class EmojiLookup:
+    """Lookup indexes of the enabled emoji config of a channel, the alias of an emoji is a dict lookup."""
+
+    type_emojis: Mapping[str, str]
+    type_aliases: Mapping[str, str]
+    completion_reactions: FrozenSet[str]
+    start_work_reactions: FrozenSet[str]
+    triggers: FrozenSet[str]
+    # the type emojis and their aliases
+    type_names: FrozenSet[str]
+
+    @classmethod
+    def get_key(cls, properties: "ChannelProperties") -> Tuple:
+        """What the lookup is built from, the accessors of a disabled feature return an empty config."""
+        return (
+            tuple(
+                (emoji, emoji_properties.get("alias")) for emoji, emoji_properties in properties.types.emojis.items()
+            ),
+            tuple(properties.completion_reactions),
+            tuple(properties.start_work_reactions),
+            tuple(properties.question_forms.triggers),
+        )
+
+    @classmethod
+    def build(cls, key: Tuple) -> "EmojiLookup":
+        types, completion_reactions, start_work_reactions, triggers = key
+        type_aliases: Dict[str, str] = {}
+        for emoji, alias in types:
+            # the first type with the alias wins, as it did when the aliases were searched in order
+            if alias and alias not in type_aliases:
+                type_aliases[alias] = emoji
+        type_emojis = {emoji: emoji for emoji, _ in types}
+        return cls(
+            type_emojis=MappingProxyType(type_emojis),
+            type_aliases=MappingProxyType(type_aliases),
+            completion_reactions=frozenset(completion_reactions),
+            start_work_reactions=frozenset(start_work_reactions),
+            triggers=frozenset(triggers),
+            type_names=frozenset(type_emojis.keys() | type_aliases.keys()),
+        )
+
+
+class _DisabledTypes(Types):
+    """Types of a channel with the types feature disabled, read-only as a single instance is shared."""
+
+    def __init__(self) -> None:
+        object.__setattr__(self, "emojis", MappingProxyType({}))
+        object.__setattr__(self, "not_selected_response", "")
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+
+# what the accessors of a disabled feature return, shared by all the channels
+DISABLED_TYPES: Types = _DisabledTypes()
+DISABLED_REACTIONS: Tuple[str, ...] = ()
+
+
 @dataclass
 class ChannelProperties:
     features: ChannelPropertiesFeatures = field(default=ChannelPropertiesFeatures())
@@ -84,11 +148,7 @@ class ChannelProperties:
 
     @property
     def types(self):
-        if self.features.types.enabled:
-            return self._types
-        else:
-            logger.info("Feature 'types' is not enabled.")
-            return Types()
+        return self._types if self.features.types.enabled else DISABLED_TYPES
 
     @types.setter
     def types(self, types_dict):
@@ -96,11 +156,7 @@ class ChannelProperties:
 
     @property
     def daily_report(self):
-        if self.features.daily_report.enabled:
-            return self._daily_report
-        else:
-            logger.info("Feature 'daily_report' is not enabled.")
-            return None
+        return self._daily_report if self.features.daily_report.enabled else None
 
     @daily_report.setter
     def daily_report(self, daily_report):
@@ -108,11 +164,7 @@ class ChannelProperties:
 
     @property
     def start_work_reactions(self):
-        if self.features.start_work_reactions.enabled:
-            return self._start_work_reactions
-        else:
-            logger.info("Feature 'start_work_reactions' is not enabled.")
-            return []
+        return self._start_work_reactions if self.features.start_work_reactions.enabled else DISABLED_REACTIONS
 
     @start_work_reactions.setter
     def start_work_reactions(self, reactions):
@@ -133,11 +185,7 @@ class ChannelProperties:
 
     @property
     def completion_reactions(self):
-        if self.features.completion_reactions.enabled:
-            return self._completion_reactions
-        else:
-            logger.info("Feature 'completion_reactions' is not enabled.")
-            return []
+        return self._completion_reactions if self.features.completion_reactions.enabled else DISABLED_REACTIONS
 
     @completion_reactions.setter
     def completion_reactions(self, reactions):
@@ -145,16 +193,38 @@ class ChannelProperties:
 
     @property
     def close_idle_threads(self):
-        if self.features.close_idle_threads.enabled:
-            return self._close_idle_threads
-        else:
-            logger.info("Feature 'close_idle_threads' is not enabled.")
-            return None
+        return self._close_idle_threads if self.features.close_idle_threads.enabled else None
 
     @close_idle_threads.setter
     def close_idle_threads(self, close_idle_threads):
         self._close_idle_threads = close_idle_threads
 
+    @property
+    def emoji_lookup(self) -> EmojiLookup:
+        # the cached properties are shared and can be changed in place or have a feature toggled, so the lookup is
+        # kept with the config it was built from and rebuilt when that config differs
+        key = EmojiLookup.get_key(self)
+        memo: Optional[Tuple[Tuple, EmojiLookup]] = self.__dict__.get("_emoji_lookup")
+        if memo is None or memo[0] != key:
+            memo = self.__dict__["_emoji_lookup"] = (key, EmojiLookup.build(key))
+        return memo[1]
+
+    def get_type_emoji(self, name: Optional[str]) -> Optional[str]:
+        """The type emoji of an emoji or alias name, None when it is not a type or the types are disabled."""
+        if name is None:
+            return None
+        lookup = self.emoji_lookup
+        return lookup.type_emojis.get(name) or lookup.type_aliases.get(name)
+
+    def is_completion_reaction(self, name: Optional[str]) -> bool:
+        return name in self.emoji_lookup.completion_reactions
+
+    def is_start_work_reaction(self, name: Optional[str]) -> bool:
+        return name in self.emoji_lookup.start_work_reactions
+
+    def is_question_form_trigger(self, name: Optional[str]) -> bool:
+        return name in self.emoji_lookup.triggers
+
     def get_feature_status_dict(self, feature_name: str) -> dict:
         self_full_dict = channel_properties_schema.dump(self)
         if feature_name not in self_full_dict["features"]:
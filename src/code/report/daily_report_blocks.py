@@ -0,0 +1,74 @@
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+
+from src.code.utils.utils import get_emojis_str_from_list
+
+# Slack rejects a section whose text is longer than this
+SECTION_TEXT_LIMIT = 3000
+OPEN_ITEMS_TITLE = "*Last day open items:*\n "
+OPEN_ITEMS_CONT_TITLE = "*Last day open items - continuation:*\n "
+SUMMARY_FORMAT = "*Last Day {last_working_date}*\n *{completed_count}* completed | *{open_count}* open"
+ITEM_FORMAT = "* _{start_datetime_utc}_  |  <{request_link}|request link>  |  {event_types}\n"
+
+
+def escape_mrkdwn(text: str) -> str:
+    if "&" not in text and "<" not in text and ">" not in text:
+        return text
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+class DailyReportBlocks:
+    """Slack blocks of a daily report, split into messages whose open items section fits SECTION_TEXT_LIMIT."""
+
+    def __init__(
+        self,
+        channel_name: str,
+        last_working_date: str,
+        completed_count: int,
+        open_count: int,
+        text_limit: int = SECTION_TEXT_LIMIT,
+    ):
+        self.text_limit = text_limit
+        self.header_blocks: List[Dict] = [
+            {"type": "header", "text": {"type": "plain_text", "text": channel_name, "emoji": True}},
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": SUMMARY_FORMAT.format(
+                        last_working_date=last_working_date, completed_count=completed_count, open_count=open_count
+                    ),
+                },
+            },
+            {"type": "divider"},
+        ]
+
+    def build(self, items: Iterable[Dict]) -> Iterator[List[Dict]]:
+        title = OPEN_ITEMS_TITLE
+        lines: List[str] = []
+        size = len(title)
+        for item in items:
+            line = self.format_item(item)
+            if lines and size + len(line) > self.text_limit:
+                yield self._piece(title, lines)
+                title = OPEN_ITEMS_CONT_TITLE
+                lines = []
+                size = len(title)
+            lines.append(line)
+            size += len(line)
+        yield self._piece(title, lines)
+
+    @staticmethod
+    def format_item(item: Dict) -> str:
+        # the start datetimes are naive, so isoformat gives SLACK_DATETIME_FMT without the cost of strftime
+        return ITEM_FORMAT.format(
+            start_datetime_utc=item["start_datetime_utc"].isoformat(" ", "seconds"),
+            request_link=escape_mrkdwn(item["request_link"] or ""),
+            event_types=get_emojis_str_from_list(item["event_type"]),
+        )
+
+    def _piece(self, title: str, lines: List[str]) -> List[Dict]:
+        section = {"type": "section", "text": {"type": "mrkdwn", "text": title + "".join(lines)}}
+        return self.header_blocks + [section] if title == OPEN_ITEMS_TITLE else [section]
@@ -0,0 +1,133 @@
+import datetime
+import heapq
+import os
+import threading
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+import pytz
+
+from src.code.const import SLACK_DATETIME_FMT
+from src.code.logger import create_logger
+from src.code.model.schemas import ChannelProperties
+from src.code.model.schemas import channel_properties_schema
+
+logger = create_logger(__name__)
+
+
+class ScheduledReport(NamedTuple):
+    report_datetime_utc: datetime.datetime
+    channel_id: str
+    schedule_idx: int
+    time_zone: str
+    local_time: str
+
+
+class DailyReportSchedule:
+    """Min-heap of the next report time of every daily report schedule of the active control panels.
+
+    The heap is built from the control panels once and rebuilt only when the daily report version of the control
+    panels changes, so the scheduler job reads the control panels of the channels whose report is due and nothing
+    else. A report that has been sent is pushed back with the report time of its next day.
+    """
+
+    check_interval_seconds: int = int(os.getenv("DAILY_REPORT_CHECK_INTERVAL_SECONDS", 60))
+    retry_seconds: int = int(os.getenv("DAILY_REPORT_RETRY_SECONDS", 600))
+    _heap: List[ScheduledReport] = []
+    _version: Optional[Tuple[int, int]] = None
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def is_stale(cls, version: Tuple[int, int]) -> bool:
+        return cls._version != version
+
+    @classmethod
+    def load(cls, control_panels: Iterable, version: Tuple[int, int], utc_now: datetime.datetime) -> None:
+        heap: List[ScheduledReport] = []
+        for cp in control_panels:
+            if not cp.channel_properties:
+                continue
+            channel_properties: ChannelProperties = channel_properties_schema.load(cp.channel_properties)
+            if channel_properties.daily_report is None:
+                continue
+            time_zone = channel_properties.daily_report.time_zone
+            for idx, schedule in enumerate(channel_properties.daily_report.schedules):
+                try:
+                    last_report_datetime_utc = (
+                        pytz.UTC.localize(
+                            datetime.datetime.strptime(schedule.last_report_datetime_utc, SLACK_DATETIME_FMT)
+                        )
+                        if schedule.last_report_datetime_utc
+                        else None
+                    )
+                    report_datetime_utc = cls.get_next_report_datetime_utc(
+                        time_zone, schedule.local_time, utc_now, last_report_datetime_utc
+                    )
+                except Exception:
+                    logger.exception(
+                        "Daily report schedule %s of channel %s is not valid", str(idx), cp.slack_channel_name
+                    )
+                    continue
+                heap.append(
+                    ScheduledReport(report_datetime_utc, cp.slack_channel_id, idx, time_zone, schedule.local_time)
+                )
+        heapq.heapify(heap)
+        with cls._lock:
+            cls._heap = heap
+            cls._version = version
+        logger.info("Daily report schedule loaded with %s schedules", str(len(heap)))
+
+    @classmethod
+    def pop_due(cls, utc_now: datetime.datetime) -> List[ScheduledReport]:
+        due: List[ScheduledReport] = []
+        with cls._lock:
+            while cls._heap and cls._heap[0].report_datetime_utc <= utc_now:
+                due.append(heapq.heappop(cls._heap))
+        return due
+
+    @classmethod
+    def push(cls, scheduled_report: ScheduledReport, report_datetime_utc: datetime.datetime) -> None:
+        with cls._lock:
+            heapq.heappush(cls._heap, scheduled_report._replace(report_datetime_utc=report_datetime_utc))
+
+    @classmethod
+    def get_next_report_datetime_utc(
+        cls,
+        time_zone: str,
+        local_time: str,
+        utc_now: datetime.datetime,
+        last_report_datetime_utc: Optional[datetime.datetime] = None,
+    ) -> datetime.datetime:
+        # a schedule that never reported is due at its report time of today, even if that has already passed
+        tz = pytz.timezone(time_zone)
+        scheduled_time = datetime.datetime.strptime(local_time, "%H:%M").time()
+        local_date = (last_report_datetime_utc or utc_now).astimezone(tz).date()
+        report_datetime_utc = cls._to_utc(tz, local_date, scheduled_time)
+        while last_report_datetime_utc is not None and report_datetime_utc <= last_report_datetime_utc:
+            local_date += datetime.timedelta(days=1)
+            report_datetime_utc = cls._to_utc(tz, local_date, scheduled_time)
+        return report_datetime_utc
+
+    @classmethod
+    def next_report_datetime_utc(cls) -> Optional[datetime.datetime]:
+        with cls._lock:
+            return cls._heap[0].report_datetime_utc if cls._heap else None
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._heap = []
+            cls._version = None
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {"size": len(cls._heap)}
+
+    @staticmethod
+    def _to_utc(tz, local_date: datetime.date, scheduled_time: datetime.time) -> datetime.datetime:
+        # a report time skipped or repeated by a DST change is resolved to standard time instead of raising
+        return tz.localize(datetime.datetime.combine(local_date, scheduled_time)).astimezone(pytz.UTC)
@@ -0,0 +1,91 @@
+import calendar
+import datetime
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from src.code.dto.dto import RequestStatsDto
+from src.code.model.request_rollup import ALL_REQUEST_TYPES
+from src.code.report.daily_report_blocks import SECTION_TEXT_LIMIT
+
+PERIODS = ("weekly", "monthly")
+PERIOD_TITLES = {"weekly": "Week", "monthly": "Month"}
+STATS_FORMAT = (
+    "{label}  *{created}* new | *{started}* started | *{completed}* completed"
+    " | time to start p50 {start_p50}, p90 {start_p90}, p99 {start_p99}"
+    " | time to complete p50 {complete_p50}, p90 {complete_p90}, p99 {complete_p99}\n"
+)
+
+
+def get_period_date_range(period: str, day: datetime.date) -> Tuple[datetime.date, datetime.date]:
+    if period == "weekly":
+        date_from = day - datetime.timedelta(days=day.weekday())
+        return date_from, date_from + datetime.timedelta(days=6)
+    if period == "monthly":
+        return day.replace(day=1), day.replace(day=calendar.monthrange(day.year, day.month)[1])
+    raise ValueError(f"Report period {period} is not one of {', '.join(PERIODS)}")
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 3600:
+        return f"{round(seconds / 60)}m"
+    if seconds < 24 * 3600:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / (24 * 3600):.1f}d"
+
+
+class PeriodReportBlocks:
+    """Slack blocks of a weekly or monthly report, one line of counts and percentiles per request type."""
+
+    def __init__(
+        self,
+        channel_name: str,
+        period: str,
+        date_from: datetime.date,
+        date_to: datetime.date,
+        text_limit: int = SECTION_TEXT_LIMIT,
+    ):
+        self.text_limit = text_limit
+        self.header_blocks: List[Dict] = [
+            {"type": "header", "text": {"type": "plain_text", "text": channel_name, "emoji": True}},
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*{PERIOD_TITLES[period]} {date_from.isoformat()} - {date_to.isoformat()}*",
+                },
+            },
+            {"type": "divider"},
+        ]
+
+    def build(self, stats: List[RequestStatsDto]) -> List[Dict]:
+        sections: List[str] = []
+        text = ""
+        for item in stats:
+            line = self.format_stats(item)
+            if text and len(text) + len(line) > self.text_limit:
+                sections.append(text)
+                text = ""
+            text += line
+        sections.append(text or "No requests")
+        return self.header_blocks + [
+            {"type": "section", "text": {"type": "mrkdwn", "text": section_text}} for section_text in sections
+        ]
+
+    @staticmethod
+    def format_stats(item: RequestStatsDto) -> str:
+        return STATS_FORMAT.format(
+            label="*All types:*" if item.request_type == ALL_REQUEST_TYPES else f":{item.request_type}:",
+            created=item.created,
+            started=item.started,
+            completed=item.completed,
+            start_p50=format_duration(item.time_to_start_p50),
+            start_p90=format_duration(item.time_to_start_p90),
+            start_p99=format_duration(item.time_to_start_p99),
+            complete_p50=format_duration(item.time_to_complete_p50),
+            complete_p90=format_duration(item.time_to_complete_p90),
+            complete_p99=format_duration(item.time_to_complete_p99),
+        )
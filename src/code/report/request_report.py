@@ -3,29 +3,34 @@ import os
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import TypedDict
 
 import pytz
 from slack import WebClient
 
-from src.code.const import DAILY_REPORT_ITEM_TEMPLATE
-from src.code.const import DAILY_REPORT_TEMPLATE
-from src.code.const import DAILY_REPORT_TEMPLATE_CONT
 from src.code.const import SLACK_DATETIME_FMT
 from src.code.dto.dto import ReportDto
 from src.code.logger import create_logger
 from src.code.model.control_panel import ControlPanel
 from src.code.model.custom_enums import RequestStatusEnum
 from src.code.model.request import Request
+from src.code.model.request_rollup import ALL_REQUEST_TYPES
+from src.code.model.request_rollup import RequestDailyRollup
 from src.code.model.schemas import ChannelProperties
-from src.code.model.schemas import DailyReport
-from src.code.model.schemas import Schedule
 from src.code.model.schemas import channel_properties_schema
+from src.code.report.daily_report_blocks import DailyReportBlocks
+from src.code.report.daily_report_schedule import DailyReportSchedule
+from src.code.report.daily_report_schedule import ScheduledReport
+from src.code.report.period_report_blocks import PERIODS
+from src.code.report.period_report_blocks import PeriodReportBlocks
+from src.code.report.period_report_blocks import get_period_date_range
+from src.code.utils.slack_rate_limiter import RateLimitedWebClient
 from src.code.utils.slack_webclient import SlackWebclient
 from src.code.utils.utils import datetime_to_date_string
 from src.code.utils.utils import extract_request_types
-from src.code.utils.utils import get_emojis_str_from_list
 from src.code.utils.utils import get_last_business_day_holidays_not_included
 from src.code.utils.utils import is_business_day
 
@@ -44,58 +49,119 @@ lambda_stat_list_handler: Callable[[Any], StatListHandler] = lambda x, type_dict
     "requestor": x.requestor_id,
 }
 
-client = WebClient(token=os.getenv("SLACK_TOKEN", "dummy"))
+client: WebClient = RateLimitedWebClient(token=os.getenv("SLACK_TOKEN", "dummy"))
 logger = create_logger(__name__)
 
 
+def get_report_periods(value: str) -> List[str]:
+    """The known report periods of a comma separated list like DAILY_REPORT_PERIODS, unknown ones are dropped."""
+    periods: List[str] = []
+    for period in (item.strip().lower() for item in value.split(",")):
+        if not period:
+            continue
+        if period not in PERIODS:
+            logger.warning("Report period %s is not one of %s, it is ignored", period, ", ".join(PERIODS))
+        elif period not in periods:
+            periods.append(period)
+    return periods
+
+
 class RequestReport:
+    # weekly and monthly reports sent with the first daily report after the period has ended
+    periods: List[str] = get_report_periods(os.getenv("DAILY_REPORT_PERIODS", ""))
+
     def daily_report(self):
         utc_now = datetime.datetime.now(tz=pytz.UTC)
+        version = ControlPanel().get_daily_report_version()
+        if DailyReportSchedule.is_stale(version):
+            DailyReportSchedule.load(ControlPanel().get_all_active_control_panels(), version, utc_now)
+        due_reports = DailyReportSchedule.pop_due(utc_now)
+        if not due_reports:
+            logger.debug("No daily report is due, next one is at %s", DailyReportSchedule.next_report_datetime_utc())
+            return
         logger.info("Daily report background process has been started at %s", utc_now.strftime(SLACK_DATETIME_FMT))
-        if not is_business_day(utc_now):
-            logger.info("Daily report prints only on business days, today is %s", utc_now.today().strftime("%A"))
+        business_day = is_business_day(utc_now)
+        if not business_day:
+            logger.info("Daily report prints only on business days, today is %s", utc_now.strftime("%A"))
+        for scheduled_report in due_reports:
+            if business_day:
+                try:
+                    self._generate_scheduled_report(scheduled_report, utc_now)
+                except Exception:
+                    logger.exception("Daily report for channel %s failed", scheduled_report.channel_id)
+                    DailyReportSchedule.push(
+                        scheduled_report, utc_now + datetime.timedelta(seconds=DailyReportSchedule.retry_seconds)
+                    )
+                    continue
+            DailyReportSchedule.push(
+                scheduled_report,
+                DailyReportSchedule.get_next_report_datetime_utc(
+                    scheduled_report.time_zone, scheduled_report.local_time, utc_now, utc_now
+                ),
+            )
+
+    def _generate_scheduled_report(self, scheduled_report: ScheduledReport, utc_now: datetime):
+        cp = ControlPanel().get_active_control_panel_details(scheduled_report.channel_id)
+        if cp is None or not cp.channel_properties:
+            logger.info("Daily report skipped, channel %s is not active", scheduled_report.channel_id)
+            return
+        channel_properties: ChannelProperties = channel_properties_schema.load(cp.channel_properties)
+        if (
+            channel_properties.daily_report is None
+            or len(channel_properties.daily_report.schedules) <= scheduled_report.schedule_idx
+        ):
+            logger.info("Daily report skipped, schedule of channel %s has been removed", cp.slack_channel_name)
             return
-        for cp in ControlPanel().get_all_active_control_panels():
-            if cp.channel_properties:
-                channel_properties: ChannelProperties = channel_properties_schema.load(cp.channel_properties)
-                if channel_properties.daily_report is not None:
-                    daily_report: DailyReport = channel_properties.daily_report
-                    for idx, schedule in enumerate(daily_report.schedules):
-                        if self._is_time_for_creating_report(
-                            schedule.last_report_datetime_utc, daily_report, schedule, utc_now
-                        ):
-                            logger.info(
-                                "Daily report for channel % has been started at %s",
-                                cp.slack_channel_name,
-                                utc_now.strftime(SLACK_DATETIME_FMT),
-                            )
-                            self._generate_report(cp, channel_properties, utc_now, idx)
-
-    def _is_time_for_creating_report(
-        self, last_report_datetime_utc: str, daily_report: DailyReport, schedule: Schedule, utc_now
-    ) -> bool:
         logger.info(
-            "Daily report process started checking if is time for creating report time: %s and last report was at: %s",
+            "Daily report for channel %s has been started at %s",
+            cp.slack_channel_name,
             utc_now.strftime(SLACK_DATETIME_FMT),
-            last_report_datetime_utc,
         )
-        tz = pytz.timezone(daily_report.time_zone)
-        scheduled_time = tz.localize(datetime.datetime.strptime(schedule.local_time, "%H:%M"), is_dst=None).time()
-        if not last_report_datetime_utc:
-            return scheduled_time <= utc_now.time()
-        else:
-            last_report_datetime_utc = pytz.UTC.localize(
-                datetime.datetime.strptime(last_report_datetime_utc, SLACK_DATETIME_FMT)
-            )
-            return last_report_datetime_utc.date() < utc_now.date() and scheduled_time <= utc_now.time()
+        self._generate_report(cp, channel_properties, utc_now, scheduled_report.schedule_idx)
+        if scheduled_report.schedule_idx == 0:
+            last_working_day = get_last_business_day_holidays_not_included(utc_now).date()
+            for period in self.periods:
+                # the daily report has been sent already, so a failed period report must not retry it
+                try:
+                    date_from, date_to = get_period_date_range(period, last_working_day)
+                    if date_to < utc_now.date():
+                        self.period_report(cp, channel_properties, period, date_from, date_to)
+                except Exception:
+                    logger.exception("%s report for channel %s failed", period, cp.slack_channel_name)
+
+    def period_report(
+        self,
+        cp: ControlPanel,
+        channel_properties: ChannelProperties,
+        period: str,
+        date_from: datetime.date,
+        date_to: datetime.date,
+    ) -> None:
+        RequestDailyRollup().apply_pending_deltas()
+        type_dict = channel_properties.types.emojis
+        stats = [
+            item
+            for item in RequestDailyRollup().get_period_stats(cp.slack_channel_id, date_from, date_to)
+            if item.request_type == ALL_REQUEST_TYPES or item.request_type in type_dict
+        ]
+        output_channel = channel_properties.daily_report.output_channel_name or cp.slack_channel_name
+        blocks = PeriodReportBlocks(cp.slack_channel_name, period, date_from, date_to).build(stats)
+        SlackWebclient().send_post_message_as_main_message(client, output_channel, blocks)
+        logger.info("%s report from %s has been sent to channel %s", period, date_from.isoformat(), output_channel)
 
     def _generate_report(self, cp: ControlPanel, channel_properties: ChannelProperties, utc_now: datetime, idx: int):
-        last_day_records = Request().get_last_working_day_records_sorted_by_date(cp.slack_channel_id, utc_now)
-        blocks = self._create_daily_report(cp.slack_channel_name, channel_properties, utc_now, last_day_records)
+        status_counts = Request().get_last_working_day_status_counts(cp.slack_channel_id, utc_now)
+        completed_count = status_counts.get(RequestStatusEnum.COMPLETED.value, 0)
+        open_count = sum(status_counts.values()) - completed_count
+        open_items = Request().stream_last_working_day_open_items(cp.slack_channel_id, utc_now)
         output_channel = channel_properties.daily_report.output_channel_name or cp.slack_channel_name
-        logger.info("Daily report is sending to channel %s in %s pace/s", output_channel, str(len(blocks)))
-        for block in blocks:
+        pieces = 0
+        for block in self._create_daily_report(
+            cp.slack_channel_name, channel_properties, utc_now, completed_count, open_count, open_items
+        ):
             SlackWebclient().send_post_message_as_main_message(client, output_channel, block)
+            pieces += 1
+        logger.info("Daily report has been sent to channel %s in %s pace/s", output_channel, str(pieces))
         ControlPanel().update_last_report_datetime_utc_field(idx, cp.slack_channel_id, utc_now)
 
     def _create_daily_report(
@@ -103,74 +169,28 @@ class RequestReport:
         channel_name: str,
         channel_properties: ChannelProperties,
         utc_now: datetime,
-        last_day_records: List[Request],
-    ) -> list[(str, int)]:
+        completed_count: int,
+        open_count: int,
+        open_items: Iterable[Any],
+    ) -> Iterator[List[Dict]]:
         type_dict = channel_properties.types.emojis
-        report_dto = self._get_report_dto(utc_now, last_day_records, type_dict)
-
-        block_limit = 3001
-        main_block = (
-            DAILY_REPORT_TEMPLATE.replace("$channel_name_placeholder", channel_name)
-            .replace("$last_day_date_placeholder", report_dto.last_working_date)
-            .replace("$last_day_completed_count_placeholder", str(report_dto.last_day_completed))
-            .replace("$last_day_open_count_placeholder", str(report_dto.last_day_open))
+        report_dto = self._get_report_dto(utc_now, completed_count, open_count, open_items, type_dict)
+        report_blocks = DailyReportBlocks(
+            channel_name, report_dto.last_working_date, report_dto.last_day_completed, report_dto.last_day_open
         )
-        main_block_limit = block_limit - len(main_block)
-
-        extra_block_limit = block_limit - len(DAILY_REPORT_TEMPLATE_CONT)
-
-        list_of_blocks = []
-        temp = ""
-        temp_count = 0
-        for item in report_dto.last_day_open_items:
-            adding_item = f"{self._item_to_daily_template(item)}\n"
-            temp_count += len(adding_item)
-            if temp_count > (main_block_limit if len(list_of_blocks) == 0 else extra_block_limit):
-                list_of_blocks.append(temp)
-                temp_count = 0
-                temp = ""
-            temp += adding_item
-        list_of_blocks.append(temp)
-
-        return [
-            main_block.replace("$last_day_items_placeholder", block)
-            if idx == 0
-            else DAILY_REPORT_TEMPLATE_CONT.replace("$last_day_items_placeholder", block)
-            for idx, block in enumerate(list_of_blocks)
-        ]
+        # every piece is yielded as soon as it is full, so only one piece of the report is held in memory
+        return report_blocks.build(report_dto.last_day_open_items)
 
-    def _get_report_dto(self, utc_now: datetime, last_day_records: List[Request], type_dict: Dict) -> ReportDto:
-        completed_list, open_list = self._get_basic_stats(last_day_records, type_dict)
+    def _get_report_dto(
+        self, utc_now: datetime, completed_count: int, open_count: int, open_items: Iterable[Any], type_dict: Dict
+    ) -> ReportDto:
         return ReportDto(
             report_datetime=utc_now,
             last_working_date=datetime_to_date_string(
                 get_last_business_day_holidays_not_included(utc_now - datetime.timedelta(days=1))
             ),
-            last_day_total=len(last_day_records),
-            last_day_completed=len(completed_list),
-            last_day_completed_items=completed_list,
-            last_day_open=len(open_list),
-            last_day_open_items=open_list,
-        )
-
-    def _get_basic_stats(self, last_day_records: List[Request], type_dict: Dict) -> tuple[List[Any], List[Any]]:
-        completed_list = [
-            lambda_stat_list_handler(_, type_dict)
-            for _ in last_day_records
-            if _.request_status == RequestStatusEnum.COMPLETED.value
-        ]
-        open_list = [
-            lambda_stat_list_handler(_, type_dict)
-            for _ in last_day_records
-            if _.request_status != RequestStatusEnum.COMPLETED.value
-        ]
-        return completed_list, open_list
-
-    def _item_to_daily_template(self, item: Any) -> str:
-        return (
-            DAILY_REPORT_ITEM_TEMPLATE.replace(
-                "$start_datetime_utc_placeholder", item["start_datetime_utc"].strftime(SLACK_DATETIME_FMT)
-            )
-            .replace("$request_link_placeholder", item["request_link"])
-            .replace("$event_type_placeholder", get_emojis_str_from_list(item["event_type"]))
+            last_day_total=completed_count + open_count,
+            last_day_completed=completed_count,
+            last_day_open=open_count,
+            last_day_open_items=(lambda_stat_list_handler(_, type_dict) for _ in open_items),
         )
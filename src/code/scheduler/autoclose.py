@@ -1,18 +1,30 @@
 import datetime
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 
+from flask import Flask
+from flask import current_app
+from flask import has_app_context
 from slack import WebClient
 from slack.errors import SlackApiError
 
 from src.code.logger import create_logger
+from src.code.model.autoclose_scan import AutocloseCursor
+from src.code.model.autoclose_scan import AutocloseThread
 from src.code.model.control_panel import ControlPanel
 from src.code.model.custom_enums import AutocloseStatus
 from src.code.model.request import Request
+from src.code.model.request import ThreadMessage
 from src.code.model.schemas import ChannelProperties
 from src.code.model.schemas import CloseIdleThreads
 from src.code.model.schemas import channel_properties_schema
+from src.code.utils.metrics import Metrics
 from src.code.utils.slack_utils import SlackUtils
 from src.code.utils.slack_webclient import SlackWebclient
 
@@ -20,55 +32,117 @@ logger = create_logger(__name__)
 
 
 class Autoclose:
+    max_workers: int = int(os.getenv("AUTOCLOSE_MAX_WORKERS", 4))
+    channel_time_budget_seconds: float = float(os.getenv("AUTOCLOSE_CHANNEL_TIME_BUDGET_SECONDS", 300))
+    # "slack" scans the channel history, "db" picks candidates from the requests table and confirms them on Slack
+    detection_mode: str = os.getenv("AUTOCLOSE_DETECTION_MODE", "slack").lower()
+    # the "slack" mode fetches only messages newer than the previous scan and keeps the threads in the database
+    incremental_scan: bool = os.getenv("AUTOCLOSE_INCREMENTAL_SCAN", "false").lower() == "true"
+    full_scan_interval: datetime.timedelta = datetime.timedelta(
+        hours=int(os.getenv("AUTOCLOSE_FULL_SCAN_INTERVAL_HOURS", 24))
+    )
+    # requests posted with attachments are file_share messages, the other subtypes are not requests
+    request_subtypes: Tuple[Optional[str], ...] = (None, "file_share")
+
     @classmethod
     def close_idle_threads(cls, client: WebClient) -> None:
         logger.info("Starting scan of idle threads.")
         current_time = datetime.datetime.now()
-        for entry in ControlPanel().get_all_active_control_panels():
-            try:
+        app: Optional[Flask] = current_app._get_current_object() if has_app_context() else None
+        entries = ControlPanel().get_all_active_control_panels()
+        with ThreadPoolExecutor(max_workers=max(cls.max_workers, 1), thread_name_prefix="autoclose") as executor:
+            futures = [executor.submit(cls._scan_channel, app, current_time, client, entry) for entry in entries]
+            api_calls_saved = sum(future.result() for future in futures)
+        Metrics.inc("autoclose_slack_api_calls_saved_total", api_calls_saved)
+        logger.info("Ending scan of idle threads, %s Slack API calls saved by stored replies", str(api_calls_saved))
+
+    @classmethod
+    def _scan_channel(
+        cls, app: Optional[Flask], current_time: datetime.datetime, client: WebClient, entry: ControlPanel
+    ) -> int:
+        # problems with one channel must not stop the scan of the other channels
+        try:
+            with app.app_context() if app is not None else nullcontext():
                 logger.info(
                     "Checking channel '%s', channel_id '%s', for idle threads",
                     entry.slack_channel_name,
                     entry.slack_channel_id,
                 )
-                message = None
-                cls._analyse_channel(current_time, client, entry)
-            except Exception:
-                logger.exception("There were problems while handling channel '%s'.", entry.slack_channel_name)
-                logger.error("checked message: %s", str(message) if message else "None")
-                logger.error("The channel was skipped.")
-        logger.info("Ending scan of idle threads")
+                return cls._analyse_channel(
+                    current_time, client, entry, deadline=time.monotonic() + cls.channel_time_budget_seconds
+                )
+        except Exception:
+            logger.exception("There were problems while handling channel '%s'.", entry.slack_channel_name)
+            logger.error("The channel was skipped.")
+            return 0
 
     @classmethod
-    def _analyse_channel(cls, current_time, client, entry):
+    def _analyse_channel(cls, current_time, client, entry, deadline: float = float("inf")) -> int:
+        api_calls_saved = 0
         channel_properties: ChannelProperties = channel_properties_schema.load(data=entry.channel_properties)
         if all([channel_properties.completion_reactions, channel_properties.close_idle_threads]):
             idle_thread_timestamps = cls._get_idle_thread_timestamps(
                 channel_properties.close_idle_threads, current_time
             )
-            messages: List = cls._get_all_messages_from_channel(
-                client, channel_id=entry.slack_channel_id, time_filter=idle_thread_timestamps["time_filter"]
-            )
+            if cls.detection_mode == "db":
+                messages = cls._get_candidate_messages_from_db(
+                    client, entry.slack_channel_id, idle_thread_timestamps, deadline
+                )
+            elif cls.incremental_scan:
+                messages = cls._get_messages_incrementally(
+                    client,
+                    channel_id=entry.slack_channel_id,
+                    time_filter=idle_thread_timestamps["time_filter"],
+                    deadline=deadline,
+                )
+            else:
+                messages = cls._get_all_messages_from_channel(
+                    client,
+                    channel_id=entry.slack_channel_id,
+                    time_filter=idle_thread_timestamps["time_filter"],
+                    deadline=deadline,
+                )
             logger.info("%s of items for analyzing", str(len(messages)))
+            stored_replies = ThreadMessage().get_latest_replies(
+                entry.slack_channel_id, [message["ts"] for message in messages if "latest_reply" in message]
+            )
             for message in messages:
-                if "thread_ts" in message and message["ts"] == message["thread_ts"] and "bot_id" not in message:
-                    if SlackUtils.message_closed(message, completion_reactions=channel_properties.completion_reactions):
-                        continue
-                    logger.debug("Message ts: %s", str(message["ts"]))
-                    logger.debug("Idle thread timestamps close_before: %s", str(idle_thread_timestamps["close_before"]))
-                    if float(message["ts"]) < idle_thread_timestamps["close_before"]:
-                        logger.debug("Unclosed message ts: %s", str(message["ts"]))
-                        if "latest_reply" not in message:  # message is not a thread or is main message of thread
-                            logger.debug("Latest_reply not in message for ts: %s", str(message["ts"]))
-                            cls._close_thread_message(
-                                client, entry, message, channel_properties.close_idle_threads.reminder_message
-                            )
-                        else:
-                            cls._proceed_with_latest_reply(
-                                entry, client, message, channel_properties, idle_thread_timestamps
-                            )
+                if cls._is_out_of_time(deadline, entry.slack_channel_id, "analysing threads"):
+                    break
+                api_calls_saved += cls._analyse_message(
+                    client, entry, message, channel_properties, idle_thread_timestamps, stored_replies
+                )
         else:
             logger.info("Channel has close_idle_threads or completion_reactions disabled. Skipping.")
+        return api_calls_saved
+
+    @classmethod
+    def _analyse_message(
+        cls,
+        client: WebClient,
+        entry: ControlPanel,
+        message: Dict,
+        channel_properties: ChannelProperties,
+        idle_thread_timestamps: Dict,
+        stored_replies: Dict[str, Dict],
+    ) -> int:
+        if "thread_ts" in message and cls._is_main_message(message):
+            if SlackUtils.message_closed(message, completion_reactions=channel_properties.completion_reactions):
+                return 0
+            logger.debug("Message ts: %s", str(message["ts"]))
+            logger.debug("Idle thread timestamps close_before: %s", str(idle_thread_timestamps["close_before"]))
+            if float(message["ts"]) < idle_thread_timestamps["close_before"]:
+                logger.debug("Unclosed message ts: %s", str(message["ts"]))
+                if "latest_reply" not in message:  # message is not a thread or is main message of thread
+                    logger.debug("Latest_reply not in message for ts: %s", str(message["ts"]))
+                    cls._close_thread_message(
+                        client, entry, message, channel_properties.close_idle_threads.reminder_message
+                    )
+                else:
+                    return cls._proceed_with_latest_reply(
+                        entry, client, message, channel_properties, idle_thread_timestamps, stored_replies
+                    )
+        return 0
 
     @classmethod
     def _proceed_with_latest_reply(
@@ -78,8 +152,12 @@ class Autoclose:
         message: Dict,
         channel_properties: ChannelProperties,
         idle_thread_timestamps: Dict,
-    ):
-        latest_reply = cls._get_latest_reply(message["ts"], message["latest_reply"], entry.slack_channel_id, client)
+        stored_replies: Dict[str, Dict],
+    ) -> int:
+        latest_reply, api_calls_saved = cls._resolve_latest_reply(
+            message, entry.slack_channel_id, client, stored_replies
+        )
+        latest_reply_text = cls._get_first_block_text(latest_reply)
         user = latest_reply["user"] if "user" in latest_reply else latest_reply["bot_id"]
         latest_reply_float = float(message["latest_reply"])
         logger.debug(
@@ -90,13 +168,13 @@ class Autoclose:
             idle_thread_timestamps["reminder_grace_period"],
         )
         if (
-            channel_properties.close_idle_threads.reminder_message != latest_reply["blocks"][0]["text"]["text"]
+            channel_properties.close_idle_threads.reminder_message != latest_reply_text
             and latest_reply_float < idle_thread_timestamps["reminder_grace_period"]
         ):
             cls._close_thread_message(client, entry, message, channel_properties.close_idle_threads.reminder_message)
         elif (
             # This should be improved
-            channel_properties.close_idle_threads.reminder_message == latest_reply["blocks"][0]["text"]["text"]
+            channel_properties.close_idle_threads.reminder_message == latest_reply_text
             and latest_reply_float < idle_thread_timestamps["close_grace_period"]
         ):
             cls._close_thread(
@@ -111,6 +189,7 @@ class Autoclose:
                     }
                 ],
             )
+        return api_calls_saved
 
     @classmethod
     def _get_idle_thread_timestamps(
@@ -168,6 +247,7 @@ class Autoclose:
         logger.info("Closing thread %s", ts)
         client.reactions_add(channel=channel, name=completion_reactions[0], timestamp=ts)
         SlackWebclient.send_post_message_to_thread(client, channel, ts, close_message_slack_blocks)
+        cls._mark_thread_changed(channel, ts)
         try:
             Request().close_request(
                 channel_id=channel,
@@ -178,10 +258,11 @@ class Autoclose:
             cls._send_close_message_flag_to_db(channel, ts)
         except Exception:
             logger.exception("Cannot add reaction to request in database")
-        time.sleep(1)
 
     @classmethod
-    def _get_all_messages_from_channel(cls, client: WebClient, channel_id: str, time_filter: float) -> List:
+    def _get_all_messages_from_channel(
+        cls, client: WebClient, channel_id: str, time_filter: float, deadline: float = float("inf")
+    ) -> List:
         time_filter_for_debug = str(datetime.datetime.fromtimestamp(time_filter))
         logger.debug("Grabbing messages for channel_id %s, time_filter %s", channel_id, time_filter_for_debug)
         try:
@@ -190,6 +271,9 @@ class Autoclose:
             ).data
             result: List = page["messages"]
             while page["has_more"]:
+                # the history is paged from the newest message, a cut short scan has the newest threads
+                if cls._is_out_of_time(deadline, channel_id, "paging the history"):
+                    break
                 logger.debug(
                     "Grabbing more messages for channel_id %s, time_filter %s, cursor %s",
                     channel_id,
@@ -209,13 +293,147 @@ class Autoclose:
             logger.error("Error grabbing messages from channel %s", channel_id)
             raise
 
+    @classmethod
+    def _get_candidate_messages_from_db(
+        cls, client: WebClient, channel_id: str, idle_thread_timestamps: Dict, deadline: float = float("inf")
+    ) -> List:
+        candidates = Request().get_idle_thread_candidates(
+            channel_id,
+            oldest_ts=idle_thread_timestamps["time_filter"],
+            created_before_ts=idle_thread_timestamps["close_before"],
+            reminder_before_ts=idle_thread_timestamps["reminder_grace_period"],
+            close_before_ts=idle_thread_timestamps["close_grace_period"],
+        )
+        logger.debug("%s idle thread candidates found in database for channel_id %s", str(len(candidates)), channel_id)
+        messages = []
+        for ts in candidates:
+            if cls._is_out_of_time(deadline, channel_id, "confirming candidates"):
+                break
+            message = cls._get_main_message(client, channel_id, ts)
+            if message is not None:
+                messages.append(message)
+        return messages
+
+    @classmethod
+    def _get_messages_incrementally(
+        cls, client: WebClient, channel_id: str, time_filter: float, deadline: float = float("inf")
+    ) -> List:
+        cursor = AutocloseCursor().get_cursor(channel_id)
+        if cursor is None or cursor.full_scan_datetime_utc < datetime.datetime.utcnow() - cls.full_scan_interval:
+            messages = cls._get_all_messages_from_channel(client, channel_id, time_filter, deadline)
+            if time.monotonic() > deadline:
+                # a cut short scan misses the oldest threads, the stored ones and the cursor wait for a complete scan
+                AutocloseThread().save_messages(channel_id, cls._get_main_messages(messages))
+                return messages
+            AutocloseThread().save_messages(channel_id, cls._get_main_messages(messages), replace=True)
+            AutocloseCursor().save_cursor(channel_id, cls._get_latest_ts(messages, time_filter), full_scan=True)
+            return messages
+        new_messages = cls._get_all_messages_from_channel(
+            client, channel_id, max(float(cursor.latest_ts), time_filter), deadline
+        )
+        # the cursor moves only past a complete fetch of the new messages
+        new_messages_complete = time.monotonic() <= deadline
+        changed_messages = []
+        removed_timestamps = []
+        stale_timestamps = AutocloseThread().get_stale_thread_timestamps(channel_id)
+        for ts in stale_timestamps:
+            # the threads not fetched again stay stale for the next scan
+            if cls._is_out_of_time(deadline, channel_id, "fetching changed threads"):
+                break
+            message = cls._get_main_message(client, channel_id, ts)
+            if message is None:
+                removed_timestamps.append(ts)
+            else:
+                changed_messages.append(message)
+        logger.debug(
+            "%s new messages and %s changed threads for channel_id %s",
+            str(len(new_messages)),
+            str(len(stale_timestamps)),
+            channel_id,
+        )
+        AutocloseThread().save_messages(channel_id, cls._get_main_messages(new_messages + changed_messages))
+        AutocloseThread().remove_threads(channel_id, removed_timestamps)
+        AutocloseThread().remove_older_than(channel_id, time_filter)
+        if new_messages_complete:
+            AutocloseCursor().save_cursor(
+                channel_id, cls._get_latest_ts(new_messages, float(cursor.latest_ts)), full_scan=False
+            )
+        return AutocloseThread().get_messages(channel_id, time_filter)
+
+    @classmethod
+    def _is_out_of_time(cls, deadline: float, channel_id: str, step: str) -> bool:
+        if time.monotonic() <= deadline:
+            return False
+        logger.warning(
+            "Time budget for channel_id %s exceeded while %s, the rest is left for the next scan", channel_id, step
+        )
+        return True
+
+    @classmethod
+    def _is_main_message(cls, message: Dict) -> bool:
+        # a thread_broadcast is a reply shown in the channel, its thread_ts is the main message ts
+        return (
+            message.get("thread_ts", message["ts"]) == message["ts"]
+            and "bot_id" not in message
+            and message.get("subtype") in cls.request_subtypes
+        )
+
+    @classmethod
+    def _get_main_messages(cls, messages: List[Dict]) -> List[Dict]:
+        # messages without replies have no thread_ts yet, they are kept as they can become threads later
+        return [message for message in messages if cls._is_main_message(message)]
+
+    @classmethod
+    def _get_latest_ts(cls, messages: List[Dict], default: float) -> float:
+        return max([float(message["ts"]) for message in messages] + [default])
+
+    @classmethod
+    def _get_main_message(cls, client: WebClient, channel_id: str, ts: str) -> Optional[Dict]:
+        try:
+            # Slack returns the main message first, with its reactions and latest_reply
+            return client.conversations_replies(channel=channel_id, ts=ts, limit=1).data["messages"][0]
+        except SlackApiError as e:
+            if e.response.get("error") != "thread_not_found":
+                raise
+            logger.info("Main message %s does not exist in channel %s anymore", ts, channel_id)
+            return None
+
     @classmethod
     def _close_thread_message(cls, client: WebClient, entry: ControlPanel, message: Dict, message_string: str) -> None:
         logger.info("Sending reminder to main message %s", message["ts"])
         blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": message_string}}]
         SlackWebclient.send_post_message_to_thread(client, entry.slack_channel_id, message["ts"], blocks)
+        cls._mark_thread_changed(entry.slack_channel_id, message["ts"])
         cls._send_reminder_message_flag_to_db(entry.slack_channel_id, message["ts"])
-        time.sleep(1)
+
+    @classmethod
+    def _resolve_latest_reply(
+        cls, message: Dict, channel: str, client: WebClient, stored_replies: Dict[str, Dict]
+    ) -> Tuple[Dict, int]:
+        # the stored reply is only used while it is the latest one, bot replies like the reminder are not stored
+        stored_reply = stored_replies.get(message["ts"])
+        if stored_reply is not None and stored_reply["ts"] == message["latest_reply"]:
+            return stored_reply, 1
+        if not cls.incremental_scan or cls.detection_mode == "db":
+            return cls._get_latest_reply(message["ts"], message["latest_reply"], channel, client), 0
+        latest_reply = AutocloseThread().get_latest_reply(channel, message["ts"], message["latest_reply"])
+        if latest_reply is not None:
+            return latest_reply, 1
+        latest_reply = cls._get_latest_reply(message["ts"], message["latest_reply"], channel, client)
+        AutocloseThread().save_latest_reply(channel, message["ts"], latest_reply)
+        return latest_reply, 0
+
+    @classmethod
+    def _get_first_block_text(cls, latest_reply: Dict) -> Optional[str]:
+        # replies written by users start with a rich_text block, which has no text
+        blocks = latest_reply.get("blocks") or [{}]
+        return blocks[0].get("text", {}).get("text")
+
+    @classmethod
+    def _mark_thread_changed(cls, channel_id: str, ts: str) -> None:
+        # the posted message moves latest_reply of the thread, so the next scan fetches the thread again
+        if cls.incremental_scan and cls.detection_mode != "db":
+            AutocloseThread().mark_stale(channel_id, ts)
 
     @classmethod
     def _get_latest_reply(cls, parent_ts: str, ts: str, channel: str, client: WebClient) -> Dict:
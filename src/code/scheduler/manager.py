@@ -1,4 +1,5 @@
 import atexit
+import datetime
 import os
 import time
 from functools import wraps
@@ -11,8 +12,14 @@ from src.code.const import client
 from src.code.logger import create_logger
 from src.code.model.control_panel import ControlPanel
 from src.code.model.distributed_lock import DistributedLockHandler
+from src.code.model.queued_event import QueuedEvent
+from src.code.model.request_rollup import RequestDailyRollup
+from src.code.report.daily_report_schedule import DailyReportSchedule
 from src.code.report.request_report import RequestReport
 from src.code.scheduler.autoclose import Autoclose
+from src.code.utils.event_deduplicator import EventDeduplicator
+from src.code.utils.metrics import Metrics
+from src.code.utils.requestor_profile_cache import RequestorProfileCache
 from src.code.utils.slack_webclient import SlackWebclient
 
 logger = create_logger(__name__)
@@ -20,6 +27,15 @@ logger = create_logger(__name__)
 
 def scheduler_job(with_lock=True, debug_level=False):
     def decorator(func):
+        def timed_func(self, *args, **kwargs):
+            job_name = func.__name__.lstrip("_")
+            try:
+                with Metrics.time("scheduler_job_seconds", job=job_name):
+                    func(self, *args, **kwargs)
+            except Exception:
+                Metrics.inc("scheduler_job_failures_total", job=job_name)
+                raise
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             with self.scheduler.app.app_context():
@@ -29,14 +45,14 @@ def scheduler_job(with_lock=True, debug_level=False):
                     logger.info("Apscheduler triggered %s", func.__name__)
                 if with_lock:
                     if DistributedLockHandler.scheduler_lock_acquired:
-                        func(self, *args, **kwargs)
+                        timed_func(self, *args, **kwargs)
                     else:
                         if debug_level:
                             logger.debug("Node does not have scheduler lock - skipping %s run", func.__name__)
                         else:
                             logger.info("Node does not have scheduler lock - skipping %s run", func.__name__)
                 else:
-                    func(self, *args, **kwargs)
+                    timed_func(self, *args, **kwargs)
 
         return wrapper
 
@@ -88,8 +104,33 @@ class SchedulerManager:
                 hour="*",
                 day_of_week="1-4",
             )
+        if os.environ.get("FEATURE_REQUESTOR_PROFILES_WARM_UP", "False").lower() == "true":
+            logger.info("Adding warm_up_requestor_profiles")
+            self.scheduler.add_job(
+                id="warm_up_requestor_profiles",
+                func=self._warm_up_requestor_profiles,
+                trigger="interval",
+                hours=24,
+                next_run_time=datetime.datetime.now(),
+            )
+        logger.info("Adding purge_processed_events")
+        self.scheduler.add_job(
+            id="purge_processed_events", func=self._purge_processed_events, trigger="interval", minutes=10
+        )
         logger.info("Adding daily_report")
-        self.scheduler.add_job(id="daily_report", func=self._daily_report, trigger="interval", minutes=10)
+        self.scheduler.add_job(
+            id="daily_report",
+            func=self._daily_report,
+            trigger="interval",
+            seconds=DailyReportSchedule.check_interval_seconds,
+        )
+        logger.info("Adding apply_request_rollups")
+        self.scheduler.add_job(
+            id="apply_request_rollups",
+            func=self._apply_request_rollups,
+            trigger="interval",
+            seconds=RequestDailyRollup.apply_interval_seconds,
+        )
         self._add_channel_message_jobs()
 
     def _add_channel_message_jobs(self):
@@ -136,6 +177,8 @@ class SchedulerManager:
 
     def _recreate_jobs_in_scheduler(self):
         logger.info("Recreating jobs in scheduler")
+        # another node may have sent reports while this one did not hold the scheduler lock
+        DailyReportSchedule.reset()
         self._remove_jobs()
         self._add_jobs()
         logger.info("Scheduler jobs recreated")
@@ -149,6 +192,19 @@ class SchedulerManager:
     def _complete_idle_threads(self):
         Autoclose.close_idle_threads(client)
 
+    @scheduler_job()
+    def _warm_up_requestor_profiles(self):
+        RequestorProfileCache.warm_up(client)
+
+    @scheduler_job()
+    def _purge_processed_events(self):
+        EventDeduplicator.purge_expired()
+        QueuedEvent().purge_failed()
+
+    @scheduler_job()
+    def _apply_request_rollups(self):
+        RequestDailyRollup().apply_pending_deltas()
+
     @scheduler_job()
     def _daily_report(self):
         RequestReport().daily_report()
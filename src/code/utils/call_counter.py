@@ -0,0 +1,37 @@
+import threading
+from typing import Any
+
+from slack import WebClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DB_QUERIES = "db_queries"
+SLACK_API_CALLS = "slack_api_calls"
+
+
+class CallCounter:
+    """Per-thread running totals of DB queries and Slack API calls.
+
+    A caller takes `get` before and after a unit of work and uses the difference, so nested scopes don't interfere.
+    """
+
+    _local = threading.local()
+
+    @classmethod
+    def increment(cls, kind: str) -> None:
+        setattr(cls._local, kind, getattr(cls._local, kind, 0) + 1)
+
+    @classmethod
+    def get(cls, kind: str) -> int:
+        return getattr(cls._local, kind, 0)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(*args: Any) -> None:
+    CallCounter.increment(DB_QUERIES)
+
+
+class CountingWebClient(WebClient):
+    def api_call(self, api_method: str, **kwargs):
+        CallCounter.increment(SLACK_API_CALLS)
+        return super().api_call(api_method, **kwargs)
@@ -0,0 +1,41 @@
+from typing import Dict
+from typing import Optional
+
+from src.code.model.custom_enums import MessageType
+from src.code.model.request import Request
+from src.code.model.schemas import ChannelProperties
+from src.code.utils.event_context import EventContext
+from src.code.utils.slack_event_type import SlackEventType
+from src.code.utils.slack_utils import SlackUtils
+
+
+class ClassifiedEvent:
+    """A Slack event classified once, with its channel, main message ts and the request of the main message.
+
+    The request is resolved at most once through the EventContext of the main message, which also serves the
+    classification of an edit, so the handlers of an event share a single request lookup.
+    """
+
+    def __init__(self, event: Dict):
+        self.event = event
+        self.event_group: str = SlackEventType(event).get_event_group()
+        # an edit is classified by whether the edited message is a request, so its context is known up front
+        context: Optional[EventContext] = None
+        if event.get("subtype") == "message_changed":
+            context = EventContext(event["channel"], event["message"]["ts"])
+        self.event_type: MessageType = SlackEventType(event, context).get_event_type()
+        self.channel_id: str = SlackUtils.get_channel_id(event, self.event_type)
+        self.main_ts: str = SlackUtils.get_main_ts(event, self.event_type)
+        self.context: EventContext = context or EventContext(self.channel_id, self.main_ts)
+
+    @property
+    def request(self) -> Optional[Request]:
+        return self.context.request
+
+    @property
+    def channel_properties(self) -> ChannelProperties:
+        return self.context.channel_properties
+
+    @property
+    def is_main_message(self) -> bool:
+        return SlackUtils.is_main_message_event(self.event_type)
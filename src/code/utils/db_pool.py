@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import Union
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+from sqlalchemy.pool import QueuePool
+
+from src.code.logger import create_logger
+
+logger = create_logger(__name__)
+
+
+def get_engine_options() -> Dict[str, Any]:
+    pool_size = int(os.getenv("DB_POOL_SIZE", 10))
+    max_overflow = int(os.getenv("DB_POOL_MAX_OVERFLOW", 20))
+    if os.getenv("DB_POOL_SIZE_FROM_GREENLETS", "false").lower() == "true":
+        # every greenlet can hold a connection at peak, so the pool never makes a greenlet wait
+        max_overflow = max(int(os.getenv("GEVENT_GREENLETS", 128)) - pool_size, 0)
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT_SECONDS", 30)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE_SECONDS", 3600)),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
+
+
+class DbPoolMetrics:
+    checkouts: int = 0
+    checkout_timeouts: int = 0
+    checkout_wait_seconds_total: float = 0.0
+    checkout_wait_seconds_max: float = 0.0
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def record_checkout(cls, wait_seconds: float, timed_out: bool = False) -> None:
+        with cls._lock:
+            if timed_out:
+                cls.checkout_timeouts += 1
+            else:
+                cls.checkouts += 1
+            cls.checkout_wait_seconds_total += wait_seconds
+            cls.checkout_wait_seconds_max = max(cls.checkout_wait_seconds_max, wait_seconds)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls.checkouts = 0
+            cls.checkout_timeouts = 0
+            cls.checkout_wait_seconds_total = 0.0
+            cls.checkout_wait_seconds_max = 0.0
+
+    @classmethod
+    def stats(cls, pool: Pool) -> Dict[str, Union[int, float]]:
+        result: Dict[str, Union[int, float]] = {
+            "checkouts": cls.checkouts,
+            "checkout_timeouts": cls.checkout_timeouts,
+            "checkout_wait_seconds_total": cls.checkout_wait_seconds_total,
+            "checkout_wait_seconds_max": cls.checkout_wait_seconds_max,
+        }
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            result.update(
+                {
+                    "size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": max(pool.overflow(), 0),
+                    "utilisation": pool.checkedout() / capacity if capacity else 0.0,
+                }
+            )
+        return result
+
+
+class InstrumentedQueuePool(QueuePool):
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            DbPoolMetrics.record_checkout(time.perf_counter() - start, timed_out=True)
+            logger.error("Database pool exhausted, %s connections checked out", str(self.checkedout()))
+            raise
+        DbPoolMetrics.record_checkout(time.perf_counter() - start)
+        return connection
@@ -0,0 +1,78 @@
+import threading
+from typing import Dict
+from typing import Optional
+
+from src.code.db import db
+from src.code.logger import create_logger
+from src.code.model.control_panel import ControlPanel
+from src.code.model.request import Request
+from src.code.model.schemas import ChannelProperties
+from src.code.utils.call_counter import DB_QUERIES
+from src.code.utils.call_counter import CallCounter
+
+logger = create_logger(__name__)
+
+
+class EventContext:
+    """Unit of work of a single Slack event.
+
+    The request row and the channel properties are resolved at most once, all the changes made to the request are
+    committed in one transaction when the context exits, and the number of queries issued by the event is logged.
+    """
+
+    events: int = 0
+    queries: int = 0
+    _lock: threading.Lock = threading.Lock()
+
+    def __init__(self, channel_id: str, event_ts: Optional[str]):
+        self.channel_id = channel_id
+        self.event_ts = event_ts
+        self.query_count = 0
+        self._queries_at_enter = 0
+        self._request: Optional[Request] = None
+        self._request_resolved = False
+        self._channel_properties: Optional[ChannelProperties] = None
+
+    @property
+    def request(self) -> Optional[Request]:
+        if not self._request_resolved:
+            if self.event_ts is not None:
+                self._request = Request().get_request(self.channel_id, self.event_ts)
+            self._request_resolved = True
+        return self._request
+
+    @property
+    def channel_properties(self) -> ChannelProperties:
+        if self._channel_properties is None:
+            self._channel_properties = ControlPanel().get_channel_properties_by_channel_id(self.channel_id)
+        return self._channel_properties
+
+    def __enter__(self) -> "EventContext":
+        self._queries_at_enter = CallCounter.get(DB_QUERIES)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            if self._request_resolved:
+                if exc_type is None:
+                    db.session.commit()
+                else:
+                    db.session.rollback()
+        finally:
+            self.query_count = CallCounter.get(DB_QUERIES) - self._queries_at_enter
+            with self._lock:
+                EventContext.events += 1
+                EventContext.queries += self.query_count
+            logger.info(
+                "Event %s in channel %s issued %s queries", self.event_ts, self.channel_id, str(self.query_count)
+            )
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls.events = 0
+            cls.queries = 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {"events": cls.events, "queries": cls.queries}
@@ -0,0 +1,66 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict
+from typing import Optional
+
+from src.code.logger import create_logger
+from src.code.model.processed_event import ProcessedEvent
+
+logger = create_logger(__name__)
+
+
+class EventDeduplicator:
+    window: timedelta = timedelta(seconds=int(os.getenv("EVENT_DEDUP_WINDOW_SECONDS", 3600)))
+    duplicates: int = 0
+    _seen: "OrderedDict[str, float]" = OrderedDict()
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def is_duplicate(cls, payload: Dict, retry_num: Optional[str] = None) -> bool:
+        event_id: Optional[str] = payload.get("event_id")
+        if not event_id:
+            return False
+        if cls._seen_recently(event_id) or not ProcessedEvent().mark_processed(
+            event_id, int(retry_num) if retry_num else None
+        ):
+            cls.duplicates += 1
+            logger.info("Dropping duplicate delivery of event %s, retry number %s", event_id, retry_num or "0")
+            return True
+        # only an event recorded in processed_events is remembered, a failed insert lets the redelivery through
+        cls._remember(event_id)
+        return False
+
+    @classmethod
+    def forget(cls, payload: Dict) -> None:
+        event_id: Optional[str] = payload.get("event_id")
+        if not event_id:
+            return
+        with cls._lock:
+            cls._seen.pop(event_id, None)
+        ProcessedEvent().forget(event_id)
+
+    @classmethod
+    def purge_expired(cls) -> int:
+        return ProcessedEvent().purge_older_than(cls.window)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._seen.clear()
+        cls.duplicates = 0
+
+    @classmethod
+    def _seen_recently(cls, event_id: str) -> bool:
+        now = time.monotonic()
+        with cls._lock:
+            while cls._seen and next(iter(cls._seen.values())) <= now:
+                cls._seen.popitem(last=False)
+            return event_id in cls._seen
+
+    @classmethod
+    def _remember(cls, event_id: str) -> None:
+        with cls._lock:
+            cls._seen[event_id] = time.monotonic() + cls.window.total_seconds()
@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from datetime import timedelta
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from flask import Flask
+from flask import has_request_context
+from flask import request
+from slack import WebClient
+
+from src.code.db import db
+from src.code.logger import create_logger
+from src.code.model.distributed_lock import DistributedLockHandler
+from src.code.model.queued_event import QueuedEvent
+from src.code.utils.call_counter import DB_QUERIES
+from src.code.utils.call_counter import SLACK_API_CALLS
+from src.code.utils.call_counter import CallCounter
+from src.code.utils.custom_event_adapter import CustomEventAdapter
+from src.code.utils.event_deduplicator import EventDeduplicator
+from src.code.utils.metrics import Metrics
+
+logger = create_logger(__name__)
+
+
+class EventDispatcher:
+    queue_mode: bool = os.getenv("EVENT_INGESTION_MODE", "sync").lower() == "queue"
+    handlers: Dict[str, Callable[[Dict, WebClient], None]] = {
+        "message": CustomEventAdapter.message,
+        "reaction_added": CustomEventAdapter.add_reaction_to_request,
+        "reaction_removed": CustomEventAdapter.remove_reaction_from_request,
+    }
+
+    @classmethod
+    def dispatch(cls, event_type: str, payload: Dict, client: WebClient) -> None:
+        retry_num: Optional[str] = request.headers.get("X-Slack-Retry-Num") if has_request_context() else None
+        try:
+            if EventDeduplicator.is_duplicate(payload, retry_num):
+                return
+        except Exception:
+            # the event was not recorded as processed, so a redelivery is still handled
+            db.session.rollback()
+            raise
+        try:
+            if cls.queue_mode:
+                QueuedEvent().enqueue(event_type, payload)
+            else:
+                cls.process(event_type, payload, client)
+        except Exception:
+            # let Slack redeliver an event which has not been processed
+            db.session.rollback()
+            EventDeduplicator.forget(payload)
+            raise
+
+    @classmethod
+    def process(cls, event_type: str, payload: Dict, client: WebClient) -> None:
+        handler = cls.handlers.get(event_type)
+        if handler is None:
+            raise ValueError(f"No handler registered for event type {event_type}")
+        queries_before = CallCounter.get(DB_QUERIES)
+        slack_api_calls_before = CallCounter.get(SLACK_API_CALLS)
+        try:
+            with Metrics.time("slack_event_handler_seconds", handler=event_type):
+                handler(payload, client)
+        except Exception:
+            Metrics.inc("slack_event_failures_total", handler=event_type)
+            raise
+        finally:
+            Metrics.observe("slack_event_db_queries", CallCounter.get(DB_QUERIES) - queries_before, handler=event_type)
+            Metrics.observe(
+                "slack_event_slack_api_calls",
+                CallCounter.get(SLACK_API_CALLS) - slack_api_calls_before,
+                handler=event_type,
+            )
+
+
+class EventQueueWorkerPool:
+    workers_count: int = int(os.getenv("EVENT_QUEUE_WORKERS", 4))
+    poll_interval_seconds: float = float(os.getenv("EVENT_QUEUE_POLL_INTERVAL_SECONDS", 0.5))
+    claim_timeout: timedelta = timedelta(seconds=int(os.getenv("EVENT_QUEUE_CLAIM_TIMEOUT_SECONDS", 300)))
+    max_attempts: int = int(os.getenv("EVENT_QUEUE_MAX_ATTEMPTS", 3))
+    release_interval_seconds: float = float(os.getenv("EVENT_QUEUE_RELEASE_INTERVAL_SECONDS", 60))
+
+    def __init__(self, app: Flask, client: WebClient):
+        self.app = app
+        self.client = client
+        self._stopped = threading.Event()
+        self._workers: List[threading.Thread] = []
+        # the idle workers of the pool share one release of stale claims per interval
+        self._next_release: float = 0.0
+        self._release_lock = threading.Lock()
+
+    def start(self) -> None:
+        logger.info("Starting %s event queue workers", str(self.workers_count))
+        for idx in range(self.workers_count):
+            worker = threading.Thread(target=self._run, name=f"event-queue-worker-{idx}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self) -> None:
+        logger.info("Stopping event queue workers")
+        self._stopped.set()
+        for worker in self._workers:
+            worker.join(timeout=self.poll_interval_seconds * 2)
+
+    def _run(self) -> None:
+        worker_id = f"{DistributedLockHandler.bot_instance}-{threading.current_thread().name}"
+        while not self._stopped.is_set():
+            with self.app.app_context():
+                try:
+                    processed = self._process_next(worker_id)
+                except Exception:
+                    logger.exception("Event queue worker %s failed while polling", worker_id)
+                    db.session.rollback()
+                    processed = False
+            if not processed:
+                self._stopped.wait(self.poll_interval_seconds)
+
+    def _process_next(self, worker_id: str) -> bool:
+        queued_event: Optional[QueuedEvent] = QueuedEvent().claim_next(worker_id)
+        if queued_event is None:
+            self._release_stale_claims()
+            return False
+        event_id: int = queued_event.id
+        try:
+            EventDispatcher.process(queued_event.event_type, queued_event.payload, self.client)
+        except Exception:
+            logger.exception("Processing queued event %s failed", str(event_id))
+            db.session.rollback()
+            QueuedEvent().fail(event_id, self.max_attempts)
+            return True
+        QueuedEvent().complete(event_id)
+        return True
+
+    def _release_stale_claims(self) -> None:
+        with self._release_lock:
+            now = time.monotonic()
+            if now < self._next_release:
+                return
+            self._next_release = now + self.release_interval_seconds
+        QueuedEvent().release_stale_claims(self.claim_timeout)
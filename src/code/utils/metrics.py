@@ -0,0 +1,188 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from src.code.logger import create_logger
+
+logger = create_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+COUNT_BUCKETS: Tuple[float, ...] = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+HISTOGRAMS: Dict[str, Tuple[str, Tuple[float, ...]]] = {
+    "slack_event_handler_seconds": ("Latency of Slack event handlers", LATENCY_BUCKETS),
+    "slack_event_db_queries": ("DB queries issued per Slack event", COUNT_BUCKETS),
+    "slack_event_slack_api_calls": ("Slack API calls issued per Slack event", COUNT_BUCKETS),
+    "http_request_seconds": ("Latency of HTTP endpoints", LATENCY_BUCKETS),
+    "scheduler_job_seconds": ("Duration of scheduler jobs", LATENCY_BUCKETS),
+}
+COUNTERS: Dict[str, str] = {
+    "slack_event_failures_total": "Slack events whose handler raised an exception",
+    "scheduler_job_failures_total": "Scheduler jobs which raised an exception",
+    "autoclose_slack_api_calls_saved_total": "Slack API calls autoclose answered from stored replies",
+}
+GAUGES: Dict[str, str] = {
+    "event_queue_depth": "Pending events in the event queue",
+    "db_pool_checked_out": "Database connections checked out of the pool of this worker",
+    "db_pool_utilisation": "Share of the pool capacity of this worker in use",
+}
+
+LabelsKey = Tuple[Tuple[str, str], ...]
+SeriesKey = Tuple[str, LabelsKey]
+
+
+class Metrics:
+    """Process-wide metrics registry rendered in the Prometheus text format.
+
+    With PROMETHEUS_MULTIPROC_DIR set, every worker periodically dumps its histograms and counters into that directory
+    and /metrics sums the dumps of all workers. Gauges are computed by the worker serving the scrape.
+    """
+
+    multiprocess_dir: Optional[str] = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    flush_interval_seconds: float = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", 5))
+    _histograms: Dict[SeriesKey, List[float]] = {}
+    _counters: Dict[SeriesKey, float] = {}
+    _gauges: Dict[SeriesKey, float] = {}
+    _next_flush: float = 0.0
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def observe(cls, name: str, value: float, **labels: str) -> None:
+        buckets = HISTOGRAMS[name][1]
+        key = (name, cls._labels_key(labels))
+        with cls._lock:
+            # cumulative bucket counts followed by the sum and the count of the observations
+            series = cls._histograms.setdefault(key, [0.0] * (len(buckets) + 2))
+            for idx, bound in enumerate(buckets):
+                if value <= bound:
+                    series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+        cls._maybe_flush()
+
+    @classmethod
+    def inc(cls, name: str, amount: float = 1, **labels: str) -> None:
+        key = (name, cls._labels_key(labels))
+        with cls._lock:
+            cls._counters[key] = cls._counters.get(key, 0) + amount
+        cls._maybe_flush()
+
+    @classmethod
+    def set_gauge(cls, name: str, value: float, **labels: str) -> None:
+        with cls._lock:
+            cls._gauges[(name, cls._labels_key(labels))] = value
+
+    @classmethod
+    @contextmanager
+    def time(cls, name: str, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.observe(name, time.perf_counter() - start, **labels)
+
+    @classmethod
+    def render(cls) -> str:
+        histograms, counters = cls._collect()
+        lines: List[str] = []
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (series_name, labels), series in sorted(histograms.items()):
+                if series_name != name:
+                    continue
+                for bound, bucket_count in zip(buckets, series):
+                    lines.append(f"{name}_bucket{cls._format_labels(labels + (('le', str(bound)),))} {bucket_count}")
+                lines.append(f"{name}_bucket{cls._format_labels(labels + (('le', '+Inf'),))} {series[-1]}")
+                lines.append(f"{name}_sum{cls._format_labels(labels)} {series[-2]}")
+                lines.append(f"{name}_count{cls._format_labels(labels)} {series[-1]}")
+        for metric_type, metrics, values in (("counter", COUNTERS, counters), ("gauge", GAUGES, dict(cls._gauges))):
+            for name, help_text in metrics.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+                for (series_name, labels), value in sorted(values.items()):
+                    if series_name == name:
+                        lines.append(f"{name}{cls._format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def flush(cls) -> None:
+        if not cls.multiprocess_dir:
+            return
+        with cls._lock:
+            dump = {
+                "histograms": [[name, list(labels), series] for (name, labels), series in cls._histograms.items()],
+                "counters": [[name, list(labels), value] for (name, labels), value in cls._counters.items()],
+            }
+            cls._next_flush = time.monotonic() + cls.flush_interval_seconds
+        path = os.path.join(cls.multiprocess_dir, f"metrics_{os.getpid()}.json")
+        try:
+            with open(f"{path}.tmp", "w") as file:
+                json.dump(dump, file)
+            os.replace(f"{path}.tmp", path)
+        except OSError:
+            logger.exception("Failed to flush metrics to %s", path)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._histograms = {}
+            cls._counters = {}
+            cls._gauges = {}
+            cls._next_flush = 0.0
+
+    @classmethod
+    def _maybe_flush(cls) -> None:
+        if cls.multiprocess_dir and time.monotonic() >= cls._next_flush:
+            cls.flush()
+
+    @classmethod
+    def _collect(cls) -> Tuple[Dict[SeriesKey, List[float]], Dict[SeriesKey, float]]:
+        if not cls.multiprocess_dir:
+            with cls._lock:
+                return {key: list(series) for key, series in cls._histograms.items()}, dict(cls._counters)
+        cls.flush()
+        histograms: Dict[SeriesKey, List[float]] = {}
+        counters: Dict[SeriesKey, float] = {}
+        for path in glob.glob(os.path.join(cls.multiprocess_dir, "metrics_*.json")):
+            try:
+                with open(path) as file:
+                    dump = json.load(file)
+            except (OSError, ValueError):
+                logger.warning("Skipping unreadable metrics dump %s", path)
+                continue
+            for name, labels, series in dump["histograms"]:
+                key = cls._series_key(name, labels)
+                merged = histograms.setdefault(key, [0.0] * len(series))
+                for idx, value in enumerate(series):
+                    merged[idx] += value
+            for name, labels, value in dump["counters"]:
+                key = cls._series_key(name, labels)
+                counters[key] = counters.get(key, 0) + value
+        return histograms, counters
+
+    @staticmethod
+    def _series_key(name: str, labels: List[List[str]]) -> SeriesKey:
+        return name, tuple((key, value) for key, value in labels)
+
+    @staticmethod
+    def _labels_key(labels: Dict[str, str]) -> LabelsKey:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @staticmethod
+    def _format_labels(labels: LabelsKey) -> str:
+        if not labels:
+            return ""
+        escaped = [(key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for key, value in labels]
+        return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+atexit.register(Metrics.flush)
@@ -0,0 +1,101 @@
+import math
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+
+# every quantile is within 1% of the exact value
+RELATIVE_ACCURACY = 0.01
+MAX_BINS = 2048
+
+
+class PercentileSketch:
+    """DDSketch of non-negative values, see https://arxiv.org/abs/1908.10693.
+
+    A value is counted in the bin of its logarithm in base gamma, so a quantile read from the bins is within the
+    relative accuracy of the exact one. Sketches are merged by adding their bin counts, and a value is removed by adding
+    it with a negative count, which makes per day sketches mergeable into any date range.
+    """
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY, max_bins: int = MAX_BINS):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.zero_count = 0
+        self.bins: Dict[int, int] = {}
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= 0:
+            self.zero_count = max(self.zero_count + count, 0)
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        bin_count = self.bins.get(key, 0) + count
+        if bin_count > 0:
+            self.bins[key] = bin_count
+        else:
+            self.bins.pop(key, None)
+        if len(self.bins) > self.max_bins:
+            self._collapse_lowest_bins()
+
+    def merge(self, other: "PercentileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Sketches with a different relative accuracy cannot be merged")
+        self.zero_count += other.zero_count
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse_lowest_bins()
+
+    def quantile(self, quantile: float) -> Optional[float]:
+        count = self.count
+        if count == 0:
+            return None
+        # the nearest rank, so the p90 of two values is the higher one
+        rank = max(math.ceil(quantile * count), 1)
+        cumulative = self.zero_count
+        if cumulative >= rank:
+            return 0.0
+        for key in sorted(self.bins):
+            cumulative += self.bins[key]
+            if cumulative >= rank:
+                # the middle of the bin, relative to its bounds
+                return 2 * self.gamma**key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        return self.quantile(percentile / 100)
+
+    def to_dict(self) -> Dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "bins": {str(key): count for key, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "PercentileSketch":
+        if not data:
+            return cls()
+        sketch = cls(relative_accuracy=data.get("relative_accuracy", RELATIVE_ACCURACY))
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.bins = {int(key): count for key, count in data.get("bins", {}).items()}
+        return sketch
+
+    @classmethod
+    def merged(cls, sketches: Iterable[Optional[Dict]]) -> "PercentileSketch":
+        result = cls()
+        for data in sketches:
+            if data:
+                result.merge(cls.from_dict(data))
+        return result
+
+    def _collapse_lowest_bins(self) -> None:
+        # the lowest values lose their accuracy first, the high percentiles the reports show keep theirs
+        keys = sorted(self.bins)
+        collapsed = keys[: len(keys) - self.max_bins + 1]
+        target = collapsed[-1]
+        self.bins[target] = sum(self.bins.pop(key) for key in collapsed[:-1]) + self.bins[target]
@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from slack import WebClient
+from slack.errors import SlackApiError
+
+from src.code.db import db
+from src.code.dto.dto import RequestorProfileDto
+from src.code.logger import create_logger
+from src.code.model.requestor_profile import RequestorProfile
+from src.code.utils.slack_webclient import SlackWebclient
+
+logger = create_logger(__name__)
+
+
+class RequestorProfileCache:
+    max_size: int = int(os.getenv("REQUESTOR_PROFILE_CACHE_MAX_SIZE", 5000))
+    ttl_seconds: float = float(os.getenv("REQUESTOR_PROFILE_CACHE_TTL_SECONDS", 3600))
+    db_max_age: timedelta = timedelta(hours=int(os.getenv("REQUESTOR_PROFILE_DB_MAX_AGE_HOURS", 168)))
+    warm_up_page_size: int = 200
+    avoided_api_calls: int = 0
+    api_calls: int = 0
+    _entries: "OrderedDict[str, Tuple[float, RequestorProfileDto]]" = OrderedDict()
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def get_profile(cls, client: WebClient, requestor_id: str) -> RequestorProfileDto:
+        profile = cls._get_from_memory(requestor_id)
+        if profile is None:
+            profile = cls._get_from_db(requestor_id)
+            if profile is not None:
+                cls._put(requestor_id, profile)
+        if profile is not None:
+            cls.avoided_api_calls += 1
+            return profile
+
+        cls.api_calls += 1
+        requestor_info: Dict = SlackWebclient.get_requestor_info(client, requestor_id)
+        profile = RequestorProfileDto(
+            email=SlackWebclient.get_requestor_email(requestor_info, requestor_id),
+            team_id=SlackWebclient.get_requestor_team_id(requestor_info, requestor_id),
+        )
+        if profile.email != SlackWebclient.UNKNOWN:
+            cls._put(requestor_id, profile)
+            cls._save_to_db({requestor_id: profile})
+        return profile
+
+    @classmethod
+    def warm_up(cls, client: WebClient) -> int:
+        logger.info("Warming up requestor profiles from users.list")
+        saved = 0
+        cursor: Optional[str] = None
+        try:
+            while True:
+                page = client.users_list(limit=cls.warm_up_page_size, cursor=cursor).data
+                profiles: Dict[str, RequestorProfileDto] = {
+                    member["id"]: RequestorProfileDto(
+                        email=member["profile"]["email"], team_id=member.get("team_id", SlackWebclient.UNKNOWN)
+                    )
+                    for member in page["members"]
+                    if not member.get("deleted") and member.get("profile", {}).get("email")
+                }
+                for requestor_id, profile in profiles.items():
+                    cls._put(requestor_id, profile)
+                if profiles:
+                    RequestorProfile().save_profiles(profiles)
+                    saved += len(profiles)
+                cursor = page.get("response_metadata", {}).get("next_cursor")
+                if not cursor:
+                    break
+        except SlackApiError:
+            logger.exception("Failed to warm up requestor profiles, %s profiles saved before error", str(saved))
+            return saved
+        logger.info("Requestor profiles warm up finished, %s profiles saved", str(saved))
+        return saved
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._entries.clear()
+        cls.avoided_api_calls = 0
+        cls.api_calls = 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {"avoided_api_calls": cls.avoided_api_calls, "api_calls": cls.api_calls, "size": len(cls._entries)}
+
+    @classmethod
+    def _get_from_memory(cls, requestor_id: str) -> Optional[RequestorProfileDto]:
+        with cls._lock:
+            entry = cls._entries.get(requestor_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del cls._entries[requestor_id]
+                return None
+            cls._entries.move_to_end(requestor_id)
+            return entry[1]
+
+    @classmethod
+    def _put(cls, requestor_id: str, profile: RequestorProfileDto) -> None:
+        if cls.max_size <= 0:
+            return
+        with cls._lock:
+            cls._entries[requestor_id] = (time.monotonic() + cls.ttl_seconds, profile)
+            cls._entries.move_to_end(requestor_id)
+            while len(cls._entries) > cls.max_size:
+                cls._entries.popitem(last=False)
+
+    @classmethod
+    def _get_from_db(cls, requestor_id: str) -> Optional[RequestorProfileDto]:
+        try:
+            return RequestorProfile().get_fresh_profile(requestor_id, cls.db_max_age)
+        except Exception:
+            logger.exception("Failed to read requestor profile %s from database", requestor_id)
+            return None
+
+    @classmethod
+    def _save_to_db(cls, profiles: Dict[str, RequestorProfileDto]) -> None:
+        try:
+            RequestorProfile().save_profiles(profiles)
+        except Exception:
+            logger.exception("Failed to save requestor profiles to database")
+            db.session.rollback()
@@ -1,18 +1,22 @@
 import json
 from typing import Any
 from typing import Dict
+from typing import Optional
 
 from src.code.logger import create_logger
 from src.code.model.custom_enums import MessageGroup
 from src.code.model.custom_enums import MessageType
 from src.code.model.request import Request
+from src.code.utils.event_context import EventContext
 
 logger = create_logger(__name__)
 
 
 class SlackEventType:
-    def __init__(self, event: Dict):
+    def __init__(self, event: Dict, context: Optional[EventContext] = None):
         self._event: Dict = event
+        # the context of the edited message, whose request then tells a main from a thread edit
+        self._context = context
 
     def get_event_type(self) -> MessageType:
         if self._event.get("type") == "message":
@@ -36,8 +40,7 @@ class SlackEventType:
 
             # Test for editing message - if true the main message exists
             if self._event.get("subtype") == "message_changed":
-                record = Request().get_request(channel_id=self._event["channel"], event_ts=self._event["message"]["ts"])
-                if record is not None:
+                if self._edited_request_exists():
                     if self._event["message"]["text"] == "This message was deleted.":
                         logger.info("Message type is: %s", MessageType.MAIN_REMOVE.value)
                         return MessageType.MAIN_REMOVE
@@ -60,3 +63,8 @@ class SlackEventType:
         if self._event.get("subtype") == "message_changed":
             return MessageGroup.EDIT.value
         return MessageGroup.NEW.value
+
+    def _edited_request_exists(self) -> bool:
+        if self._context is not None:
+            return self._context.request is not None
+        return Request().request_exists(channel_id=self._event["channel"], event_ts=self._event["message"]["ts"])
@@ -6,12 +6,15 @@ from src.code.analytics.emoji import Emoji
 from src.code.analytics.form_answers_collector_new_form import FormQuestionCollectorNewForm
 from src.code.const import SLACK_WORKSPACE_NAME
 from src.code.dto.dto import NewRecordDto
+from src.code.dto.dto import RequestorProfileDto
 from src.code.logger import create_logger
 from src.code.model.custom_enums import MessageType
 from src.code.model.custom_enums import QuestionState
 from src.code.model.request import Request
 from src.code.model.schemas import ChannelProperties
 from src.code.model.schemas import Types
+from src.code.utils.classified_event import ClassifiedEvent
+from src.code.utils.requestor_profile_cache import RequestorProfileCache
 from src.code.utils.slack_utils import SlackUtils
 from src.code.utils.slack_webclient import SlackWebclient
 
@@ -21,20 +24,22 @@ logger = create_logger(__name__)
 class SlackMainRequest:
     @classmethod
     def deal_with_main_message(
-        cls, client: WebClient, event: Dict, event_type: MessageType, channel_properties: ChannelProperties
+        cls, client: WebClient, classified: ClassifiedEvent, channel_properties: ChannelProperties
     ):
+        event: Dict = classified.event
+        event_type: MessageType = classified.event_type
         try:
-            channel_id: str = SlackUtils.get_channel_id(event)
+            channel_id: str = classified.channel_id
             blocks, elements, ts, requestor_id = SlackUtils.get_data_from_event(event)
             channel_name: str = SlackUtils.get_channel_name(channel_id)
             request_link: str = SlackUtils.get_request_link(ts, channel_id, SLACK_WORKSPACE_NAME)
-            requestor_info: Dict = SlackWebclient.get_requestor_info(client, requestor_id)
+            requestor_profile: RequestorProfileDto = RequestorProfileCache.get_profile(client, requestor_id)
             new_record: NewRecordDto = NewRecordDto(
                 channel_name=channel_name,
                 channel_id=channel_id,
                 requestor_id=requestor_id,
-                requestor_email=SlackWebclient.get_requestor_email(requestor_info, requestor_id),
-                requestor_team_id=SlackWebclient.get_requestor_team_id(requestor_info, requestor_id),
+                requestor_email=requestor_profile.email,
+                requestor_team_id=requestor_profile.team_id,
                 blocks=blocks,
                 request_types_from_message=SlackUtils.get_request_types_from_elements(elements, channel_properties),
                 event_ts=ts,
@@ -46,7 +51,7 @@ class SlackMainRequest:
                 logger.info("Emoji feature is not enabled.")
                 logger.info("Not checking if message has emoji and not sending missing emoji response.")
                 return
-            emoji = Emoji(event, channel_properties.types.emojis)
+            emoji = Emoji(event, channel_properties.emoji_lookup.type_names)
             if (
                 not emoji.is_cloud_emoji_selected()
                 and event_type != MessageType.MAIN_EDIT
@@ -57,7 +62,7 @@ class SlackMainRequest:
                     client=client, channel=channel_name, ts=ts, blocks=response_blocks
                 )
             if channel_properties.features.question_form.enabled:
-                if emoji.is_trigger_in_the_event(channel_properties.question_forms.triggers):
+                if emoji.is_trigger_in_the_event(channel_properties.emoji_lookup.triggers):
                     FormQuestionCollectorNewForm().create_question_form(
                         state=QuestionState.NEW, channel_name=channel_name, ts=ts
                     )
@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from typing import Dict
+from typing import Optional
+from typing import Set
+
+from slack.errors import SlackApiError
+
+from src.code.logger import create_logger
+from src.code.utils.call_counter import CountingWebClient
+
+logger = create_logger(__name__)
+
+
+class SlackRateLimiter:
+    """Process-wide token buckets for Slack Web API calls, one bucket per rate limit tier.
+
+    A bucket holds up to the tier limit of calls, so bursts pass without waiting while the bucket is full, and refills
+    at the tier limit per minute. A 429 response pauses the bucket of its tier until Retry-After has passed.
+    Slack limits chat.postMessage per channel, so its tier has a bucket per channel instead of a process-wide one.
+    """
+
+    enabled: bool = os.getenv("SLACK_RATE_LIMITER_ENABLED", "true").lower() == "true"
+    # calls per minute, see https://api.slack.com/docs/rate-limits
+    tier_limits: Dict[str, int] = {
+        "tier1": 1,
+        "tier2": 20,
+        "tier3": 50,
+        "tier4": 100,
+        "post_message": 60,
+    }
+    method_tiers: Dict[str, str] = {
+        "users.list": "tier2",
+        "conversations.history": "tier3",
+        "conversations.replies": "tier3",
+        "reactions.add": "tier3",
+        "users.info": "tier4",
+        "chat.postMessage": "post_message",
+    }
+    default_tier: str = "tier3"
+    per_channel_tiers: Set[str] = {"post_message"}
+    _tokens: Dict[str, float] = {}
+    _updated_at: Dict[str, float] = {}
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def acquire(cls, method: str, channel: Optional[str] = None) -> float:
+        if not cls.enabled:
+            return 0.0
+        tier = cls.get_tier(method)
+        bucket = cls.get_bucket(method, channel)
+        limit = cls.tier_limits[tier]
+        rate = limit / 60.0
+        with cls._lock:
+            now = time.monotonic()
+            # a bucket paused by Retry-After starts refilling only once the pause is over
+            refill_from = max(now, cls._updated_at.get(bucket, now))
+            tokens = min(
+                limit, cls._tokens.get(bucket, limit) + max(now - cls._updated_at.get(bucket, now), 0.0) * rate
+            )
+            # the token is taken right away, a negative balance reserves the slot the caller waits for
+            cls._tokens[bucket] = tokens - 1
+            cls._updated_at[bucket] = refill_from
+            wait = refill_from - now + max(1 - tokens, 0.0) / rate
+        if wait > 0:
+            logger.debug("Waiting %s seconds for Slack %s rate limit", str(round(wait, 3)), bucket)
+            time.sleep(wait)
+        return wait
+
+    @classmethod
+    def retry_after(cls, method: str, seconds: float, channel: Optional[str] = None) -> None:
+        bucket = cls.get_bucket(method, channel)
+        logger.warning("Slack rate limited %s, bucket %s is paused for %s seconds", method, bucket, str(seconds))
+        with cls._lock:
+            now = time.monotonic()
+            cls._tokens[bucket] = min(cls._tokens.get(bucket, 1.0), 1.0)
+            cls._updated_at[bucket] = max(cls._updated_at.get(bucket, now), now + seconds)
+
+    @classmethod
+    def get_tier(cls, method: str) -> str:
+        return cls.method_tiers.get(method, cls.default_tier)
+
+    @classmethod
+    def get_bucket(cls, method: str, channel: Optional[str] = None) -> str:
+        tier = cls.get_tier(method)
+        if channel and tier in cls.per_channel_tiers:
+            return f"{tier}:{channel}"
+        return tier
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._tokens = {}
+            cls._updated_at = {}
+
+
+class RateLimitedWebClient(CountingWebClient):
+    max_retries: int = int(os.getenv("SLACK_RATE_LIMIT_MAX_RETRIES", 3))
+
+    def api_call(self, api_method: str, **kwargs):
+        channel = self._get_channel(kwargs)
+        attempt = 0
+        while True:
+            SlackRateLimiter.acquire(api_method, channel)
+            try:
+                return super().api_call(api_method, **kwargs)
+            except SlackApiError as e:
+                if e.response.status_code != 429 or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                SlackRateLimiter.retry_after(api_method, float(e.response.headers.get("Retry-After", 1)), channel)
+
+    @staticmethod
+    def _get_channel(kwargs: Dict) -> Optional[str]:
+        # the WebClient methods pass their arguments as the json, data or params of the call
+        for key in ("json", "data", "params"):
+            arguments = kwargs.get(key)
+            if isinstance(arguments, dict) and arguments.get("channel"):
+                return str(arguments["channel"])
+        return None
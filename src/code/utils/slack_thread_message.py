@@ -1,9 +1,11 @@
 from typing import Dict
+from typing import Optional
 
 from src.code.logger import create_logger
 from src.code.model.custom_enums import MessageType
 from src.code.model.request import Request
 from src.code.model.request import ThreadMessage
+from src.code.utils.classified_event import ClassifiedEvent
 from src.code.utils.slack_utils import SlackUtils
 
 logger = create_logger(__name__)
@@ -12,19 +14,21 @@ logger = create_logger(__name__)
 class SlackThreadMessage:
     # function for "message"
     @staticmethod
-    def deal_with_thread_message(event: Dict, event_type: MessageType) -> None:
+    def deal_with_thread_message(classified: ClassifiedEvent) -> None:
+        event: Dict = classified.event
         try:
-            channel_id: str = SlackUtils.get_channel_id(event)
+            channel_id: str = classified.channel_id
             blocks, _, event_ts, author = SlackUtils.get_data_from_event(event)
-            if event_type == MessageType.THREAD_EDIT:
+            if classified.event_type == MessageType.THREAD_EDIT:
                 ThreadMessage().update_reply(event_ts=event_ts, blocks=blocks, channel_id=channel_id)
                 # for now save only new message
-            elif event_type in [MessageType.THREAD_NEW, MessageType.THREAD_NEW_FILE]:
-                main_ts: str = SlackUtils.get_main_ts(event)
-                record: Request = Request().get_request_or_throw_exception(channel_id=channel_id, event_ts=main_ts)
+            elif classified.event_type in [MessageType.THREAD_NEW, MessageType.THREAD_NEW_FILE]:
+                record: Optional[Request] = classified.request
+                if record is None:
+                    raise ValueError(f"Request for {channel_id} and {classified.main_ts} not found")
                 ThreadMessage().add_reply(request=record, event_ts=event_ts, author_id=author, blocks=blocks)
                 if SlackUtils.get_user(event) != record.requestor_id:
-                    Request().start_work(record, main_ts)
+                    Request().start_work(record, classified.main_ts)
         except Exception:
             logger.error("Thread message saving - error occurred for event: %s and client", event)
             raise Exception
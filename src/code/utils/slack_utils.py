@@ -45,9 +45,10 @@ class SlackUtils:
         )
 
     @staticmethod
-    def get_channel_id(event: Dict) -> str:
+    def get_channel_id(event: Dict, event_type: Optional[MessageType] = None) -> str:
         try:
-            event_type: MessageType = SlackEventType(event).get_event_type()
+            if event_type is None:
+                event_type = SlackEventType(event).get_event_type()
             if event_type in [
                 MessageType.MAIN_NEW,
                 MessageType.MAIN_EDIT,
@@ -66,12 +67,13 @@ class SlackUtils:
             raise ValueError("Failed to find channel id on event %s", json.dumps(event))
 
     @staticmethod
-    def get_main_ts(event: Dict) -> str:
+    def get_main_ts(event: Dict, event_type: Optional[MessageType] = None) -> str:
         try:
-            event_type: MessageType = SlackEventType(event).get_event_type()
+            if event_type is None:
+                event_type = SlackEventType(event).get_event_type()
             if event_type in [MessageType.MAIN_NEW, MessageType.MAIN_NEW_FILE]:
                 return event["ts"]
-            elif event_type in [MessageType.MAIN_EDIT, MessageType.THREAD_EDIT]:
+            elif event_type in [MessageType.MAIN_EDIT, MessageType.THREAD_EDIT, MessageType.MAIN_REMOVE]:
                 return event["message"]["ts"]
             elif event_type in [MessageType.THREAD_NEW, MessageType.THREAD_NEW_FILE]:
                 return event["thread_ts"]
@@ -106,26 +108,15 @@ class SlackUtils:
             return []
         if not channel_properties.features.types.enabled:
             return []
-        types_dict = channel_properties.types.emojis
-        if not types_dict:
-            return []
-        aliases = [value["alias"] for value in types_dict.values()]
-        from_keys = set(
-            map(
-                lambda d: d["name"],
-                (filter(lambda x: x["type"] == "emoji" and x["name"] in types_dict.keys(), elements)),
-            )
-        )
-
-        from_values = set(
-            map(
-                lambda d: [emoji for emoji, propeties in types_dict.items() if propeties["alias"] == d["name"]][0],
-                (filter(lambda x: x["type"] == "emoji" and x["name"] in aliases, elements)),
-            )
+        type_names = channel_properties.emoji_lookup.type_names
+        return list(
+            {
+                channel_properties.get_type_emoji(element["name"])
+                for element in elements
+                if element["type"] == "emoji" and element["name"] in type_names
+            }
         )
 
-        return list(from_keys.union(from_values))
-
     @staticmethod
     def get_request_link(ts: str, channel_id: str, workspace_name: str) -> str:
         ts_wo_dot = ts.replace(".", "")
@@ -141,8 +132,11 @@ class SlackUtils:
         )
 
     @staticmethod
-    def remove_main_message(event: Dict) -> None:
-        Request().remove_request(channel_id=event["channel"], event_ts=event["message"]["ts"])
+    def remove_main_message(event: Dict, record: Optional[Request] = None) -> None:
+        if record is None:
+            Request().remove_request(channel_id=event["channel"], event_ts=event["message"]["ts"])
+        else:
+            Request().remove_record(record)
 
     @classmethod
     def _try_to_get_blocks_elements(cls, data: Dict) -> Tuple[Any, Optional[Any]]:
@@ -1,5 +1,6 @@
 from typing import Dict
 from typing import List
+from typing import Optional
 
 from slack import WebClient
 from slack.errors import SlackApiError
@@ -10,6 +11,11 @@ logger = create_logger(__name__)
 
 
 class SlackWebclient:
+    # returned for the email and team id of a requestor Slack has no profile of
+    UNKNOWN: str = "Unknown"
+    _bot_id: Optional[str] = None
+    _bot_token: Optional[str] = None
+
     @classmethod
     def get_requestor_info(cls, client: WebClient, requestor_id: str):
         try:
@@ -26,7 +32,7 @@ class SlackWebclient:
             return requestor_info["user"]["profile"]["email"]
         except (AttributeError, KeyError):
             logger.error("Email for requestor id %s has not found", requestor_id)
-            return "Unknown"
+            return cls.UNKNOWN
 
     @classmethod
     def get_requestor_team_id(cls, requestor_info: Dict, requestor_id: str) -> str:
@@ -34,7 +40,7 @@ class SlackWebclient:
             return requestor_info["user"]["team_id"]
         except (AttributeError, KeyError):
             logger.error("Email for requestor id %s has not found", requestor_id)
-            return "Unknown"
+            return cls.UNKNOWN
 
     @staticmethod
     def send_post_message_as_main_message(client: WebClient, channel: str, blocks: dict) -> None:
@@ -52,4 +58,22 @@ class SlackWebclient:
 
     @classmethod
     def get_bot_id(cls, client: WebClient) -> str:
-        return client.auth_test()["user_id"]
+        if cls._bot_id is None or cls._bot_token != client.token:
+            if cls._bot_id is not None:
+                logger.info("Slack token has changed, resolving bot id again")
+            bot_id: str = client.auth_test()["user_id"]
+            cls._bot_id, cls._bot_token = bot_id, client.token
+            return bot_id
+        return cls._bot_id
+
+    @classmethod
+    def resolve_bot_id(cls, client: WebClient) -> None:
+        try:
+            logger.info("Bot id resolved: %s", cls.get_bot_id(client))
+        except Exception:
+            logger.exception("Failed to resolve bot id on startup, it will be resolved on the first event")
+
+    @classmethod
+    def reset_bot_id(cls) -> None:
+        cls._bot_id = None
+        cls._bot_token = None
@@ -6,13 +6,51 @@ import pytest
 from slack import WebClient
 
 import src.tests.test_env  # noqa
+from src.code.logger import RepeatedLogFilter
+from src.code.model.channel_name_index import ChannelNameIndex
+from src.code.model.channel_properties_cache import ChannelPropertiesCache
 from src.code.model.control_panel import ChannelProperties
 from src.code.model.control_panel import ControlPanel
 from src.code.model.schemas import channel_properties_schema
+from src.code.report.daily_report_schedule import DailyReportSchedule
+from src.code.utils.db_pool import DbPoolMetrics
+from src.code.utils.event_context import EventContext
+from src.code.utils.event_deduplicator import EventDeduplicator
+from src.code.utils.metrics import Metrics
+from src.code.utils.requestor_profile_cache import RequestorProfileCache
+from src.code.utils.slack_rate_limiter import SlackRateLimiter
+from src.code.utils.slack_webclient import SlackWebclient
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    ChannelPropertiesCache.reset()
+    ChannelNameIndex.reset()
+    SlackWebclient.reset_bot_id()
+    RequestorProfileCache.reset()
+    EventDeduplicator.reset()
+    EventContext.reset()
+    DbPoolMetrics.reset()
+    Metrics.reset()
+    SlackRateLimiter.reset()
+    DailyReportSchedule.reset()
+    RepeatedLogFilter.reset()
+    yield
+    ChannelPropertiesCache.reset()
+    ChannelNameIndex.reset()
+    SlackWebclient.reset_bot_id()
+    RequestorProfileCache.reset()
+    EventDeduplicator.reset()
+    EventContext.reset()
+    DbPoolMetrics.reset()
+    Metrics.reset()
+    SlackRateLimiter.reset()
+    DailyReportSchedule.reset()
+    RepeatedLogFilter.reset()
+
+
 @pytest.fixture()
 def web_client() -> WebClient:
     return WebClient()
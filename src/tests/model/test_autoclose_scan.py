@@ -0,0 +1,103 @@
+from src.code.db import db
+from src.code.model.autoclose_scan import AutocloseCursor
+from src.code.model.autoclose_scan import AutocloseThread
+from src.code.model.custom_enums import RequestStatusEnum
+from src.code.model.request import Request
+from src.code.model.request import ThreadMessage
+
+
+def _message(ts: str, latest_reply: str = None) -> dict:
+    message = {"ts": ts, "thread_ts": ts, "user": "U1", "text": "request", "blocks": [{"type": "rich_text"}]}
+    if latest_reply is not None:
+        message["latest_reply"] = latest_reply
+    return message
+
+
+class TestIntegrationAutocloseScan:
+    def test_save_cursor_keeps_full_scan_time_of_incremental_scans(self, db_setup, channel_id):
+        AutocloseCursor().save_cursor(channel_id, 100.5, full_scan=True)
+        first_cursor = AutocloseCursor().get_cursor(channel_id)
+        assert first_cursor is not None
+        full_scan_datetime_utc = first_cursor.full_scan_datetime_utc
+
+        AutocloseCursor().save_cursor(channel_id, 200.5, full_scan=False)
+
+        cursor = AutocloseCursor().get_cursor(channel_id)
+        assert cursor is not None
+        assert float(cursor.latest_ts) == 200.5
+        assert cursor.full_scan_datetime_utc == full_scan_datetime_utc
+
+    def test_save_messages_keeps_only_decision_fields(self, db_setup, channel_id):
+        AutocloseThread().save_messages(channel_id, [_message("1000.000100", "1100.000100")])
+
+        assert AutocloseThread().get_messages(channel_id, 0) == [
+            {"ts": "1000.000100", "thread_ts": "1000.000100", "latest_reply": "1100.000100", "user": "U1"}
+        ]
+
+    def test_save_messages_replace_drops_other_threads(self, db_setup, channel_id):
+        AutocloseThread().save_messages(channel_id, [_message("1000.000100"), _message("1000.000200")])
+        AutocloseThread().save_messages(channel_id, [_message("1000.000300")], replace=True)
+
+        assert [message["ts"] for message in AutocloseThread().get_messages(channel_id, 0)] == ["1000.000300"]
+
+    def test_get_messages_skips_completed_requests(self, db_setup, channel_id, requestor_id):
+        db.session.add(
+            Request(
+                slack_channel_name="channel",
+                slack_channel_id=channel_id,
+                requestor_id=requestor_id,
+                request_status=RequestStatusEnum.COMPLETED.value,
+                event_ts="1000.000100",
+            )
+        )
+        db.session.commit()
+        AutocloseThread().save_messages(channel_id, [_message("1000.000100"), _message("1000.000200")])
+
+        assert [message["ts"] for message in AutocloseThread().get_messages(channel_id, 0)] == ["1000.000200"]
+
+    def test_get_stale_thread_timestamps_results_marked_and_replied_threads(self, db_setup, channel_id, requestor_id):
+        request = Request(
+            slack_channel_name="channel",
+            slack_channel_id=channel_id,
+            requestor_id=requestor_id,
+            request_status=RequestStatusEnum.WORKING.value,
+            event_ts="1000.000200",
+        )
+        db.session.add(request)
+        db.session.flush()
+        db.session.add(ThreadMessage(author_id=requestor_id, event_ts="1200.000000", request_table_id=request.id))
+        db.session.commit()
+        AutocloseThread().save_messages(
+            channel_id,
+            [_message("1000.000100"), _message("1000.000200", "1100.000000"), _message("1000.000300")],
+        )
+        AutocloseThread().mark_stale(channel_id, "1000.000100")
+
+        assert sorted(AutocloseThread().get_stale_thread_timestamps(channel_id)) == ["1000.000100", "1000.000200"]
+
+        AutocloseThread().save_messages(channel_id, [_message("1000.000100"), _message("1000.000200", "1200.000000")])
+        assert AutocloseThread().get_stale_thread_timestamps(channel_id) == []
+
+    def test_latest_reply_is_cached_until_latest_reply_moves(self, db_setup, channel_id):
+        AutocloseThread().save_messages(channel_id, [_message("1000.000100", "1100.000100")])
+        reply = {"ts": "1100.000100", "user": "U2", "text": "reply", "blocks": [{"text": {"text": "a"}}, {"b": 1}]}
+
+        AutocloseThread().save_latest_reply(channel_id, "1000.000100", reply)
+
+        assert AutocloseThread().get_latest_reply(channel_id, "1000.000100", "1100.000100") == {
+            "ts": "1100.000100",
+            "user": "U2",
+            "blocks": [{"text": {"text": "a"}}],
+        }
+        AutocloseThread().save_messages(channel_id, [_message("1000.000100", "1150.000100")])
+        assert AutocloseThread().get_latest_reply(channel_id, "1000.000100", "1150.000100") is None
+
+    def test_remove_older_than_and_remove_threads(self, db_setup, channel_id):
+        AutocloseThread().save_messages(
+            channel_id, [_message("1000.000100"), _message("2000.000100"), _message("3000.000100")]
+        )
+
+        AutocloseThread().remove_older_than(channel_id, 1500)
+        AutocloseThread().remove_threads(channel_id, ["3000.000100"])
+
+        assert [message["ts"] for message in AutocloseThread().get_messages(channel_id, 0)] == ["2000.000100"]
@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+from src.code.model.channel_name_index import ChannelNameIndex
+
+
+class TestChannelNameIndex:
+    def test_load_results_bidirectional_lookup(self, channel_id, channel_name):
+        ChannelNameIndex.load([(channel_id, f"#{channel_name}")])
+
+        assert ChannelNameIndex.is_loaded()
+        assert ChannelNameIndex.get_channel_id(channel_name) == channel_id
+        assert ChannelNameIndex.get_channel_id(f"#{channel_name}") == channel_id
+        assert ChannelNameIndex.get_channel_name(channel_id) == f"#{channel_name}"
+        assert ChannelNameIndex.stats() == {"hits": 3, "misses": 0, "size": 1}
+
+    def test_put_results_previous_name_replaced(self, channel_id):
+        ChannelNameIndex.put(channel_id, "old-name")
+        ChannelNameIndex.put(channel_id, "new-name")
+
+        assert ChannelNameIndex.get_channel_id("old-name") is None
+        assert ChannelNameIndex.get_channel_id("new-name") == channel_id
+
+    def test_remove_results_both_directions_removed(self, channel_id, channel_name):
+        ChannelNameIndex.put(channel_id, channel_name)
+        ChannelNameIndex.remove(channel_id)
+
+        assert ChannelNameIndex.get_channel_id(channel_name) is None
+        assert ChannelNameIndex.get_channel_name(channel_id) is None
+
+    def test_is_loaded_results_false_given_ttl_expired(self, channel_id, channel_name):
+        with patch("src.code.model.channel_name_index.time.monotonic", return_value=0):
+            ChannelNameIndex.load([(channel_id, channel_name)])
+        with patch("src.code.model.channel_name_index.time.monotonic", return_value=ChannelNameIndex.ttl_seconds + 1):
+            assert not ChannelNameIndex.is_loaded()
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from src.code.model.channel_properties_cache import ChannelPropertiesCache
+from src.code.model.schemas import ChannelProperties
+
+
+class TestChannelPropertiesCache:
+    def test_get_results_none_and_miss_given_empty_cache(self, channel_id):
+        assert ChannelPropertiesCache.get(channel_id) is None
+        assert ChannelPropertiesCache.stats() == {"hits": 0, "misses": 1, "size": 0}
+
+    def test_get_results_cached_properties_and_hit(self, channel_id):
+        channel_properties = ChannelProperties()
+        ChannelPropertiesCache.put(channel_id, channel_properties)
+
+        assert ChannelPropertiesCache.get(channel_id) is channel_properties
+        assert ChannelPropertiesCache.stats() == {"hits": 1, "misses": 0, "size": 1}
+
+    def test_get_results_none_given_expired_entry(self, channel_id):
+        with patch("src.code.model.channel_properties_cache.time.monotonic", return_value=0):
+            ChannelPropertiesCache.put(channel_id, ChannelProperties())
+        with patch(
+            "src.code.model.channel_properties_cache.time.monotonic",
+            return_value=ChannelPropertiesCache.ttl_seconds + 1,
+        ):
+            assert ChannelPropertiesCache.get(channel_id) is None
+        assert ChannelPropertiesCache.stats()["size"] == 0
+
+    def test_invalidate_results_entry_removed(self, channel_id):
+        ChannelPropertiesCache.put(channel_id, ChannelProperties())
+        ChannelPropertiesCache.put("OTHER_CHANNEL", ChannelProperties())
+
+        ChannelPropertiesCache.invalidate(channel_id)
+
+        assert ChannelPropertiesCache.get(channel_id) is None
+        assert ChannelPropertiesCache.get("OTHER_CHANNEL") is not None
+
+    def test_put_results_nothing_cached_given_ttl_disabled(self, channel_id):
+        with patch.object(ChannelPropertiesCache, "ttl_seconds", 0):
+            ChannelPropertiesCache.put(channel_id, ChannelProperties())
+        assert ChannelPropertiesCache.get(channel_id) is None
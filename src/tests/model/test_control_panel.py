@@ -9,6 +9,8 @@ from varname import nameof
 
 from src.code.const import SLACK_DATETIME_FMT
 from src.code.db import db
+from src.code.model.channel_name_index import ChannelNameIndex
+from src.code.model.channel_properties_cache import ChannelPropertiesCache
 from src.code.model.control_panel import ControlPanel
 from src.code.model.schemas import ChannelPropertiesFeatures
 from src.code.model.schemas import channel_properties_schema
@@ -49,6 +51,27 @@ class TestIntegrationControlPanel:
         with pytest.raises(ValueError, match=f"Channel for {cp.slack_channel_name} not found"):
             ControlPanel().get_channel_id_by_channel_name(cp.slack_channel_name)
 
+    def test_get_channel_id_by_channel_name_results_id_from_index_given_index_loaded(
+        self, db_setup, cp, test_control_panel_added
+    ):
+        test_control_panel_added(cp)
+        assert ControlPanel().get_channel_id_by_channel_name(cp.slack_channel_name) == cp.slack_channel_id
+
+        db.session.query(ControlPanel).delete()
+        db.session.commit()
+
+        assert ControlPanel().get_channel_id_by_channel_name(f"#{cp.slack_channel_name}") == cp.slack_channel_id
+        assert ChannelNameIndex.stats()["hits"] == 2
+
+    def test_channel_name_index_results_in_sync_given_control_panel_added_and_deleted(self, db_setup, cp):
+        ChannelNameIndex.load([])
+        ControlPanel().add_control_panel(cp.slack_channel_id, cp.slack_channel_name)
+        assert ChannelNameIndex.get_channel_id(cp.slack_channel_name) == cp.slack_channel_id
+
+        ControlPanel().soft_delete_control_panel(ControlPanel().get_control_panel_by_channel_id(cp.slack_channel_id))
+        assert ChannelNameIndex.get_channel_id(cp.slack_channel_name) is None
+        assert ChannelNameIndex.get_channel_name(cp.slack_channel_id) is None
+
     def test_get_channel_properties_by_channel_id(self, db_setup, cp: ControlPanel, test_control_panel_added):
         test_control_panel_added(cp)
 
@@ -71,6 +94,28 @@ class TestIntegrationControlPanel:
         with pytest.raises(Exception):
             ControlPanel().get_channel_properties_by_channel_id(cp.slack_channel_id)
 
+    def test_get_channel_properties_by_channel_id_results_cache_hit(
+        self, db_setup, cp: ControlPanel, test_control_panel_added
+    ):
+        test_control_panel_added(cp)
+
+        first = ControlPanel().get_channel_properties_by_channel_id(cp.slack_channel_id)
+        second = ControlPanel().get_channel_properties_by_channel_id(cp.slack_channel_id)
+
+        assert first is second
+        assert ChannelPropertiesCache.stats()["misses"] == 1
+        assert ChannelPropertiesCache.stats()["hits"] == 1
+
+    def test_get_channel_properties_by_channel_id_results_fresh_properties_after_toggle_feature(
+        self, db_setup, cp: ControlPanel, test_control_panel_added
+    ):
+        test_control_panel_added(cp)
+        assert ControlPanel().get_channel_properties_by_channel_id(cp.slack_channel_id).features.types.enabled is True
+
+        ControlPanel().toggle_feature(cp.slack_channel_id, nameof(ChannelPropertiesFeatures.types), False)
+
+        assert ControlPanel().get_channel_properties_by_channel_id(cp.slack_channel_id).features.types.enabled is False
+
     def test_get_all_active_control_panels(self, db_setup, cp, test_control_panel_added):
         # given - table control_panel has one record
         control_panels = db.session.query(ControlPanel).all()
@@ -212,6 +257,28 @@ class TestIntegrationControlPanel:
         assert updated_cp[0].channel_properties["_daily_report"]["time_zone"] == "UTC"
         assert updated_cp[0].channel_properties["_daily_report"]["output_channel_name"] == "channel"
 
+    def test_get_daily_report_version_changes_only_with_daily_report_config(
+        self, db_setup, cp: ControlPanel, test_control_panel_added
+    ):
+        assert ControlPanel().get_daily_report_version() == (0, 0)
+        cp.channel_properties["features"]["daily_report"] = {"enabled": True}
+        cp.channel_properties["_daily_report"] = {
+            "schedules": [{"local_time": "7:00", "last_report_datetime_utc": ""}],
+            "time_zone": "UTC",
+        }
+        test_control_panel_added(cp)
+        added_version = ControlPanel().get_daily_report_version()
+        assert added_version == (1, 0)
+
+        ControlPanel().toggle_feature(cp.slack_channel_id, nameof(ChannelPropertiesFeatures.types), False)
+        ControlPanel().update_last_report_datetime_utc_field(0, cp.slack_channel_id, datetime.now())
+        assert ControlPanel().get_daily_report_version() == added_version
+
+        cp.modify_daily_report(["8:00"], "Europe/Prague", "channel")
+        ControlPanel().toggle_feature(cp.slack_channel_id, nameof(ChannelPropertiesFeatures.daily_report), False)
+        ControlPanel().soft_delete_control_panel(cp)
+        assert ControlPanel().get_daily_report_version() == (1, 3)
+
     def test_update_last_report_datetime_utc_field(self, db_setup, cp, test_control_panel_added):
         cp.channel_properties["features"]["daily_report"] = {"enabled": True}
         cp.channel_properties["_daily_report"] = {
@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.code.db import db
+from src.code.model.custom_enums import RequestStatusEnum
+from src.code.model.request import Request
+from src.code.utils.event_context import EventContext
+
+
+def _request(context: EventContext) -> Request:
+    record = context.request
+    assert record is not None
+    return record
+
+
+class TestIntegrationEventContext:
+    def test_request_results_request_resolved_once(self, db_setup, test_record_added, channel_id, event_ts):
+        test_record_added()
+        with patch.object(Request, "get_request", wraps=Request().get_request) as get_request:
+            with EventContext(channel_id, event_ts) as context:
+                assert context.request is not None
+                assert context.request is context.request
+        get_request.assert_called_once()
+
+    def test_exit_results_changes_committed_in_one_transaction(self, db_setup, test_record_added, channel_id, event_ts):
+        test_record_added()
+        with patch.object(db.session, "commit", wraps=db.session.commit) as commit:
+            with EventContext(channel_id, event_ts) as context:
+                record = _request(context)
+                Request().start_work(record, event_ts, commit=False)
+                Request().close_record(record, event_ts, "white_check_mark")
+        commit.assert_called_once()
+        db.session.expunge_all()
+        request = db.session.query(Request).first()
+        assert request.request_status == RequestStatusEnum.COMPLETED.value
+        assert request.start_work_datatime_utc is not None
+
+    def test_exit_results_changes_rolled_back_given_exception(self, db_setup, test_record_added, channel_id, event_ts):
+        test_record_added()
+        with pytest.raises(RuntimeError):
+            with EventContext(channel_id, event_ts) as context:
+                Request().close_record(_request(context), event_ts, "white_check_mark")
+                raise RuntimeError("handler failed")
+        assert db.session.query(Request).first().request_status == RequestStatusEnum.NEW_RECORD.value
+
+    def test_query_count_results_queries_issued_inside_context(self, db_setup, test_record_added, channel_id, event_ts):
+        test_record_added()
+        with EventContext(channel_id, event_ts) as context:
+            Request().close_record(_request(context), event_ts, "white_check_mark")
+        db.session.query(Request).all()
+
+        # the request select, its update and the insert of the rollup delta
+        assert context.query_count == 3
+        assert EventContext.stats() == {"events": 1, "queries": 3}
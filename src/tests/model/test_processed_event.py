@@ -0,0 +1,57 @@
+from datetime import datetime
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.code.db import db
+from src.code.model.processed_event import ProcessedEvent
+from src.code.utils.event_deduplicator import EventDeduplicator
+
+
+class TestIntegrationProcessedEvent:
+    def test_mark_processed_results_false_given_event_id_exists(self, db_setup):
+        assert ProcessedEvent().mark_processed("Ev1", None) is True
+        assert ProcessedEvent().mark_processed("Ev1", 1) is False
+        assert db.session.query(ProcessedEvent).count() == 1
+
+    def test_purge_older_than_results_expired_events_removed(self, db_setup):
+        ProcessedEvent().mark_processed("Ev1", None)
+        ProcessedEvent().mark_processed("Ev2", None)
+        record = db.session.query(ProcessedEvent).filter_by(event_id="Ev1").first()
+        record.received_datetime_utc = datetime.utcnow() - timedelta(hours=2)
+        db.session.commit()
+
+        assert ProcessedEvent().purge_older_than(timedelta(hours=1)) == 1
+        assert ProcessedEvent().mark_processed("Ev1", None) is True
+
+
+class TestIntegrationEventDeduplicator:
+    def test_is_duplicate_results_true_given_redelivered_event(self, db_setup):
+        payload = {"event_id": "Ev1", "event": {}}
+        assert EventDeduplicator.is_duplicate(payload) is False
+        assert EventDeduplicator.is_duplicate(payload, "1") is True
+        assert EventDeduplicator.duplicates == 1
+
+    def test_is_duplicate_results_true_given_event_seen_by_other_instance(self, db_setup):
+        payload = {"event_id": "Ev1", "event": {}}
+        ProcessedEvent().mark_processed("Ev1", None)
+        assert EventDeduplicator.is_duplicate(payload, "2") is True
+
+    def test_is_duplicate_results_false_given_forgotten_event(self, db_setup):
+        payload = {"event_id": "Ev1", "event": {}}
+        EventDeduplicator.is_duplicate(payload)
+        EventDeduplicator.forget(payload)
+        assert EventDeduplicator.is_duplicate(payload, "1") is False
+
+    def test_is_duplicate_results_false_given_redelivery_of_event_failed_to_be_recorded(self, db_setup):
+        payload = {"event_id": "Ev1", "event": {}}
+        with patch.object(ProcessedEvent, "mark_processed", side_effect=OperationalError("insert", {}, Exception())):
+            with pytest.raises(OperationalError):
+                EventDeduplicator.is_duplicate(payload)
+        assert EventDeduplicator.is_duplicate(payload, "1") is False
+        assert EventDeduplicator.duplicates == 0
+
+    def test_is_duplicate_results_false_given_no_event_id(self):
+        assert EventDeduplicator.is_duplicate({"event": {}}) is False
@@ -0,0 +1,82 @@
+from datetime import datetime
+from datetime import timedelta
+
+from src.code.db import db
+from src.code.model.custom_enums import QueuedEventStatus
+from src.code.model.queued_event import QueuedEvent
+
+
+def _message_payload(channel_id: str, ts: str) -> dict:
+    return {"event": {"type": "message", "channel": channel_id, "ts": ts}}
+
+
+def _reaction_payload(channel_id: str, ts: str) -> dict:
+    return {"event": {"type": "reaction_added", "item": {"channel": channel_id, "ts": ts}}}
+
+
+def _claim(worker_id: str) -> QueuedEvent:
+    queued_event = QueuedEvent().claim_next(worker_id)
+    assert queued_event is not None
+    return queued_event
+
+
+class TestIntegrationQueuedEvent:
+    def test_enqueue_results_pending_event_with_channel_id(self, db_setup, channel_id, event_ts):
+        QueuedEvent().enqueue("reaction_added", _reaction_payload(channel_id, event_ts))
+
+        queued_events = db.session.query(QueuedEvent).all()
+        assert len(queued_events) == 1
+        assert queued_events[0].slack_channel_id == channel_id
+        assert queued_events[0].status == QueuedEventStatus.PENDING.value
+        assert QueuedEvent().get_queue_depth() == 1
+
+    def test_claim_next_results_events_ordered_per_channel(self, db_setup, channel_id):
+        QueuedEvent().enqueue("message", _message_payload(channel_id, "1.1"))
+        QueuedEvent().enqueue("message", _message_payload(channel_id, "1.2"))
+        QueuedEvent().enqueue("message", _message_payload("OTHER_CHANNEL", "1.3"))
+
+        first = _claim("worker_1")
+        second = _claim("worker_2")
+        assert first.payload["event"]["ts"] == "1.1"
+        assert second.payload["event"]["ts"] == "1.3"
+        assert QueuedEvent().claim_next("worker_3") is None
+
+        QueuedEvent().complete(first.id)
+        third = _claim("worker_3")
+        assert third.payload["event"]["ts"] == "1.2"
+        assert third.claimed_by == "worker_3"
+        assert third.attempts == 1
+
+    def test_fail_results_event_pending_then_failed(self, db_setup, channel_id, event_ts):
+        QueuedEvent().enqueue("message", _message_payload(channel_id, event_ts))
+
+        QueuedEvent().fail(_claim("worker").id, max_attempts=2)
+        assert db.session.query(QueuedEvent).first().status == QueuedEventStatus.PENDING.value
+
+        QueuedEvent().fail(_claim("worker").id, max_attempts=2)
+        assert db.session.query(QueuedEvent).first().status == QueuedEventStatus.FAILED.value
+        assert QueuedEvent().claim_next("worker") is None
+
+    def test_release_stale_claims_results_event_pending(self, db_setup, channel_id, event_ts):
+        QueuedEvent().enqueue("message", _message_payload(channel_id, event_ts))
+        queued_event = _claim("worker")
+        queued_event.claimed_datetime_utc = datetime.utcnow() - timedelta(minutes=10)
+        db.session.commit()
+
+        assert QueuedEvent().release_stale_claims(timedelta(minutes=5)) == 1
+        assert db.session.query(QueuedEvent).first().status == QueuedEventStatus.PENDING.value
+
+    def test_purge_failed_results_failed_events_past_retention_removed(self, db_setup, channel_id):
+        for ts, status, age in (
+            ("1.1", QueuedEventStatus.FAILED, QueuedEvent.failed_retention + timedelta(hours=1)),
+            ("1.2", QueuedEventStatus.FAILED, timedelta(hours=1)),
+            ("1.3", QueuedEventStatus.PENDING, QueuedEvent.failed_retention + timedelta(hours=1)),
+        ):
+            QueuedEvent().enqueue("message", _message_payload(channel_id, ts))
+            queued_event = db.session.query(QueuedEvent).order_by(QueuedEvent.id.desc()).first()
+            queued_event.status = status.value
+            queued_event.created_datetime_utc = datetime.utcnow() - age
+        db.session.commit()
+
+        assert QueuedEvent().purge_failed() == 1
+        assert sorted(event.payload["event"]["ts"] for event in db.session.query(QueuedEvent)) == ["1.2", "1.3"]
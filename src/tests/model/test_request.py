@@ -1,5 +1,7 @@
+import json
 import time
 from datetime import datetime
+from typing import Dict
 from typing import List
 from unittest.mock import patch
 
@@ -39,6 +41,23 @@ class TestIntegrationRequest:
         updated_request: Request = Request().get_request(channel_id, event_ts)
         assert updated_request.slack_channel_id == channel_id
 
+    def test_get_request_results_blocks_loaded_only_when_read(
+        self, db_setup, test_record_added, channel_id, event_ts, blocks
+    ):
+        test_record_added()
+        Block().create_or_update_existing_blocks(blocks, 1)
+        db.session.expunge_all()
+
+        request: Request = Request().get_request(channel_id, event_ts)
+
+        assert "blocks_table" not in request.__dict__
+        assert request.blocks == json.dumps(blocks)
+
+    def test_request_exists(self, db_setup, test_record_added, channel_id, event_ts):
+        assert not Request().request_exists(channel_id, event_ts)
+        test_record_added()
+        assert Request().request_exists(channel_id, event_ts)
+
     def test_update_or_register_new_record_results_add_new_given_new_record(
         self,
         db_setup,
@@ -412,3 +431,90 @@ class TestIntegrationRequest:
         dates = [datetime.fromtimestamp(float(x.event_ts)).strftime(SLACK_DATETIME_FMT) for x in results]
         assert len(results) == 2
         assert {"2022-04-21 21:34:58", "2022-04-21 08:00:21"} == set(dates)
+
+    def test_get_idle_thread_candidates_returns_unfinished_quiet_threads(self, db_setup, channel_id, requestor_id):
+        def add_request(event_ts: str, status=RequestStatusEnum.NEW_RECORD, autoclose_status=None, reply_ts=None):
+            request = Request(
+                slack_channel_name="channel",
+                slack_channel_id=channel_id,
+                requestor_id=requestor_id,
+                request_status=status.value,
+                event_ts=event_ts,
+                autoclose_status=autoclose_status.value if autoclose_status else None,
+            )
+            db.session.add(request)
+            db.session.flush()
+            if reply_ts is not None:
+                db.session.add(ThreadMessage(author_id=requestor_id, event_ts=reply_ts, request_table_id=request.id))
+
+        add_request("1000.000100")  # no replies
+        add_request("1000.000200", reply_ts="1500.000000")  # quiet since before the reminder threshold
+        add_request("1000.000300", reply_ts="1900.000000")  # recent reply
+        add_request("1000.000400", status=RequestStatusEnum.COMPLETED)
+        add_request("1000.000500", autoclose_status=AutocloseStatus.CLOSED)
+        add_request("1000.000600", autoclose_status=AutocloseStatus.REMINDER, reply_ts="1550.000000")
+        add_request("1000.000700", autoclose_status=AutocloseStatus.REMINDER, reply_ts="1700.000000")
+        add_request("100.000000")  # older than the scan limit
+        add_request("1950.000000")  # too young to be closed
+        db.session.commit()
+
+        candidates = Request().get_idle_thread_candidates(
+            channel_id, oldest_ts=500, created_before_ts=1800, reminder_before_ts=1600, close_before_ts=1400
+        )
+
+        assert candidates == ["1000.000100", "1000.000200", "1000.000600"]
+
+    def test_get_latest_replies_results_latest_reply_of_every_thread(self, db_setup, channel_id, requestor_id):
+        replies_by_thread: Dict[str, List[str]] = {
+            "1000.000100": ["1100.000100", "1300.000100", "1200.000100"],
+            "1000.000200": [],
+        }
+        for event_ts, replies in replies_by_thread.items():
+            request = Request(
+                slack_channel_name="channel",
+                slack_channel_id=channel_id,
+                requestor_id=requestor_id,
+                request_status=RequestStatusEnum.WORKING.value,
+                event_ts=event_ts,
+            )
+            db.session.add(request)
+            db.session.flush()
+            for reply_ts in replies:
+                blocks_id = Block().create_or_update_existing_blocks([{"type": "rich_text", "ts": reply_ts}])
+                db.session.add(
+                    ThreadMessage(
+                        author_id=requestor_id, event_ts=reply_ts, blocks_id=blocks_id, request_table_id=request.id
+                    )
+                )
+        db.session.commit()
+
+        latest_replies = ThreadMessage().get_latest_replies(channel_id, ["1000.000100", "1000.000200"])
+
+        assert latest_replies == {
+            "1000.000100": {
+                "ts": "1300.000100",
+                "user": requestor_id,
+                "blocks": [{"type": "rich_text", "ts": "1300.000100"}],
+            }
+        }
+        assert ThreadMessage().get_latest_replies(channel_id, []) == {}
+
+    def test_last_working_day_counts_and_open_items_are_computed_in_sql(
+        self, db_setup, channel_id, requests_with_dates_added
+    ):
+        utc_now = datetime.strptime("2022-04-22 12:00:21", SLACK_DATETIME_FMT)
+        requests_with_dates_added(
+            ["2022-04-21 21:34:58", "2022-04-21 08:00:21", "2022-04-21 10:00:00", "2022-04-20 21:34:58"]
+        )
+        completed = db.session.query(Request).order_by(Request.event_ts).all()[2]
+        completed.request_status = RequestStatusEnum.COMPLETED.value
+        db.session.commit()
+
+        counts = Request().get_last_working_day_status_counts(channel_id, utc_now)
+        open_items = list(Request().stream_last_working_day_open_items(channel_id, utc_now, batch_size=1))
+
+        assert counts == {RequestStatusEnum.NEW_RECORD.value: 2, RequestStatusEnum.COMPLETED.value: 1}
+        assert [datetime.fromtimestamp(float(item.event_ts)).strftime(SLACK_DATETIME_FMT) for item in open_items] == [
+            "2022-04-21 21:34:58",
+            "2022-04-21 08:00:21",
+        ]
@@ -0,0 +1,161 @@
+from datetime import date
+
+import pytest
+
+from src.code.db import db
+from src.code.model.request import Request
+from src.code.model.request_rollup import ALL_REQUEST_TYPES
+from src.code.model.request_rollup import RequestDailyRollup
+from src.code.model.request_rollup import RequestRollupDelta
+
+# 2022-05-13 08:00:00 UTC
+REQUEST_TS = "1652428800.000000"
+
+
+def _request(channel_id: str, event_ts: str = REQUEST_TS) -> Request:
+    request = Request(
+        slack_channel_name="cloud",
+        slack_channel_id=channel_id,
+        requestor_id="requestor_id",
+        request_status="INITIAL",
+        event_ts=event_ts,
+        request_types={"message": ["cloud-help"], "reaction": []},
+        completion_reactions={"completion_reactions": []},
+    )
+    db.session.add(request)
+    RequestDailyRollup().record_created(request)
+    db.session.commit()
+    return request
+
+
+class TestIntegrationRequestDailyRollup:
+    def test_status_changes_results_deltas_applied_per_day_and_type(self, db_setup, channel_id):
+        request = _request(channel_id)
+        # started 30 minutes and completed 3 days after being posted
+        Request().start_work(request, "1652430600.000000")
+        Request().close_record(request, "1652688000.000000", "white_check_mark")
+        db.session.commit()
+        assert db.session.query(RequestRollupDelta).count() == 3
+
+        assert RequestDailyRollup().apply_pending_deltas() == 3
+
+        assert db.session.query(RequestRollupDelta).count() == 0
+        rows = {
+            (row.rollup_date, row.request_type): row
+            for row in db.session.query(RequestDailyRollup).filter_by(slack_channel_id=channel_id)
+        }
+        assert sorted(rows) == [
+            (date(2022, 5, 13), ALL_REQUEST_TYPES),
+            (date(2022, 5, 13), "cloud-help"),
+            (date(2022, 5, 16), ALL_REQUEST_TYPES),
+            (date(2022, 5, 16), "cloud-help"),
+        ]
+        friday = rows[(date(2022, 5, 13), "cloud-help")]
+        assert (friday.created_count, friday.started_count, friday.completed_count) == (1, 1, 0)
+        monday = rows[(date(2022, 5, 16), ALL_REQUEST_TYPES)]
+        assert (monday.created_count, monday.started_count, monday.completed_count) == (0, 0, 1)
+
+    def test_reopened_request_results_completion_removed(self, db_setup, channel_id):
+        request = _request(channel_id)
+        Request().close_record(request, "1652430600.000000", "white_check_mark")
+        db.session.commit()
+        Request().remove_completion_reaction_from_record(request, "white_check_mark")
+        db.session.commit()
+        RequestDailyRollup().apply_pending_deltas()
+
+        stats = RequestDailyRollup().get_period_stats(channel_id, date(2022, 5, 9), date(2022, 5, 15))
+        assert [(item.request_type, item.created, item.completed) for item in stats] == [
+            (ALL_REQUEST_TYPES, 1, 0),
+            ("cloud-help", 1, 0),
+        ]
+        assert stats[0].time_to_complete_p50 is None
+
+    def test_reopened_request_results_completion_removed_from_types_it_was_counted_with(self, db_setup, channel_id):
+        request = _request(channel_id)
+        Request().close_record(request, "1652430600.000000", "white_check_mark")
+        db.session.commit()
+        # a type added after the completion has no completion to take back
+        request.request_types = {"message": ["cloud-help"], "reaction": ["security-help"]}
+        Request().remove_completion_reaction_from_record(request, "white_check_mark")
+        db.session.commit()
+        RequestDailyRollup().apply_pending_deltas()
+
+        rows = db.session.query(RequestDailyRollup).filter_by(slack_channel_id=channel_id).all()
+        assert sorted((row.request_type, row.created_count, row.completed_count) for row in rows) == [
+            (ALL_REQUEST_TYPES, 1, 0),
+            ("cloud-help", 1, 0),
+        ]
+
+    def test_removed_request_results_all_counts_taken_back(self, db_setup, channel_id):
+        request = _request(channel_id)
+        Request().start_work(request, "1652430600.000000")
+        Request().close_record(request, "1652432400.000000", "white_check_mark")
+        db.session.commit()
+        Request().remove_record(request)
+        RequestDailyRollup().apply_pending_deltas()
+
+        stats = RequestDailyRollup().get_period_stats(channel_id, date(2022, 5, 13), date(2022, 5, 13))
+        assert [(item.request_type, item.created, item.started, item.completed) for item in stats] == [
+            (ALL_REQUEST_TYPES, 0, 0, 0),
+            ("cloud-help", 0, 0, 0),
+        ]
+        assert stats[0].time_to_start_p50 is None
+        assert stats[0].time_to_complete_p50 is None
+
+    def test_get_period_stats_results_days_merged(self, db_setup, channel_id):
+        for event_ts, completion_ts in (
+            ("1652428800.000000", "1652429400.000000"),
+            ("1652515200.000000", "1652529600.000000"),
+            ("1652601600.000000", "1652688000.000000"),
+        ):
+            Request().close_record(_request(channel_id, event_ts), completion_ts, "white_check_mark")
+        _request("OTHER_CHANNEL_ID")
+        db.session.commit()
+        RequestDailyRollup().apply_pending_deltas(batch_size=2)
+
+        stats = RequestDailyRollup().get_period_stats(channel_id, date(2022, 5, 9), date(2022, 5, 15))
+
+        assert stats[0].request_type == ALL_REQUEST_TYPES
+        assert (stats[0].created, stats[0].completed) == (3, 2)
+        assert stats[0].time_to_complete_p50 == pytest.approx(10 * 60, rel=0.01)
+        assert stats[0].time_to_complete_p90 == pytest.approx(4 * 3600, rel=0.01)
+
+    def test_get_percentiles_results_merged_days_of_type(self, db_setup, channel_id):
+        # completed after 10 minutes on Friday, after 1 and 4 hours on Saturday
+        for event_ts, completion_ts in (
+            ("1652428800.000000", "1652429400.000000"),
+            ("1652515200.000000", "1652518800.000000"),
+            ("1652515200.000001", "1652529600.000001"),
+        ):
+            Request().close_record(_request(channel_id, event_ts), completion_ts, "white_check_mark")
+        db.session.commit()
+        RequestDailyRollup().apply_pending_deltas()
+
+        percentiles = RequestDailyRollup().get_percentiles(
+            channel_id, date(2022, 5, 13), date(2022, 5, 14), "completed", "cloud-help"
+        )
+
+        assert percentiles == {
+            50: pytest.approx(3600, rel=0.01),
+            90: pytest.approx(4 * 3600, rel=0.01),
+            99: pytest.approx(4 * 3600, rel=0.01),
+        }
+        assert RequestDailyRollup().get_percentiles(
+            channel_id, date(2022, 5, 13), date(2022, 5, 14), "started", percentiles=(50,)
+        ) == {50: None}
+
+    def test_rebuild_results_rollups_recounted_from_requests(self, db_setup, channel_id):
+        request = _request(channel_id)
+        Request().close_record(request, "1652430600.000000", "white_check_mark")
+        db.session.commit()
+        RequestDailyRollup().apply_pending_deltas()
+        db.session.query(RequestDailyRollup).update({"created_count": 10}, synchronize_session=False)
+        db.session.commit()
+
+        assert RequestDailyRollup().rebuild(Request().stream_changed_since(date(2022, 5, 13)), date(2022, 5, 13)) == 1
+
+        stats = RequestDailyRollup().get_period_stats(channel_id, date(2022, 5, 13), date(2022, 5, 13))
+        assert [(item.request_type, item.created, item.completed) for item in stats] == [
+            (ALL_REQUEST_TYPES, 1, 1),
+            ("cloud-help", 1, 1),
+        ]
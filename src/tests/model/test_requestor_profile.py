@@ -0,0 +1,38 @@
+from datetime import datetime
+from datetime import timedelta
+
+from src.code.db import db
+from src.code.dto.dto import RequestorProfileDto
+from src.code.model.requestor_profile import RequestorProfile
+
+
+class TestIntegrationRequestorProfile:
+    def test_save_profile_results_fresh_profile(self, db_setup, requestor_id, requestor_email, requestor_team_id):
+        profile = RequestorProfileDto(email=requestor_email, team_id=requestor_team_id)
+
+        RequestorProfile().save_profile(requestor_id, profile)
+
+        assert RequestorProfile().get_fresh_profile(requestor_id, timedelta(hours=1)) == profile
+
+    def test_save_profiles_results_existing_profile_updated(self, db_setup, requestor_id, requestor_team_id):
+        RequestorProfile().save_profile(requestor_id, RequestorProfileDto(email="old", team_id=requestor_team_id))
+
+        RequestorProfile().save_profiles(
+            {
+                requestor_id: RequestorProfileDto(email="new", team_id=requestor_team_id),
+                "other_id": RequestorProfileDto(email="other", team_id=requestor_team_id),
+            }
+        )
+
+        assert db.session.query(RequestorProfile).count() == 2
+        assert RequestorProfile().get_fresh_profile(requestor_id, timedelta(hours=1)) == RequestorProfileDto(
+            email="new", team_id=requestor_team_id
+        )
+
+    def test_get_fresh_profile_results_none_given_stale_profile(self, db_setup, requestor_id, requestor_team_id):
+        RequestorProfile().save_profile(requestor_id, RequestorProfileDto(email="old", team_id=requestor_team_id))
+        record = db.session.query(RequestorProfile).first()
+        record.updated_datetime_utc = datetime.utcnow() - timedelta(days=2)
+        db.session.commit()
+
+        assert RequestorProfile().get_fresh_profile(requestor_id, timedelta(days=1)) is None
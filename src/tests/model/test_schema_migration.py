@@ -0,0 +1,40 @@
+import os
+
+from sqlalchemy import inspect
+
+from src.code.db import db
+from src.code.model.schema_migration import SchemaMigration
+
+
+def _write_migration(directory, file_name: str, script: str) -> None:
+    with open(os.path.join(directory, file_name), "w") as file:
+        file.write(script)
+
+
+class TestIntegrationSchemaMigration:
+    def test_get_migration_files_results_shipped_migrations_sorted_by_version(self):
+        versions = [migration.version for migration in SchemaMigration().get_migration_files()]
+        assert versions[0] == "001"
+        assert versions == sorted(versions, key=int)
+
+    def test_get_migration_files_results_tables_of_event_path_created_first(self):
+        descriptions = [migration.description for migration in SchemaMigration().get_migration_files()]
+        assert descriptions[:3] == ["requestor_profiles", "event_queue", "processed_events"]
+
+    def test_apply_pending_results_migrations_applied_once(self, db_setup, tmp_path):
+        _write_migration(
+            tmp_path, "V002__second.sql", "-- comment\nCREATE INDEX ind_test_2 ON requests(requestor_id);\n"
+        )
+        _write_migration(tmp_path, "V001__first.sql", "CREATE INDEX ind_test_1 ON requests(request_status);")
+        _write_migration(tmp_path, "not_a_migration.sql", "DROP TABLE requests;")
+
+        assert SchemaMigration().apply_pending(str(tmp_path)) == ["001", "002"]
+        assert SchemaMigration().apply_pending(str(tmp_path)) == []
+
+        index_names = {index["name"] for index in inspect(db.engine).get_indexes("requests")}
+        assert {"ind_test_1", "ind_test_2"} <= index_names
+        assert SchemaMigration().get_applied_versions() == {"001", "002"}
+
+    def test_split_statements_results_statements_without_comments(self):
+        script = "-- first\nCREATE INDEX a ON t(x);\n\n-- second\nCREATE INDEX b ON t(y);\n"
+        assert SchemaMigration._split_statements(script) == ["CREATE INDEX a ON t(x)", "CREATE INDEX b ON t(y)"]
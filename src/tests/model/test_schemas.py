@@ -1,3 +1,10 @@
+from dataclasses import FrozenInstanceError
+from unittest.mock import patch
+
+import pytest
+
+from src.code.model.schemas import DISABLED_REACTIONS
+from src.code.model.schemas import DISABLED_TYPES
 from src.code.model.schemas import ChannelProperties
 from src.code.model.schemas import Question
 from src.code.model.schemas import channel_properties_schema
@@ -15,3 +22,71 @@ class TestSchemas:
         channel_properties.features.question_form.enabled = False
         channel_properties.question_forms.questions = [Question("question1")]
         assert channel_properties.is_active_question_form() is False
+
+    def test_get_type_emoji_results_type_of_emoji_or_alias(self, channel_properties):
+        emoji, emoji_properties = next(iter(channel_properties.types.emojis.items()))
+        assert channel_properties.get_type_emoji(emoji) == emoji
+        assert channel_properties.get_type_emoji(emoji_properties["alias"]) == emoji
+        assert channel_properties.get_type_emoji("not-a-type") is None
+        channel_properties.features.types.enabled = False
+        assert channel_properties.get_type_emoji(emoji) is None
+
+    def test_emoji_lookup_results_rebuilt_after_setter(self, channel_properties):
+        lookup = channel_properties.emoji_lookup
+        assert channel_properties.emoji_lookup is lookup
+        assert channel_properties.is_completion_reaction(channel_properties.completion_reactions[0])
+
+        channel_properties.completion_reactions = ["heavy_check_mark"]
+
+        assert channel_properties.emoji_lookup is not lookup
+        assert channel_properties.is_completion_reaction("heavy_check_mark")
+        assert "_emoji_lookup" not in channel_properties_schema.dump(channel_properties)
+
+    def test_emoji_lookup_results_rebuilt_after_in_place_change(self, channel_properties):
+        assert not channel_properties.is_completion_reaction("heavy_check_mark")
+        channel_properties.completion_reactions.append("heavy_check_mark")
+        assert channel_properties.is_completion_reaction("heavy_check_mark")
+
+        emoji = next(iter(channel_properties.types.emojis))
+        channel_properties.types.emojis[emoji]["alias"] = "new-alias"
+        assert channel_properties.get_type_emoji("new-alias") == emoji
+        assert "new-alias" in channel_properties.emoji_lookup.type_names
+
+    def test_emoji_lookup_results_rebuilt_after_feature_toggled(self, channel_properties):
+        emoji = next(iter(channel_properties.types.emojis))
+        reaction = channel_properties.start_work_reactions[0]
+        assert emoji in channel_properties.emoji_lookup.type_names
+        assert channel_properties.is_start_work_reaction(reaction)
+
+        channel_properties.features.types.enabled = False
+        channel_properties.features.start_work_reactions.enabled = False
+
+        assert emoji not in channel_properties.emoji_lookup.type_names
+        assert not channel_properties.is_start_work_reaction(reaction)
+
+    def test_disabled_features_results_shared_defaults_without_logging(self, channel_properties_dict):
+        channel_properties_dict["features"] = {}
+        with patch("logging.Logger.info") as info:
+            first: ChannelProperties = channel_properties_schema.load(channel_properties_dict)
+            second: ChannelProperties = channel_properties_schema.load(channel_properties_dict)
+            assert first.types is second.types is DISABLED_TYPES
+            assert first.completion_reactions is second.start_work_reactions is DISABLED_REACTIONS
+            assert first.close_idle_threads is None
+            assert first.daily_report is None
+        info.assert_not_called()
+        with pytest.raises(TypeError):
+            first.types.emojis["cloud-bug"] = {}
+
+    def test_accessors_results_feature_toggled_on_loaded_properties(self, channel_properties):
+        channel_properties.features.completion_reactions.enabled = False
+        assert channel_properties.completion_reactions == ()
+
+        channel_properties.features.completion_reactions.enabled = True
+        assert channel_properties.completion_reactions == channel_properties._completion_reactions
+
+    def test_disabled_types_results_frozen(self):
+        with pytest.raises(FrozenInstanceError):
+            DISABLED_TYPES.not_selected_response = "Select a type"
+        with pytest.raises(FrozenInstanceError):
+            DISABLED_TYPES.emojis = {"cloud-bug": {}}
+        assert DISABLED_TYPES.emojis == {}
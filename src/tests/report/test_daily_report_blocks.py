@@ -0,0 +1,45 @@
+import datetime
+
+from src.code.report.daily_report_blocks import OPEN_ITEMS_CONT_TITLE
+from src.code.report.daily_report_blocks import OPEN_ITEMS_TITLE
+from src.code.report.daily_report_blocks import DailyReportBlocks
+
+
+def _item(link: str) -> dict:
+    return {
+        "start_datetime_utc": datetime.datetime(2022, 4, 21, 8, 0, 21),
+        "request_link": link,
+        "event_type": ["cloud-pr", "cloud-bug"],
+        "requestor": "U1",
+    }
+
+
+class TestDailyReportBlocks:
+    def test_format_item_escapes_mrkdwn_control_characters(self):
+        line = DailyReportBlocks.format_item(_item("https://x.slack.com/p1?a=1&b=<2>"))
+        assert (
+            line
+            == "* _2022-04-21 08:00:21_  |  <https://x.slack.com/p1?a=1&amp;b=&lt;2&gt;|request link>  |  "
+            ":cloud-pr::cloud-bug:\n"
+        )
+
+    def test_build_results_header_only_in_first_piece_and_text_within_limit(self):
+        report_blocks = DailyReportBlocks('channel "quoted"', "2022-04-21", 3, 40, text_limit=500)
+
+        pieces = list(report_blocks.build(_item("link") for _ in range(40)))
+
+        assert [block["type"] for block in pieces[0]] == ["header", "section", "divider", "section"]
+        assert pieces[0][0]["text"]["text"] == 'channel "quoted"'
+        assert pieces[0][1]["text"]["text"] == "*Last Day 2022-04-21*\n *3* completed | *40* open"
+        assert pieces[0][3]["text"]["text"].startswith(OPEN_ITEMS_TITLE)
+        assert all(
+            len(piece) == 1 and piece[0]["text"]["text"].startswith(OPEN_ITEMS_CONT_TITLE) for piece in pieces[1:]
+        )
+        assert all(len(piece[-1]["text"]["text"]) <= 500 for piece in pieces)
+        assert sum(piece[-1]["text"]["text"].count("request link") for piece in pieces) == 40
+        assert len(pieces) > 1
+
+    def test_build_results_one_piece_without_items(self):
+        pieces = list(DailyReportBlocks("channel", "2022-04-21", 0, 0).build([]))
+        assert len(pieces) == 1
+        assert pieces[0][3]["text"]["text"] == OPEN_ITEMS_TITLE
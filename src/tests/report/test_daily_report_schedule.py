@@ -0,0 +1,108 @@
+import datetime
+from unittest.mock import patch
+
+import pytz
+
+from src.code.model.control_panel import ControlPanel
+from src.code.report.daily_report_schedule import DailyReportSchedule
+from src.code.report.request_report import RequestReport
+
+
+def _utc(*args) -> datetime.datetime:
+    return datetime.datetime(*args, tzinfo=pytz.UTC)
+
+
+class TestDailyReportSchedule:
+    def test_get_next_report_datetime_utc_converts_local_time_to_utc(self):
+        # Prague is UTC+2 in summer and UTC+1 in winter
+        assert DailyReportSchedule.get_next_report_datetime_utc(
+            "Europe/Prague", "8:00", _utc(2022, 5, 13, 5, 0)
+        ) == _utc(2022, 5, 13, 6, 0)
+        assert DailyReportSchedule.get_next_report_datetime_utc(
+            "Europe/Prague", "8:00", _utc(2022, 12, 13, 5, 0)
+        ) == _utc(2022, 12, 13, 7, 0)
+        # the day of the report is the local one
+        assert DailyReportSchedule.get_next_report_datetime_utc(
+            "America/New_York", "20:00", _utc(2022, 5, 13, 2, 0)
+        ) == _utc(2022, 5, 13, 0, 0)
+
+    def test_get_next_report_datetime_utc_given_last_report(self):
+        utc_now = _utc(2022, 5, 13, 8, 0)
+        assert DailyReportSchedule.get_next_report_datetime_utc(
+            "UTC", "7:00", utc_now, _utc(2022, 5, 13, 7, 0)
+        ) == _utc(2022, 5, 14, 7, 0)
+        # a report missed while the scheduler was down is due right away
+        assert DailyReportSchedule.get_next_report_datetime_utc(
+            "UTC", "7:00", utc_now, _utc(2022, 5, 10, 7, 0)
+        ) == _utc(2022, 5, 11, 7, 0)
+        # a report sent late is not sent again the same day
+        assert DailyReportSchedule.get_next_report_datetime_utc(
+            "UTC", "7:00", utc_now, _utc(2022, 5, 13, 7, 50)
+        ) == _utc(2022, 5, 14, 7, 0)
+
+    def test_get_next_report_datetime_utc_given_dst_change(self):
+        # 2:30 does not exist in Prague on 2022-03-27
+        assert DailyReportSchedule.get_next_report_datetime_utc(
+            "Europe/Prague", "2:30", _utc(2022, 3, 27, 0, 0)
+        ) == _utc(2022, 3, 27, 1, 30)
+
+    def test_load_and_pop_due_in_report_time_order(self, cp_daily_report):
+        cp_utc: ControlPanel = cp_daily_report({"schedule": [{"local_time": "9:00", "last_report_datetime_utc": ""}]})
+        cp_prague: ControlPanel = cp_daily_report(
+            {"schedule": [{"local_time": "9:00", "last_report_datetime_utc": ""}], "timezone": "Europe/Prague"}
+        )
+        cp_prague.slack_channel_id = "PRAGUE_CHANNEL_ID"
+        cp_invalid: ControlPanel = cp_daily_report(
+            {"schedule": [{"local_time": "25:00", "last_report_datetime_utc": ""}]}
+        )
+        DailyReportSchedule.load([cp_utc, cp_invalid, cp_prague], (3, 0), _utc(2022, 5, 13, 5, 0))
+
+        assert DailyReportSchedule.stats() == {"size": 2}
+        assert not DailyReportSchedule.is_stale((3, 0))
+        assert DailyReportSchedule.is_stale((3, 1))
+        assert DailyReportSchedule.pop_due(_utc(2022, 5, 13, 6, 59)) == []
+        assert [report.channel_id for report in DailyReportSchedule.pop_due(_utc(2022, 5, 13, 9, 0))] == [
+            "PRAGUE_CHANNEL_ID",
+            "BOGUS_CHANNEL_ID",
+        ]
+        assert DailyReportSchedule.next_report_datetime_utc() is None
+
+
+class TestScheduledDailyReport:
+    def test_daily_report_reloads_schedule_only_when_version_changes(self, cp_daily_report):
+        cp: ControlPanel = cp_daily_report({"schedule": [{"local_time": "7:00", "last_report_datetime_utc": ""}]})
+        datetime_mock = patch("src.code.report.request_report.datetime.datetime", wraps=datetime.datetime)
+        with datetime_mock as patched_datetime:
+            with patch.object(ControlPanel, "get_daily_report_version", return_value=(1, 0)):
+                with patch.object(ControlPanel, "get_all_active_control_panels", return_value=[cp]) as get_all:
+                    with patch.object(ControlPanel, "get_active_control_panel_details", return_value=cp):
+                        with patch.object(RequestReport, "_generate_report") as generate_report:
+                            # Friday, Saturday and Monday
+                            for utc_now in (
+                                _utc(2022, 5, 13, 7, 0),
+                                _utc(2022, 5, 13, 8, 0),
+                                _utc(2022, 5, 14, 7, 0),
+                                _utc(2022, 5, 16, 7, 0),
+                            ):
+                                patched_datetime.now.return_value = utc_now
+                                RequestReport().daily_report()
+        get_all.assert_called_once()
+        assert [call.args[2] for call in generate_report.call_args_list] == [
+            _utc(2022, 5, 13, 7, 0),
+            _utc(2022, 5, 16, 7, 0),
+        ]
+        assert DailyReportSchedule.next_report_datetime_utc() == _utc(2022, 5, 17, 7, 0)
+
+    def test_daily_report_retries_failed_report(self, cp_daily_report):
+        cp: ControlPanel = cp_daily_report({"schedule": [{"local_time": "7:00", "last_report_datetime_utc": ""}]})
+        utc_now = _utc(2022, 5, 13, 7, 0)
+        with patch("src.code.report.request_report.datetime.datetime", wraps=datetime.datetime) as patched_datetime:
+            patched_datetime.now.return_value = utc_now
+            with patch.object(ControlPanel, "get_daily_report_version", return_value=(1, 0)):
+                with patch.object(ControlPanel, "get_all_active_control_panels", return_value=[cp]):
+                    with patch.object(ControlPanel, "get_active_control_panel_details", return_value=cp):
+                        with patch.object(RequestReport, "_generate_report", side_effect=ValueError("failed")):
+                            RequestReport().daily_report()
+        assert DailyReportSchedule.next_report_datetime_utc() == utc_now + datetime.timedelta(
+            seconds=DailyReportSchedule.retry_seconds
+        )
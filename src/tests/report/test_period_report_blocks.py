@@ -0,0 +1,132 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+import pytz
+
+from src.code.dto.dto import RequestStatsDto
+from src.code.model.control_panel import ControlPanel
+from src.code.model.request_rollup import ALL_REQUEST_TYPES
+from src.code.model.request_rollup import RequestDailyRollup
+from src.code.model.schemas import channel_properties_schema
+from src.code.report.daily_report_schedule import ScheduledReport
+from src.code.report.period_report_blocks import PeriodReportBlocks
+from src.code.report.period_report_blocks import format_duration
+from src.code.report.period_report_blocks import get_period_date_range
+from src.code.report.request_report import RequestReport
+from src.code.report.request_report import get_report_periods
+from src.code.utils.slack_webclient import SlackWebclient
+
+
+def _stats(request_type: str) -> RequestStatsDto:
+    return RequestStatsDto(
+        request_type=request_type,
+        created=3,
+        started=2,
+        completed=1,
+        time_to_start_p50=900.0,
+        time_to_start_p90=4 * 3600.0,
+        time_to_start_p99=None,
+        time_to_complete_p50=2 * 24 * 3600.0,
+        time_to_complete_p90=3.5 * 24 * 3600.0,
+        time_to_complete_p99=40 * 24 * 3600.0,
+    )
+
+
+class TestPeriodReportBlocks:
+    def test_get_period_date_range(self):
+        assert get_period_date_range("weekly", datetime.date(2022, 5, 13)) == (
+            datetime.date(2022, 5, 9),
+            datetime.date(2022, 5, 15),
+        )
+        assert get_period_date_range("monthly", datetime.date(2024, 2, 13)) == (
+            datetime.date(2024, 2, 1),
+            datetime.date(2024, 2, 29),
+        )
+        with pytest.raises(ValueError):
+            get_period_date_range("daily", datetime.date(2022, 5, 13))
+
+    def test_format_duration(self):
+        assert [format_duration(seconds) for seconds in (None, 0.0, 301.5, 7380, 3 * 24 * 3600)] == [
+            "-",
+            "0m",
+            "5m",
+            "2.0h",
+            "3.0d",
+        ]
+
+    def test_build_results_header_and_line_per_type(self):
+        blocks = PeriodReportBlocks(
+            "cloud", "weekly", datetime.date(2022, 5, 9), datetime.date(2022, 5, 15), text_limit=200
+        ).build([_stats(ALL_REQUEST_TYPES), _stats("cloud-bug")])
+
+        assert blocks[0]["text"]["text"] == "cloud"
+        assert blocks[1]["text"]["text"] == "*Week 2022-05-09 - 2022-05-15*"
+        assert [block["text"]["text"] for block in blocks[3:]] == [
+            (
+                "*All types:*  *3* new | *2* started | *1* completed | time to start p50 15m, p90 4.0h, p99 -"
+                " | time to complete p50 2.0d, p90 3.5d, p99 40.0d\n"
+            ),
+            (
+                ":cloud-bug:  *3* new | *2* started | *1* completed | time to start p50 15m, p90 4.0h, p99 -"
+                " | time to complete p50 2.0d, p90 3.5d, p99 40.0d\n"
+            ),
+        ]
+
+
+class TestPeriodReport:
+    def test_generate_scheduled_report_sends_period_reports_after_period_end(self, cp_daily_report):
+        cp: ControlPanel = cp_daily_report({"schedule": [{"local_time": "7:00", "last_report_datetime_utc": ""}]})
+        with patch.object(ControlPanel, "get_active_control_panel_details", return_value=cp):
+            with patch.object(RequestReport, "_generate_report"):
+                with patch.object(RequestReport, "periods", ["weekly", "monthly"]):
+                    with patch.object(RequestReport, "period_report") as period_report:
+                        # the Monday after a week, a Tuesday and the Wednesday 1st of June
+                        for utc_now in (
+                            datetime.datetime(2022, 5, 16, 7, 0, tzinfo=pytz.UTC),
+                            datetime.datetime(2022, 5, 17, 7, 0, tzinfo=pytz.UTC),
+                            datetime.datetime(2022, 6, 1, 7, 0, tzinfo=pytz.UTC),
+                        ):
+                            RequestReport()._generate_scheduled_report(
+                                ScheduledReport(utc_now, cp.slack_channel_id, 0, "UTC", "7:00"), utc_now
+                            )
+        assert [call.args[2:] for call in period_report.call_args_list] == [
+            ("weekly", datetime.date(2022, 5, 9), datetime.date(2022, 5, 15)),
+            ("monthly", datetime.date(2022, 5, 1), datetime.date(2022, 5, 31)),
+        ]
+
+    def test_get_report_periods_results_known_periods_normalized(self):
+        assert get_report_periods(" Weekly, quarterly,MONTHLY,weekly,") == ["weekly", "monthly"]
+        assert get_report_periods("") == []
+
+    def test_generate_scheduled_report_does_not_raise_given_unknown_period(self, cp_daily_report):
+        cp: ControlPanel = cp_daily_report({"schedule": [{"local_time": "7:00", "last_report_datetime_utc": ""}]})
+        utc_now = datetime.datetime(2022, 5, 16, 7, 0, tzinfo=pytz.UTC)
+        with patch.object(ControlPanel, "get_active_control_panel_details", return_value=cp):
+            with patch.object(RequestReport, "_generate_report") as generate_report:
+                with patch.object(RequestReport, "periods", ["quarterly", "weekly"]):
+                    with patch.object(RequestReport, "period_report") as period_report:
+                        RequestReport()._generate_scheduled_report(
+                            ScheduledReport(utc_now, cp.slack_channel_id, 0, "UTC", "7:00"), utc_now
+                        )
+        generate_report.assert_called_once()
+        assert [call.args[2] for call in period_report.call_args_list] == ["weekly"]
+
+    def test_period_report_sends_stats_of_channel_types(self, cp_daily_report):
+        cp: ControlPanel = cp_daily_report({"schedule": [{"local_time": "7:00", "last_report_datetime_utc": ""}]})
+        channel_properties = channel_properties_schema.load(cp.channel_properties)
+        with patch.object(RequestDailyRollup, "apply_pending_deltas") as apply_pending_deltas:
+            with patch.object(
+                RequestDailyRollup,
+                "get_period_stats",
+                return_value=[_stats(ALL_REQUEST_TYPES), _stats("not-a-channel-type")],
+            ):
+                with patch.object(SlackWebclient, "send_post_message_as_main_message") as send:
+                    RequestReport().period_report(
+                        cp, channel_properties, "weekly", datetime.date(2022, 5, 9), datetime.date(2022, 5, 15)
+                    )
+        apply_pending_deltas.assert_called_once()
+        blocks = send.call_args.args[2]
+        assert send.call_args.args[1] == cp.slack_channel_name
+        assert len(blocks) == 4
+        assert blocks[3]["text"]["text"].startswith("*All types:*")
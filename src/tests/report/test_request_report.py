@@ -4,7 +4,6 @@ from unittest.mock import patch
 
 import pytz
 
-from src.code.const import DAILY_REPORT_TEMPLATE
 from src.code.const import SLACK_DATETIME_FMT
 from src.code.model.control_panel import ControlPanel
 from src.code.model.request import Request
@@ -58,15 +57,18 @@ class TestChannelReport:
             },
         ]
         with patch("datetime.datetime", new=datetime_mock):
-            for data in testing_data:
+            for version, data in enumerate(testing_data):
                 cp: ControlPanel = cp_daily_report(data)
-                with patch.object(ControlPanel, "get_all_active_control_panels", return_value=[cp]):
-                    with patch.object(Request, "get_last_working_day_records_sorted_by_date", return_value=[]):
-                        with patch.object(SlackWebclient, "send_post_message_as_main_message", return_value=None):
-                            with patch.object(
-                                ControlPanel, "update_last_report_datetime_utc_field", return_value=None
-                            ) as mock:
-                                RequestReport().daily_report()
+                with patch.object(ControlPanel, "get_daily_report_version", return_value=(1, version)), patch.object(
+                    ControlPanel, "get_all_active_control_panels", return_value=[cp]
+                ), patch.object(ControlPanel, "get_active_control_panel_details", return_value=cp):
+                    with patch.object(Request, "get_last_working_day_status_counts", return_value={}):
+                        with patch.object(Request, "stream_last_working_day_open_items", return_value=iter([])):
+                            with patch.object(SlackWebclient, "send_post_message_as_main_message", return_value=None):
+                                with patch.object(
+                                    ControlPanel, "update_last_report_datetime_utc_field", return_value=None
+                                ) as mock:
+                                    RequestReport().daily_report()
                     assert data["count_of_reports_created"] == mock.call_count
 
     def test_generate_report_check_results_sending_post_to_specific_channel(self, cp_daily_report):
@@ -85,7 +87,9 @@ class TestChannelReport:
         cp_1: ControlPanel = cp_daily_report(data_1)
         cp_2: ControlPanel = cp_daily_report(data_2)
         for cp in ((cp_1, 1, "#cloud"), (cp_2, 1, "channel1")):
-            with patch.object(Request, "get_last_working_day_records_sorted_by_date", return_value=[]):
+            with patch.object(Request, "get_last_working_day_status_counts", return_value={}), patch.object(
+                Request, "stream_last_working_day_open_items", return_value=iter([])
+            ):
                 with patch.object(SlackWebclient, "send_post_message_as_main_message", return_value=None) as mock:
                     with patch.object(ControlPanel, "update_last_report_datetime_utc_field", return_value=None):
                         channel_properties: ChannelProperties = channel_properties_schema.load(cp[0].channel_properties)
@@ -121,25 +125,31 @@ class TestChannelReport:
         }
         cp: ControlPanel = cp_daily_report(data)
         channel_properties: ChannelProperties = channel_properties_schema.load(cp.channel_properties)
-        report = RequestReport()._create_daily_report(
-            cp.slack_channel_name, channel_properties, utc_now, last_day_records
+        report = list(
+            RequestReport()._create_daily_report(
+                cp.slack_channel_name, channel_properties, utc_now, 0, len(last_day_records), iter(last_day_records)
+            )
         )
 
         last_working_date = datetime_to_date_string(
             get_last_business_day_holidays_not_included(utc_now - datetime.timedelta(days=1))
         )
-        expected_report = DAILY_REPORT_TEMPLATE.replace("$channel_name_placeholder", cp.slack_channel_name)
-        expected_report = expected_report.replace("$last_day_date_placeholder", last_working_date)
-        expected_report = expected_report.replace("$last_day_completed_count_placeholder", "0")
-        expected_report = expected_report.replace("$last_day_open_count_placeholder", "2")
-        expected_report = expected_report.replace(
-            "$last_day_items_placeholder",
+        items = (
             "* _"
             + utc_now.strftime(SLACK_DATETIME_FMT)
             + "_  |  <link1|request link>  |  \n* _"
             + utc_now.strftime(SLACK_DATETIME_FMT)
-            + "_  |  <link2|request link>  |  \n",
+            + "_  |  <link2|request link>  |  \n"
         )
+        expected_report = [
+            {"type": "header", "text": {"type": "plain_text", "text": cp.slack_channel_name, "emoji": True}},
+            {
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": f"*Last Day {last_working_date}*\n *0* completed | *2* open"},
+            },
+            {"type": "divider"},
+            {"type": "section", "text": {"type": "mrkdwn", "text": "*Last day open items:*\n " + items}},
+        ]
         assert len(report) == 1
         assert expected_report == report[0]
 
@@ -155,7 +165,9 @@ class TestChannelReport:
         }
         cp: ControlPanel = cp_daily_report(data)
         last_day_records = x_random_records_for_testing(25, utc_now)
-        result = RequestReport()._create_daily_report(
-            cp.slack_channel_name, channel_properties, utc_now, list(last_day_records)
+        result = list(
+            RequestReport()._create_daily_report(
+                cp.slack_channel_name, channel_properties, utc_now, 0, 25, last_day_records
+            )
         )
         assert len(result) == 2
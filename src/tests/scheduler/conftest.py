@@ -2,11 +2,13 @@ import json
 import os
 from typing import List
 from unittest.mock import Mock
+from unittest.mock import patch
 
 import pytest
 from slack.web.slack_response import SlackResponse
 
 from src.code.const import create_app
+from src.code.model.request import ThreadMessage
 from src.code.scheduler.manager import SchedulerManager
 
 app = create_app("src.tests.config.Config")
@@ -35,6 +37,13 @@ class SchedulerManagerMock(SchedulerManager):
         self.scheduler: MockedScheduler = MockedScheduler()
 
 
+@pytest.fixture(autouse=True)
+def no_stored_replies():
+    # scheduler tests run without a database, replies are resolved from the mocked Slack responses
+    with patch.object(ThreadMessage, "get_latest_replies", return_value={}) as patched:
+        yield patched
+
+
 @pytest.fixture()
 def mocked_scheduler_obj() -> SchedulerManagerMock:
     return SchedulerManagerMock()
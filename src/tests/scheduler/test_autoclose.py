@@ -1,13 +1,19 @@
 import datetime
+from unittest.mock import Mock
 from unittest.mock import patch
 
 from slack import WebClient
+from slack.errors import SlackApiError
 from slack.web.slack_response import SlackResponse
 
+from src.code.model.autoclose_scan import AutocloseCursor
+from src.code.model.autoclose_scan import AutocloseThread
 from src.code.model.control_panel import ControlPanel
 from src.code.model.custom_enums import AutocloseStatus
 from src.code.model.request import Request
 from src.code.scheduler.autoclose import Autoclose
+from src.code.utils.metrics import Metrics
+from src.code.utils.slack_utils import SlackUtils
 from src.code.utils.slack_webclient import SlackWebclient
 
 
@@ -99,3 +105,199 @@ class TestAutoclose:
         assert datetime.datetime.fromtimestamp(idle_thread_properties["close_before"])
         assert datetime.datetime.fromtimestamp(idle_thread_properties["reminder_grace_period"])
         assert datetime.datetime.fromtimestamp(idle_thread_properties["close_grace_period"])
+
+    def test_close_idle_threads_failing_channel_does_not_stop_other_channels(self, web_client, cp):
+        other_cp = ControlPanel(
+            slack_channel_id="other_channel_id",
+            slack_channel_name="other_channel",
+            channel_properties=cp.channel_properties,
+        )
+        scanned = []
+
+        def analyse_channel(current_time, client, entry, deadline):
+            scanned.append(entry.slack_channel_id)
+            if entry is cp:
+                raise SlackApiError("channel_not_found", {})
+            return 0
+
+        with patch.object(ControlPanel, "get_all_active_control_panels", return_value=[cp, other_cp]):
+            with patch.object(Autoclose, "_analyse_channel", side_effect=analyse_channel):
+                Autoclose.close_idle_threads(web_client)
+        assert sorted(scanned) == sorted([cp.slack_channel_id, "other_channel_id"])
+
+    def test_close_idle_threads_stops_channel_after_time_budget(self, web_client, cp, conversations_history_response):
+        history_response: SlackResponse = conversations_history_response("request_reminder_without_thread.json")
+        event_ts = (datetime.datetime.now() - datetime.timedelta(days=2)).timestamp()
+        history_response["messages"][0]["ts"] = event_ts
+        history_response["messages"][0]["thread_ts"] = event_ts
+        with patch.object(Autoclose, "channel_time_budget_seconds", -1):
+            with patch.object(ControlPanel, "get_all_active_control_panels", return_value=[cp]):
+                with patch.object(WebClient, "conversations_history", return_value=history_response):
+                    with patch.object(SlackWebclient, "send_post_message_to_thread") as patched_send:
+                        Autoclose.close_idle_threads(web_client)
+        patched_send.assert_not_called()
+
+    def test_close_idle_threads_db_mode_confirms_candidates_on_slack(
+        self, web_client, cp, conversations_history_response, reminder_message_block
+    ):
+        replies_response: SlackResponse = conversations_history_response("request_reminder_without_thread.json")
+        event_ts = "%.6f" % (datetime.datetime.now() - datetime.timedelta(days=2)).timestamp()
+        replies_response["messages"][0]["ts"] = event_ts
+        replies_response["messages"][0]["thread_ts"] = event_ts
+        with patch.object(Autoclose, "detection_mode", "db"):
+            with patch.object(ControlPanel, "get_all_active_control_panels", return_value=[cp]):
+                with patch.object(Request, "get_idle_thread_candidates", return_value=[event_ts]) as patched_candidates:
+                    with patch.object(WebClient, "conversations_history") as patched_history:
+                        with patch.object(
+                            WebClient, "conversations_replies", return_value=replies_response
+                        ) as patched_replies:
+                            with patch.object(SlackWebclient, "send_post_message_to_thread") as patched_send:
+                                with patch.object(Request, "change_autoclose_status") as patched_request:
+                                    Autoclose.close_idle_threads(web_client)
+        patched_candidates.assert_called_once()
+        patched_history.assert_not_called()
+        patched_replies.assert_called_once_with(channel=cp.slack_channel_id, ts=event_ts, limit=1)
+        patched_send.assert_called_with(web_client, cp.slack_channel_id, event_ts, reminder_message_block)
+        patched_request.assert_called_with(cp.slack_channel_id, event_ts, AutocloseStatus.REMINDER)
+
+    def test_get_messages_incrementally_fetches_only_new_messages_and_changed_threads(
+        self, web_client, conversations_history_response
+    ):
+        history_response: SlackResponse = conversations_history_response("request_reminder_without_thread.json")
+        changed_thread = {"ts": "1668000000.000100", "thread_ts": "1668000000.000100", "latest_reply": "1668600000.1"}
+        cursor = AutocloseCursor(
+            slack_channel_id="channel_id", latest_ts=1668600000.5, full_scan_datetime_utc=datetime.datetime.utcnow()
+        )
+        with patch.object(AutocloseCursor, "get_cursor", return_value=cursor):
+            with patch.object(AutocloseCursor, "save_cursor") as patched_save_cursor:
+                with patch.object(WebClient, "conversations_history", return_value=history_response) as patched_history:
+                    with patch.object(
+                        AutocloseThread, "get_stale_thread_timestamps", return_value=["1668000000.000100"]
+                    ), patch.object(Autoclose, "_get_main_message", return_value=changed_thread):
+                        with patch.object(AutocloseThread, "save_messages") as patched_save_messages:
+                            with patch.object(AutocloseThread, "remove_threads"), patch.object(
+                                AutocloseThread, "remove_older_than"
+                            ):
+                                with patch.object(AutocloseThread, "get_messages", return_value=[changed_thread]):
+                                    messages = Autoclose._get_messages_incrementally(
+                                        web_client, "channel_id", 1668000000.0
+                                    )
+        assert messages == [changed_thread]
+        assert patched_history.call_args.kwargs["oldest"] == "1668600000.5"
+        saved_messages = patched_save_messages.call_args.args[1]
+        # the channel_join message is not a thread
+        assert [message["ts"] for message in saved_messages] == ["1668674912.885259", "1668000000.000100"]
+        patched_save_cursor.assert_called_once_with("channel_id", 1668674912.885259, full_scan=False)
+
+    def test_get_main_messages_keeps_file_share_threads(self):
+        file_share_thread = {"ts": "1668000000.1", "thread_ts": "1668000000.1", "subtype": "file_share"}
+        broadcast_reply = {"ts": "1668000000.2", "thread_ts": "1668000000.1", "subtype": "thread_broadcast"}
+        channel_join = {"ts": "1668000000.3", "subtype": "channel_join"}
+        main_messages = Autoclose._get_main_messages([file_share_thread, broadcast_reply, channel_join])
+        assert main_messages == [file_share_thread]
+
+    def test_close_idle_threads_analyses_the_same_messages_in_full_and_incremental_scans(self, cp):
+        messages = [
+            {"ts": "1668000000.1", "thread_ts": "1668000000.1", "subtype": "file_share"},
+            {"ts": "1668000000.2", "thread_ts": "1668000000.1", "subtype": "thread_broadcast"},
+            {"ts": "1668000000.3", "thread_ts": "1668000000.3", "subtype": "channel_join"},
+            {"ts": "1668000000.4", "thread_ts": "1668000000.4"},
+        ]
+        channel_properties = Mock(completion_reactions=[])
+        with patch.object(SlackUtils, "message_closed", return_value=True) as patched_message_closed:
+            for message in messages:
+                Autoclose._analyse_message(Mock(), cp, message, channel_properties, {}, {})
+        analysed = [call.args[0]["ts"] for call in patched_message_closed.call_args_list]
+        assert analysed == [message["ts"] for message in Autoclose._get_main_messages(messages)]
+
+    def test_get_messages_incrementally_runs_full_scan_without_cursor(self, web_client, conversations_history_response):
+        history_response: SlackResponse = conversations_history_response("request_reminder_without_thread.json")
+        with patch.object(AutocloseCursor, "get_cursor", return_value=None):
+            with patch.object(AutocloseCursor, "save_cursor") as patched_save_cursor:
+                with patch.object(WebClient, "conversations_history", return_value=history_response) as patched_history:
+                    with patch.object(AutocloseThread, "save_messages") as patched_save_messages:
+                        messages = Autoclose._get_messages_incrementally(web_client, "channel_id", 1668000000.0)
+        assert messages == history_response["messages"]
+        assert patched_history.call_args.kwargs["oldest"] == "1668000000.0"
+        assert patched_save_messages.call_args.kwargs == {"replace": True}
+        patched_save_cursor.assert_called_once_with("channel_id", 1668674912.885259, full_scan=True)
+
+    def test_close_idle_threads_uses_stored_latest_reply(
+        self, web_client, cp, conversations_history_response, reminder_message_block, no_stored_replies
+    ):
+        history_response: SlackResponse = conversations_history_response("request_reminder_with_thread.json")
+        current_time = datetime.datetime.now()
+        event_ts = "%.6f" % (current_time - datetime.timedelta(days=2)).timestamp()
+        latest_reply_ts = "%.6f" % (current_time - datetime.timedelta(hours=14)).timestamp()
+        history_response["messages"][0]["ts"] = event_ts
+        history_response["messages"][0]["thread_ts"] = event_ts
+        history_response["messages"][0]["latest_reply"] = latest_reply_ts
+        no_stored_replies.return_value = {
+            event_ts: {"ts": latest_reply_ts, "user": "U1", "blocks": [{"type": "rich_text", "elements": []}]}
+        }
+        with patch.object(ControlPanel, "get_all_active_control_panels", return_value=[cp]):
+            with patch.object(WebClient, "conversations_history", return_value=history_response):
+                with patch.object(WebClient, "conversations_replies") as patched_replies:
+                    with patch.object(SlackWebclient, "send_post_message_to_thread") as patched_send:
+                        with patch.object(Request, "change_autoclose_status"):
+                            with patch.object(Metrics, "inc") as patched_inc:
+                                Autoclose.close_idle_threads(web_client)
+        patched_replies.assert_not_called()
+        patched_send.assert_called_with(web_client, cp.slack_channel_id, event_ts, reminder_message_block)
+        patched_inc.assert_called_once_with("autoclose_slack_api_calls_saved_total", 1)
+
+    def test_get_all_messages_from_channel_stops_paging_after_deadline(self, web_client):
+        page = Mock(data={"messages": [{"ts": "1668674912.885259"}], "has_more": True})
+        page.data["response_metadata"] = {"next_cursor": "cursor"}
+        with patch.object(WebClient, "conversations_history", return_value=page) as patched_history:
+            messages = Autoclose._get_all_messages_from_channel(web_client, "channel_id", 1668000000.0, deadline=0.0)
+        patched_history.assert_called_once()
+        assert messages == [{"ts": "1668674912.885259"}]
+
+    def test_get_candidate_messages_from_db_stops_confirming_after_deadline(self, web_client):
+        with patch.object(Request, "get_idle_thread_candidates", return_value=["1668000000.000100"]):
+            with patch.object(Autoclose, "_get_main_message") as patched_main_message:
+                messages = Autoclose._get_candidate_messages_from_db(
+                    web_client,
+                    "channel_id",
+                    {"time_filter": 0.0, "close_before": 0.0, "reminder_grace_period": 0.0, "close_grace_period": 0.0},
+                    deadline=0.0,
+                )
+        patched_main_message.assert_not_called()
+        assert messages == []
+
+    def test_get_messages_incrementally_keeps_cursor_and_stale_threads_after_deadline(
+        self, web_client, conversations_history_response
+    ):
+        history_response: SlackResponse = conversations_history_response("request_reminder_without_thread.json")
+        cursor = AutocloseCursor(
+            slack_channel_id="channel_id", latest_ts=1668600000.5, full_scan_datetime_utc=datetime.datetime.utcnow()
+        )
+        with patch.object(AutocloseCursor, "get_cursor", return_value=cursor):
+            with patch.object(AutocloseCursor, "save_cursor") as patched_save_cursor:
+                with patch.object(WebClient, "conversations_history", return_value=history_response):
+                    with patch.object(
+                        AutocloseThread, "get_stale_thread_timestamps", return_value=["1668000000.000100"]
+                    ), patch.object(Autoclose, "_get_main_message") as patched_main_message:
+                        with patch.object(AutocloseThread, "save_messages"), patch.object(
+                            AutocloseThread, "remove_threads"
+                        ) as patched_remove_threads, patch.object(AutocloseThread, "remove_older_than"):
+                            with patch.object(AutocloseThread, "get_messages", return_value=[]):
+                                Autoclose._get_messages_incrementally(
+                                    web_client, "channel_id", 1668000000.0, deadline=0.0
+                                )
+        patched_main_message.assert_not_called()
+        patched_remove_threads.assert_called_once_with("channel_id", [])
+        patched_save_cursor.assert_not_called()
+
+    def test_get_messages_incrementally_does_not_replace_threads_after_cut_short_full_scan(
+        self, web_client, conversations_history_response
+    ):
+        history_response: SlackResponse = conversations_history_response("request_reminder_without_thread.json")
+        with patch.object(AutocloseCursor, "get_cursor", return_value=None):
+            with patch.object(AutocloseCursor, "save_cursor") as patched_save_cursor:
+                with patch.object(WebClient, "conversations_history", return_value=history_response):
+                    with patch.object(AutocloseThread, "save_messages") as patched_save_messages:
+                        Autoclose._get_messages_incrementally(web_client, "channel_id", 1668000000.0, deadline=0.0)
+        assert patched_save_messages.call_args.kwargs == {}
+        patched_save_cursor.assert_not_called()
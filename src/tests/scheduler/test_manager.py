@@ -3,6 +3,7 @@ from unittest.mock import patch
 
 from src.code.const import client
 from src.code.model.distributed_lock import DistributedLockHandler
+from src.code.report.daily_report_schedule import DailyReportSchedule
 from src.code.scheduler.autoclose import Autoclose
 from src.code.utils.slack_webclient import SlackWebclient
 from src.tests.scheduler.conftest import SchedulerManagerMock
@@ -26,6 +27,12 @@ class TestSchedulerManager:
             manager_mocked_obj.scheduler.add_job.assert_called()
             _add_channel_message_jobs_method.assert_called()
 
+    def test_recreate_jobs_resets_daily_report_schedule(self, manager_mocked_obj: SchedulerManagerMock):
+        with patch.object(SchedulerManagerMock, "_add_jobs", return_value=None):
+            with patch.object(DailyReportSchedule, "reset") as reset:
+                manager_mocked_obj._recreate_jobs_in_scheduler()
+                reset.assert_called_once()
+
     def test_remove_jobs(self, manager_mocked_obj: SchedulerManagerMock):
         manager_mocked_obj._remove_jobs()
         manager_mocked_obj.scheduler.remove_all_jobs.assert_called()
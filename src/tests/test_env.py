@@ -3,3 +3,4 @@ import os
 os.environ["SLACK_WORKSPACE_NAME"] = "SLACK_WORKSPACE_NAME"
 os.environ["SLACK_TOKEN"] = "SLACK_TOKEN"
 os.environ["SERVICE_NAME"] = "foo"
+os.environ["SLACK_RATE_LIMITER_ENABLED"] = "false"
@@ -0,0 +1,27 @@
+from unittest.mock import patch
+
+from slack.web.base_client import BaseClient
+from sqlalchemy import create_engine
+from sqlalchemy import text
+
+from src.code.utils.call_counter import DB_QUERIES
+from src.code.utils.call_counter import SLACK_API_CALLS
+from src.code.utils.call_counter import CallCounter
+from src.code.utils.call_counter import CountingWebClient
+
+
+class TestCallCounter:
+    def test_db_queries_counted(self):
+        engine = create_engine("sqlite://")
+        before = CallCounter.get(DB_QUERIES)
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        assert CallCounter.get(DB_QUERIES) - before == 2
+
+    def test_slack_api_calls_counted(self):
+        before = CallCounter.get(SLACK_API_CALLS)
+        with patch.object(BaseClient, "api_call", return_value={"ok": True}) as api_call:
+            CountingWebClient(token="token").auth_test()
+        api_call.assert_called_once()
+        assert CallCounter.get(SLACK_API_CALLS) - before == 1
@@ -0,0 +1,42 @@
+import json
+import os
+from unittest.mock import patch
+
+from src.code.model.custom_enums import MessageGroup
+from src.code.model.custom_enums import MessageType
+from src.code.model.request import Request
+from src.code.utils.classified_event import ClassifiedEvent
+
+
+class TestClassifiedEvent:
+    def test_edit_results_request_resolved_once_for_classification_and_handlers(self, slack_event_types_folder):
+        record = Request()
+        with open(os.path.join(slack_event_types_folder, "03_editing_main_request.json")) as file:
+            event = json.load(file)
+        with patch.object(Request, "get_request", return_value=record) as get_request:
+            with patch.object(Request, "request_exists") as request_exists:
+                classified = ClassifiedEvent(event)
+                assert classified.request is record
+                assert classified.request is record
+        get_request.assert_called_once_with(event["channel"], event["message"]["ts"])
+        request_exists.assert_not_called()
+        assert classified.event_type == MessageType.MAIN_EDIT
+        assert classified.event_group == MessageGroup.EDIT.value
+        assert (classified.channel_id, classified.main_ts) == (event["channel"], event["message"]["ts"])
+        assert classified.is_main_message
+
+    def test_edit_results_thread_edit_given_request_not_found(self, slack_event_types_folder):
+        with open(os.path.join(slack_event_types_folder, "07_editing_thread.json")) as file:
+            with patch.object(Request, "get_request", return_value=None):
+                classified = ClassifiedEvent(json.load(file))
+        assert classified.event_type == MessageType.THREAD_EDIT
+        assert not classified.is_main_message
+
+    def test_reaction_results_main_ts_of_reacted_message_without_lookup(self, slack_event_types_folder):
+        with open(os.path.join(slack_event_types_folder, "04_adding_reaction_to_main.json")) as file:
+            event = json.load(file)
+        with patch.object(Request, "get_request") as get_request:
+            classified = ClassifiedEvent(event)
+        get_request.assert_not_called()
+        assert classified.event_type == MessageType.REACTION_ADD
+        assert (classified.channel_id, classified.main_ts) == (event["item"]["channel"], event["item"]["ts"])
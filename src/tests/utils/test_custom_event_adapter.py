@@ -1,8 +1,10 @@
+from unittest.mock import PropertyMock
 from unittest.mock import patch
 
 from src.code.model.control_panel import ControlPanel
 from src.code.model.custom_enums import MessageType
 from src.code.model.schemas import ChannelProperties
+from src.code.utils.classified_event import ClassifiedEvent
 from src.code.utils.custom_event_adapter import CustomEventAdapter
 from src.code.utils.slack_event_type import SlackEventType
 from src.code.utils.slack_main_request import SlackMainRequest
@@ -29,9 +31,12 @@ class TestCustomEventAdapter:
             with patch.object(SlackUtils, "get_user", return_value="USLACKBOT"):
                 with patch.object(SlackWebclient, "get_bot_id", return_value=USER_1):
                     with patch.object(SlackEventType, "get_event_type", return_value=MessageType.MAIN_REMOVE):
-                        with patch.object(SlackUtils, "remove_main_message", return_value=None) as test:
-                            CustomEventAdapter.message({}, web_client)
-                            test.assert_called()
+                        with patch.object(SlackUtils, "get_channel_id", return_value="channel"):
+                            with patch.object(SlackUtils, "get_main_ts", return_value="ts"):
+                                with patch.object(ClassifiedEvent, "request", new_callable=PropertyMock) as request:
+                                    with patch.object(SlackUtils, "remove_main_message", return_value=None) as test:
+                                        CustomEventAdapter.message({}, web_client)
+                                        test.assert_called_with({}, request.return_value)
 
     def test_message_results_not_creating_new_event_given_block_slackbot_message(self, web_client):
         with patch.object(SlackUtils, "get_event", return_value={}):
@@ -45,7 +50,9 @@ class TestCustomEventAdapter:
         with patch.object(SlackUtils, "get_event", return_value={}):
             with patch.object(SlackUtils, "get_user", return_value=USER_1):
                 with patch.object(SlackWebclient, "get_bot_id", return_value=USER_2):
-                    with patch.object(SlackUtils, "get_channel_id", return_value="channel"):
+                    with patch.object(SlackUtils, "get_channel_id", return_value="channel"), patch.object(
+                        SlackUtils, "get_main_ts", return_value="ts"
+                    ):
                         with patch.object(
                             ControlPanel, "get_channel_properties_by_channel_id", return_value=ChannelProperties()
                         ):
@@ -61,7 +68,9 @@ class TestCustomEventAdapter:
         with patch.object(SlackUtils, "get_event", return_value={}):
             with patch.object(SlackUtils, "get_user", return_value=USER_1):
                 with patch.object(SlackWebclient, "get_bot_id", return_value=USER_2):
-                    with patch.object(SlackUtils, "get_channel_id", return_value="channel"):
+                    with patch.object(SlackUtils, "get_channel_id", return_value="channel"), patch.object(
+                        SlackUtils, "get_main_ts", return_value="ts"
+                    ):
                         with patch.object(
                             ControlPanel, "get_channel_properties_by_channel_id", return_value=ChannelProperties()
                         ):
@@ -85,7 +94,11 @@ class TestCustomEventAdapter:
         with patch.object(SlackUtils, "get_event", return_value={}):
             with patch.object(SlackUtils, "get_user", return_value=USER_1):
                 with patch.object(SlackWebclient, "get_bot_id", return_value=USER_2):
-                    with patch.object(SlackUtils, "get_channel_id", return_value="channel"):
+                    with patch.object(
+                        SlackEventType, "get_event_type", return_value=MessageType.REACTION_ADD
+                    ), patch.object(SlackUtils, "get_channel_id", return_value="channel"), patch.object(
+                        SlackUtils, "get_main_ts", return_value="ts"
+                    ):
                         with patch.object(
                             ControlPanel, "get_channel_properties_by_channel_id", return_value=ChannelProperties()
                         ):
@@ -118,7 +131,11 @@ class TestCustomEventAdapter:
         with patch.object(SlackUtils, "get_event", return_value={}):
             with patch.object(SlackUtils, "get_user", return_value=USER_1):
                 with patch.object(SlackWebclient, "get_bot_id", return_value=USER_2):
-                    with patch.object(SlackUtils, "get_channel_id", return_value="channel"):
+                    with patch.object(
+                        SlackEventType, "get_event_type", return_value=MessageType.REACTION_REMOVE
+                    ), patch.object(SlackUtils, "get_channel_id", return_value="channel"), patch.object(
+                        SlackUtils, "get_main_ts", return_value="ts"
+                    ):
                         with patch.object(
                             ControlPanel, "get_channel_properties_by_channel_id", return_value=ChannelProperties()
                         ):
@@ -0,0 +1,46 @@
+import os
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy import exc
+
+from src.code.utils.db_pool import DbPoolMetrics
+from src.code.utils.db_pool import InstrumentedQueuePool
+from src.code.utils.db_pool import get_engine_options
+
+
+class TestDbPool:
+    def test_get_engine_options_results_defaults(self):
+        with patch.dict(os.environ, {}, clear=True):
+            options = get_engine_options()
+        assert options == {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": 10,
+            "max_overflow": 20,
+            "pool_timeout": 30.0,
+            "pool_recycle": 3600,
+            "pool_pre_ping": True,
+        }
+
+    def test_get_engine_options_results_overflow_sized_from_greenlets(self):
+        env = {"DB_POOL_SIZE_FROM_GREENLETS": "true", "GEVENT_GREENLETS": "128", "DB_POOL_SIZE": "16"}
+        with patch.dict(os.environ, env, clear=True):
+            options = get_engine_options()
+        assert options["pool_size"] + options["max_overflow"] == 128
+
+    def test_instrumented_pool_results_checkouts_and_timeouts_recorded(self):
+        engine = create_engine(
+            "sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01
+        )
+        connection = engine.connect()
+        assert DbPoolMetrics.stats(engine.pool)["utilisation"] == 1.0
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        connection.close()
+
+        stats = DbPoolMetrics.stats(engine.pool)
+        assert stats["checkouts"] == 1
+        assert stats["checkout_timeouts"] == 1
+        assert stats["checkout_wait_seconds_max"] >= 0.01
+        assert stats["checked_out"] == 0
@@ -0,0 +1,108 @@
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+
+from src.code.model.queued_event import QueuedEvent
+from src.code.utils.custom_event_adapter import CustomEventAdapter
+from src.code.utils.event_deduplicator import EventDeduplicator
+from src.code.utils.event_dispatcher import EventDispatcher
+from src.code.utils.event_dispatcher import EventQueueWorkerPool
+from src.code.utils.metrics import Metrics
+
+
+class TestEventDispatcher:
+    def test_dispatch_results_handler_called_given_sync_mode(self, web_client):
+        handler = Mock()
+        with patch.object(EventDispatcher, "queue_mode", False):
+            with patch.dict(EventDispatcher.handlers, {"message": handler}):
+                with patch.object(QueuedEvent, "enqueue") as enqueue:
+                    EventDispatcher.dispatch("message", {"event": {}}, web_client)
+                    handler.assert_called_once_with({"event": {}}, web_client)
+                    enqueue.assert_not_called()
+
+    def test_dispatch_results_event_enqueued_given_queue_mode(self, web_client):
+        with patch.object(EventDispatcher, "queue_mode", True):
+            with patch.object(CustomEventAdapter, "message") as message:
+                with patch.object(QueuedEvent, "enqueue") as enqueue:
+                    EventDispatcher.dispatch("message", {"event": {}}, web_client)
+                    enqueue.assert_called_once_with("message", {"event": {}})
+                    message.assert_not_called()
+
+    def test_process_results_exception_given_unknown_event_type(self, web_client):
+        with pytest.raises(ValueError, match="No handler registered for event type app_mention"):
+            EventDispatcher.process("app_mention", {}, web_client)
+
+    def test_process_results_handler_metrics_observed(self, web_client):
+        handler = Mock(side_effect=ValueError)
+        with patch.dict(EventDispatcher.handlers, {"message": handler}):
+            with pytest.raises(ValueError):
+                EventDispatcher.process("message", {}, web_client)
+        rendered = Metrics.render()
+        assert 'slack_event_handler_seconds_count{handler="message"} 1' in rendered
+        assert 'slack_event_db_queries_count{handler="message"} 1' in rendered
+        assert 'slack_event_failures_total{handler="message"} 1' in rendered
+
+    def test_dispatch_results_handler_not_called_given_duplicate_event(self, web_client):
+        handler = Mock()
+        with patch.object(EventDispatcher, "queue_mode", False):
+            with patch.dict(EventDispatcher.handlers, {"message": handler}):
+                with patch.object(EventDeduplicator, "is_duplicate", return_value=True):
+                    EventDispatcher.dispatch("message", {"event_id": "Ev1", "event": {}}, web_client)
+                    handler.assert_not_called()
+
+    def test_dispatch_results_event_forgotten_given_handler_exception(self, web_client):
+        payload = {"event_id": "Ev1", "event": {}}
+        with patch.object(EventDispatcher, "queue_mode", False):
+            with patch.dict(EventDispatcher.handlers, {"message": Mock(side_effect=ValueError)}):
+                with patch.object(EventDeduplicator, "is_duplicate", return_value=False):
+                    with patch.object(EventDeduplicator, "forget") as forget:
+                        with patch("src.code.utils.event_dispatcher.db"):
+                            with pytest.raises(ValueError):
+                                EventDispatcher.dispatch("message", payload, web_client)
+                            forget.assert_called_once_with(payload)
+
+    def test_dispatch_results_session_rolled_back_given_deduplication_exception(self, web_client):
+        handler = Mock()
+        with patch.dict(EventDispatcher.handlers, {"message": handler}):
+            with patch.object(EventDeduplicator, "is_duplicate", side_effect=ValueError):
+                with patch("src.code.utils.event_dispatcher.db") as db:
+                    with pytest.raises(ValueError):
+                        EventDispatcher.dispatch("message", {"event_id": "Ev1", "event": {}}, web_client)
+                    db.session.rollback.assert_called_once()
+                    handler.assert_not_called()
+
+
+class TestEventQueueWorkerPool:
+    def test_process_next_results_event_completed(self, web_client):
+        queued_event = QueuedEvent(id=1, event_type="message", payload={"event": {}})
+        with patch.object(QueuedEvent, "claim_next", return_value=queued_event):
+            with patch.object(EventDispatcher, "process") as process:
+                with patch.object(QueuedEvent, "complete") as complete:
+                    assert EventQueueWorkerPool(Mock(), web_client)._process_next("worker") is True
+                    process.assert_called_once_with("message", {"event": {}}, web_client)
+                    complete.assert_called_once_with(1)
+
+    def test_process_next_results_event_failed_given_handler_exception(self, web_client):
+        queued_event = QueuedEvent(id=1, event_type="message", payload={"event": {}})
+        with patch.object(QueuedEvent, "claim_next", return_value=queued_event):
+            with patch.object(EventDispatcher, "process", side_effect=ValueError):
+                with patch("src.code.utils.event_dispatcher.db"):
+                    with patch.object(QueuedEvent, "fail") as fail:
+                        assert EventQueueWorkerPool(Mock(), web_client)._process_next("worker") is True
+                        fail.assert_called_once_with(1, EventQueueWorkerPool.max_attempts)
+
+    def test_process_next_results_stale_claims_released_once_per_interval_given_empty_queue(self, web_client):
+        pool = EventQueueWorkerPool(Mock(), web_client)
+        with patch.object(QueuedEvent, "claim_next", return_value=None):
+            with patch.object(QueuedEvent, "release_stale_claims") as release_stale_claims:
+                with patch("src.code.utils.event_dispatcher.time.monotonic", return_value=1000.0):
+                    assert pool._process_next("worker") is False
+                    assert pool._process_next("worker") is False
+                release_stale_claims.assert_called_once_with(EventQueueWorkerPool.claim_timeout)
+                with patch(
+                    "src.code.utils.event_dispatcher.time.monotonic",
+                    return_value=1000.0 + EventQueueWorkerPool.release_interval_seconds,
+                ):
+                    assert pool._process_next("worker") is False
+                assert release_stale_claims.call_count == 2
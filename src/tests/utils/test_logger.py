@@ -0,0 +1,113 @@
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from src.code.logger import JsonFormatter
+from src.code.logger import JsonQueueHandler
+from src.code.logger import NativeQueueListener
+from src.code.logger import RepeatedLogFilter
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+GEVENT_LISTENER_SCRIPT = """
+import gevent.monkey
+
+# the patches of a gevent worker the listener is concerned with
+gevent.monkey.patch_thread()
+gevent.monkey.patch_time()
+gevent.monkey.patch_queue()
+
+import logging
+import time
+
+import gevent
+
+from src.code.logger import JsonQueueHandler
+from src.code.logger import NativeQueueListener
+
+written = []
+
+
+class SlowHandler(logging.Handler):
+    def emit(self, record):
+        # a native sleep, on the hub it would hold up every greenlet
+        gevent.monkey.get_original("time", "sleep")(0.5)
+        written.append(record.getMessage())
+
+
+listener = NativeQueueListener(SlowHandler())
+listener.start()
+started = time.monotonic()
+JsonQueueHandler(listener.queue).handle(logging.makeLogRecord({"msg": "Event received"}))
+greenlet = gevent.spawn(lambda: "handled")
+greenlet.join(timeout=0.2)
+waited = time.monotonic() - started
+listener.stop()
+print(greenlet.value, waited, len(written))
+"""
+
+
+def _record(msg: str, *args, level: int = logging.INFO, exc_info=None) -> logging.LogRecord:
+    return logging.LogRecord("src.code.test", level, __file__, 1, msg, args, exc_info, func="handler")
+
+
+class TestLogger:
+    def test_json_formatter_results_valid_json_given_quotes_in_message(self):
+        line = JsonFormatter().format(_record('Reaction: "%s" is %s', 'eyes"', "in collection"))
+
+        entry = json.loads(line)
+        assert entry["message"] == 'Reaction: "eyes"" is in collection'
+        assert (entry["level"], entry["function"], entry["logger_name"]) == ("INFO", "handler", "slack-bot-app")
+
+    def test_queue_handler_results_json_line_with_exception_written_by_listener(self):
+        stream = io.StringIO()
+        stream_handler = logging.StreamHandler(stream)
+        stream_handler.setFormatter(JsonFormatter())
+        listener = NativeQueueListener(stream_handler)
+        listener.start()
+        try:
+            raise ValueError("handler failed")
+        except ValueError as e:
+            JsonQueueHandler(listener.queue).handle(
+                _record("Event %s failed", "1.2", level=logging.ERROR, exc_info=(type(e), e, None))
+            )
+        listener.stop()
+
+        entry = json.loads(stream.getvalue())
+        assert entry["message"] == "Event 1.2 failed"
+        assert entry["exception"].startswith("ValueError: handler failed")
+
+    def test_native_queue_listener_results_greenlets_not_blocked_by_slow_write(self):
+        # run in a gevent patched interpreter, as the gunicorn workers are, not to patch the test process
+        result = subprocess.run(
+            [sys.executable, "-c", GEVENT_LISTENER_SCRIPT],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+
+        assert result.returncode == 0, result.stderr
+        greenlet_value, waited, written = result.stdout.split()
+        assert greenlet_value == "handled"
+        assert float(waited) < 0.4
+        assert written == "1"
+
+    def test_repeated_log_filter_results_lines_over_limit_dropped_and_reported(self):
+        log_filter = RepeatedLogFilter()
+        with patch.object(RepeatedLogFilter, "limit", 2), patch.object(RepeatedLogFilter, "window_seconds", 60):
+            with patch("src.code.logger.time.monotonic", return_value=100.0):
+                passed = [log_filter.filter(_record("Message type is: %s", "MAIN_NEW")) for _ in range(5)]
+                assert log_filter.filter(_record("Other %s", "line"))
+                assert log_filter.filter(_record("Message type is: %s", "MAIN_NEW", level=logging.WARNING))
+            with patch("src.code.logger.time.monotonic", return_value=160.0):
+                record = _record("Message type is: %s", "MAIN_NEW")
+                assert log_filter.filter(record)
+
+        assert passed == [True, True, False, False, False]
+        assert getattr(record, "suppressed") == 3
+        assert json.loads(JsonFormatter().format(record))["suppressed"] == 3
+        assert RepeatedLogFilter.stats() == {"templates": 2, "suppressed": 3}
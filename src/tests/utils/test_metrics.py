@@ -0,0 +1,62 @@
+import json
+import os
+from unittest.mock import patch
+
+from src.code.utils.metrics import LATENCY_BUCKETS
+from src.code.utils.metrics import Metrics
+
+
+class TestMetrics:
+    def test_render_results_cumulative_histogram(self):
+        Metrics.observe("slack_event_handler_seconds", 0.02, handler="message")
+        Metrics.observe("slack_event_handler_seconds", 2, handler="message")
+
+        rendered = Metrics.render()
+
+        assert "# TYPE slack_event_handler_seconds histogram" in rendered
+        assert 'slack_event_handler_seconds_bucket{handler="message",le="0.01"} 0' in rendered
+        assert 'slack_event_handler_seconds_bucket{handler="message",le="0.025"} 1' in rendered
+        assert 'slack_event_handler_seconds_bucket{handler="message",le="2.5"} 2' in rendered
+        assert 'slack_event_handler_seconds_bucket{handler="message",le="+Inf"} 2' in rendered
+        assert 'slack_event_handler_seconds_sum{handler="message"} 2.02' in rendered
+        assert 'slack_event_handler_seconds_count{handler="message"} 2' in rendered
+
+    def test_render_results_counters_and_gauges_with_escaped_labels(self):
+        Metrics.inc("scheduler_job_failures_total", job='daily"report')
+        Metrics.set_gauge("event_queue_depth", 7)
+
+        rendered = Metrics.render()
+
+        assert 'scheduler_job_failures_total{job="daily\\"report"} 1' in rendered
+        assert "event_queue_depth 7" in rendered
+
+    def test_time_results_duration_observed_given_exception(self):
+        try:
+            with Metrics.time("scheduler_job_seconds", job="daily_report"):
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+
+        assert 'scheduler_job_seconds_count{job="daily_report"} 1' in Metrics.render()
+
+    def test_render_results_workers_aggregated_given_multiprocess_dir(self, tmp_path):
+        other_worker = [0.0] * len(LATENCY_BUCKETS) + [0.0, 0.0]
+        other_worker[-1] = 3
+        other_worker[-2] = 30
+        with open(os.path.join(tmp_path, "metrics_1.json"), "w") as file:
+            json.dump(
+                {
+                    "histograms": [["scheduler_job_seconds", [["job", "daily_report"]], other_worker]],
+                    "counters": [["scheduler_job_failures_total", [["job", "daily_report"]], 2]],
+                },
+                file,
+            )
+        with patch.object(Metrics, "multiprocess_dir", str(tmp_path)):
+            Metrics.observe("scheduler_job_seconds", 1, job="daily_report")
+            Metrics.inc("scheduler_job_failures_total", job="daily_report")
+            rendered = Metrics.render()
+
+        assert os.path.exists(os.path.join(tmp_path, f"metrics_{os.getpid()}.json"))
+        assert 'scheduler_job_seconds_count{job="daily_report"} 4' in rendered
+        assert 'scheduler_job_seconds_sum{job="daily_report"} 31' in rendered
+        assert 'scheduler_job_failures_total{job="daily_report"} 3' in rendered
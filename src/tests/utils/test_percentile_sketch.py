@@ -0,0 +1,85 @@
+import json
+import math
+import random
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import pytest
+
+from src.code.utils.percentile_sketch import PercentileSketch
+
+
+def _exact_quantile(values, quantile):
+    return sorted(values)[max(math.ceil(quantile * len(values)), 1) - 1]
+
+
+class TestPercentileSketch:
+    def test_quantile_results_value_within_relative_accuracy(self):
+        generator = random.Random(7)
+        values = [generator.lognormvariate(8, 2) for _ in range(10000)]
+        sketch = PercentileSketch()
+        for value in values:
+            sketch.add(value)
+
+        assert sketch.count == 10000
+        for quantile in (0.01, 0.5, 0.9, 0.99, 1.0):
+            assert sketch.quantile(quantile) == pytest.approx(_exact_quantile(values, quantile), rel=0.01)
+
+    def test_quantile_results_none_for_empty_and_zero_for_zero_values(self):
+        sketch = PercentileSketch()
+        assert sketch.percentile(50) is None
+        sketch.add(0.0, 3)
+        sketch.add(600.0)
+        assert sketch.percentile(50) == 0.0
+        assert sketch.percentile(100) == pytest.approx(600.0, rel=0.01)
+
+    def test_merged_results_quantiles_of_all_values(self):
+        days = [[60.0, 120.0], [3600.0], [7200.0, 14400.0]]
+        sketches: List[Optional[Dict]] = []
+        for values in days:
+            sketch = PercentileSketch()
+            for value in values:
+                sketch.add(value)
+            sketches.append(sketch.to_dict())
+
+        merged = PercentileSketch.merged(sketches + [None])
+
+        assert merged.count == 5
+        assert merged.percentile(50) == pytest.approx(3600.0, rel=0.01)
+        assert merged.percentile(100) == pytest.approx(14400.0, rel=0.01)
+
+    def test_merge_raises_value_error_for_different_accuracy(self):
+        with pytest.raises(ValueError):
+            PercentileSketch().merge(PercentileSketch(relative_accuracy=0.02))
+
+    def test_add_negative_count_results_value_removed(self):
+        sketch = PercentileSketch()
+        sketch.add(60.0)
+        sketch.add(3600.0)
+        sketch.add(3600.0, -1)
+        sketch.add(3600.0, -1)
+
+        assert sketch.count == 1
+        assert len(sketch.bins) == 1
+        assert sketch.percentile(99) == pytest.approx(60.0, rel=0.01)
+
+    def test_add_results_lowest_bins_collapsed_over_max_bins(self):
+        sketch = PercentileSketch(max_bins=10)
+        for exponent in range(20):
+            sketch.add(2.0**exponent)
+
+        assert len(sketch.bins) == 10
+        assert sketch.count == 20
+        assert sketch.percentile(100) == pytest.approx(2.0**19, rel=0.01)
+
+    def test_to_dict_results_json_round_trip(self):
+        sketch = PercentileSketch()
+        sketch.add(0.0)
+        sketch.add(90.0, 2)
+
+        restored = PercentileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+        assert restored.zero_count == 1
+        assert restored.bins == sketch.bins
+        assert restored.percentile(90) == sketch.percentile(90)
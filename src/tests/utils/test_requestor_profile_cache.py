@@ -0,0 +1,89 @@
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from slack import WebClient
+
+from src.code.dto.dto import RequestorProfileDto
+from src.code.model.requestor_profile import RequestorProfile
+from src.code.utils.requestor_profile_cache import RequestorProfileCache
+from src.code.utils.slack_webclient import SlackWebclient
+
+
+class TestRequestorProfileCache:
+    def test_get_profile_results_single_api_call(
+        self, web_client, requestor_id, user_info_response, requestor_email, requestor_team_id
+    ):
+        with patch.object(RequestorProfile, "get_fresh_profile", return_value=None):
+            with patch.object(RequestorProfile, "save_profiles", return_value=None) as save_profiles:
+                with patch.object(WebClient, "users_info", return_value=user_info_response) as users_info:
+                    first = RequestorProfileCache.get_profile(web_client, requestor_id)
+                    second = RequestorProfileCache.get_profile(web_client, requestor_id)
+                    users_info.assert_called_once()
+                    save_profiles.assert_called_once()
+        assert first == second == RequestorProfileDto(email=requestor_email, team_id=requestor_team_id)
+        assert RequestorProfileCache.stats()["avoided_api_calls"] == 1
+
+    def test_get_profile_results_profile_from_db(self, web_client, requestor_id, requestor_team_id):
+        profile = RequestorProfileDto(email="stored", team_id=requestor_team_id)
+        with patch.object(RequestorProfile, "get_fresh_profile", return_value=profile):
+            with patch.object(WebClient, "users_info") as users_info:
+                assert RequestorProfileCache.get_profile(web_client, requestor_id) == profile
+                users_info.assert_not_called()
+
+    def test_get_profile_results_unknown_profile_not_cached(self, web_client, requestor_id):
+        with patch.object(RequestorProfile, "get_fresh_profile", return_value=None):
+            with patch.object(WebClient, "users_info", return_value={}) as users_info:
+                RequestorProfileCache.get_profile(web_client, requestor_id)
+                RequestorProfileCache.get_profile(web_client, requestor_id)
+                assert users_info.call_count == 2
+
+    def test_put_results_least_recently_used_evicted(self, requestor_team_id):
+        with patch.object(RequestorProfileCache, "max_size", 2):
+            for requestor_id in ["id_1", "id_2", "id_3"]:
+                RequestorProfileCache._put(requestor_id, RequestorProfileDto(email="", team_id=requestor_team_id))
+        assert RequestorProfileCache._get_from_memory("id_1") is None
+        assert RequestorProfileCache._get_from_memory("id_3") is not None
+
+    def test_warm_up_results_all_pages_saved(self, web_client):
+        pages = [
+            Mock(
+                data={
+                    "members": [
+                        {"id": "id_1", "team_id": "team", "profile": {"email": "one@example.com"}},
+                        {"id": "bot", "team_id": "team", "profile": {}},
+                    ],
+                    "response_metadata": {"next_cursor": "cursor"},
+                }
+            ),
+            Mock(
+                data={
+                    "members": [{"id": "id_2", "team_id": "team", "profile": {"email": "two@example.com"}}],
+                    "response_metadata": {"next_cursor": ""},
+                }
+            ),
+        ]
+        with patch.object(WebClient, "users_list", side_effect=pages) as users_list:
+            with patch.object(RequestorProfile, "save_profiles", return_value=None) as save_profiles:
+                assert RequestorProfileCache.warm_up(web_client) == 2
+                assert users_list.call_count == 2
+                assert save_profiles.call_count == 2
+        assert RequestorProfileCache._get_from_memory("id_2") == RequestorProfileDto(
+            email="two@example.com", team_id="team"
+        )
+
+    def test_warm_up_results_unknown_team_id_given_member_without_team_id(self, web_client):
+        page = Mock(data={"members": [{"id": "id_1", "profile": {"email": "one@example.com"}}]})
+        with patch.object(WebClient, "users_list", return_value=page):
+            with patch.object(RequestorProfile, "save_profiles", return_value=None):
+                assert RequestorProfileCache.warm_up(web_client) == 1
+        assert RequestorProfileCache._get_from_memory("id_1") == RequestorProfileDto(
+            email="one@example.com", team_id=SlackWebclient.UNKNOWN
+        )
+
+    def test_warm_up_results_member_skipped_given_empty_email(self, web_client):
+        page = Mock(data={"members": [{"id": "id_1", "team_id": "team", "profile": {"email": ""}}]})
+        with patch.object(WebClient, "users_list", return_value=page):
+            with patch.object(RequestorProfile, "save_profiles", return_value=None) as save_profiles:
+                assert RequestorProfileCache.warm_up(web_client) == 0
+                save_profiles.assert_not_called()
+        assert RequestorProfileCache._get_from_memory("id_1") is None
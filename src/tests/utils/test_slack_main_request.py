@@ -4,9 +4,9 @@ import os
 from unittest.mock import patch
 
 from src.code.model.control_panel import ControlPanel
-from src.code.model.custom_enums import MessageType
 from src.code.model.request import Request
 from src.code.model.schemas import ChannelProperties
+from src.code.utils.classified_event import ClassifiedEvent
 from src.code.utils.slack_main_request import SlackMainRequest
 from src.code.utils.slack_webclient import SlackWebclient
 
@@ -20,7 +20,7 @@ class TestSlackMainRequest:
                 with patch.object(Request, "update_or_register_new_record", return_value=None):
                     with patch.object(SlackWebclient, "send_post_message_to_thread", return_value=None) as test:
                         SlackMainRequest().deal_with_main_message(
-                            web_client, json.load(file), MessageType.MAIN_NEW, channel_properties
+                            web_client, ClassifiedEvent(json.load(file)), channel_properties
                         )
                         test.assert_called()
 
@@ -32,7 +32,7 @@ class TestSlackMainRequest:
                         channel_properties: ChannelProperties = ChannelProperties()
                         channel_properties.features.types.enabled = False
                         SlackMainRequest().deal_with_main_message(
-                            web_client, json.load(file), MessageType.MAIN_NEW, channel_properties
+                            web_client, ClassifiedEvent(json.load(file)), channel_properties
                         )
                         test.assert_not_called()
 
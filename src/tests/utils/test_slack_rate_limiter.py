@@ -0,0 +1,105 @@
+from unittest.mock import patch
+
+import pytest
+from slack.errors import SlackApiError
+from slack.web.base_client import BaseClient
+from slack.web.slack_response import SlackResponse
+
+from src.code.utils.slack_rate_limiter import RateLimitedWebClient
+from src.code.utils.slack_rate_limiter import SlackRateLimiter
+
+
+def _slack_response(status_code: int, headers: dict) -> SlackResponse:
+    return SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/reactions.add",
+        req_args={},
+        data={"ok": False, "error": "ratelimited"},
+        headers=headers,
+        status_code=status_code,
+    )
+
+
+class TestSlackRateLimiter:
+    def test_acquire_disabled_does_not_wait(self):
+        with patch("src.code.utils.slack_rate_limiter.time.sleep") as patched_sleep:
+            for _ in range(100):
+                assert SlackRateLimiter.acquire("conversations.history") == 0.0
+        patched_sleep.assert_not_called()
+
+    def test_acquire_lets_burst_through_up_to_tier_limit(self):
+        with patch.object(SlackRateLimiter, "enabled", True):
+            with patch("src.code.utils.slack_rate_limiter.time.monotonic", return_value=100.0):
+                with patch("src.code.utils.slack_rate_limiter.time.sleep") as patched_sleep:
+                    waits = [SlackRateLimiter.acquire("conversations.history") for _ in range(52)]
+                    # other tiers have their own bucket
+                    assert SlackRateLimiter.acquire("users.info") == 0.0
+        assert waits[:50] == [0.0] * 50
+        assert waits[50:] == pytest.approx([60.0 / 50, 2 * 60.0 / 50])
+        assert [call.args[0] for call in patched_sleep.call_args_list] == pytest.approx(waits[50:])
+
+    def test_acquire_refills_bucket_over_time(self):
+        with patch.object(SlackRateLimiter, "enabled", True):
+            with patch("src.code.utils.slack_rate_limiter.time.sleep"):
+                with patch("src.code.utils.slack_rate_limiter.time.monotonic", return_value=100.0):
+                    for _ in range(50):
+                        SlackRateLimiter.acquire("reactions.add")
+                with patch("src.code.utils.slack_rate_limiter.time.monotonic", return_value=106.0):
+                    waits = [SlackRateLimiter.acquire("reactions.add") for _ in range(6)]
+        assert waits[:5] == [0.0] * 5
+        assert waits[5] == pytest.approx(60.0 / 50)
+
+    def test_retry_after_pauses_tier(self):
+        with patch.object(SlackRateLimiter, "enabled", True):
+            with patch("src.code.utils.slack_rate_limiter.time.monotonic", return_value=100.0):
+                with patch("src.code.utils.slack_rate_limiter.time.sleep"):
+                    SlackRateLimiter.retry_after("chat.postMessage", 30)
+                    assert SlackRateLimiter.acquire("chat.postMessage") == pytest.approx(30)
+                    assert SlackRateLimiter.acquire("chat.postMessage") == pytest.approx(31)
+                    assert SlackRateLimiter.acquire("conversations.replies") == 0.0
+
+    def test_acquire_results_post_message_bucket_per_channel(self):
+        with patch.object(SlackRateLimiter, "enabled", True):
+            with patch("src.code.utils.slack_rate_limiter.time.monotonic", return_value=100.0):
+                with patch("src.code.utils.slack_rate_limiter.time.sleep"):
+                    waits = [SlackRateLimiter.acquire("chat.postMessage", "C1") for _ in range(61)]
+                    # a busy channel does not hold back the posts to another one
+                    assert SlackRateLimiter.acquire("chat.postMessage", "C2") == 0.0
+                    SlackRateLimiter.retry_after("chat.postMessage", 30, "C1")
+                    assert SlackRateLimiter.acquire("chat.postMessage", "C2") == 0.0
+        assert waits[:60] == [0.0] * 60
+        assert waits[60] == pytest.approx(1.0)
+
+
+class TestRateLimitedWebClient:
+    def test_api_call_retries_after_rate_limit(self):
+        rate_limited = SlackApiError("ratelimited", _slack_response(429, {"Retry-After": "7"}))
+        with patch.object(BaseClient, "api_call", side_effect=[rate_limited, {"ok": True}]) as api_call:
+            with patch.object(SlackRateLimiter, "retry_after") as patched_retry_after:
+                assert RateLimitedWebClient(token="token").reactions_add(channel="C1", name="eyes", timestamp="1")
+        assert api_call.call_count == 2
+        patched_retry_after.assert_called_once_with("reactions.add", 7.0, "C1")
+
+    def test_api_call_results_channel_of_call_passed_to_rate_limiter(self):
+        with patch.object(BaseClient, "api_call", return_value={"ok": True}):
+            with patch.object(SlackRateLimiter, "acquire") as acquire:
+                RateLimitedWebClient(token="token").chat_postMessage(channel="C1", text="text")
+                RateLimitedWebClient(token="token").users_info(user="U1")
+        assert [call.args for call in acquire.call_args_list] == [("chat.postMessage", "C1"), ("users.info", None)]
+
+    def test_api_call_gives_up_after_max_retries(self):
+        rate_limited = SlackApiError("ratelimited", _slack_response(429, {"Retry-After": "1"}))
+        with patch.object(BaseClient, "api_call", side_effect=rate_limited) as api_call:
+            with patch.object(SlackRateLimiter, "retry_after"):
+                with patch.object(RateLimitedWebClient, "max_retries", 2):
+                    with pytest.raises(SlackApiError):
+                        RateLimitedWebClient(token="token").reactions_add(channel="C1", name="eyes", timestamp="1")
+        assert api_call.call_count == 3
+
+    def test_api_call_does_not_retry_other_errors(self):
+        error = SlackApiError("channel_not_found", _slack_response(200, {}))
+        with patch.object(BaseClient, "api_call", side_effect=error) as api_call:
+            with pytest.raises(SlackApiError):
+                RateLimitedWebClient(token="token").reactions_add(channel="C1", name="eyes", timestamp="1")
+        api_call.assert_called_once()
@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 import os
+from decimal import Decimal
 from typing import Dict
 from typing import List
 from unittest.mock import patch
 
 import pytest
 
+from src.code.analytics.form_answers_collector_utils import FormQuestionCollectorUtils
+from src.code.db import db
+from src.code.model.control_panel import ControlPanel
 from src.code.model.request import Request
+from src.code.model.schemas import Question
+from src.code.model.schemas import QuestionForm
+from src.code.utils.event_context import EventContext
 from src.code.utils.slack_reaction_utils import SlackReactionUtils
+from src.code.utils.slack_webclient import SlackWebclient
 
 CHANNEL = "#cloud-helpbot"
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -20,12 +28,16 @@ REACTION_WITH_ALL_REQUIRED_ATTRIBUTES = {
 }
 
 
+def _context(event: Dict) -> EventContext:
+    return EventContext(event["item"]["channel"], event["item"]["ts"])
+
+
 class TestSlackUtils:
     def test_is_reaction_on_main_message_results_false_given_type_is_wrong(self):
         data_list: List[Dict] = [{"type": "no_reaction_type"}]
         for data in data_list:
             with pytest.raises(AttributeError) as exc:
-                SlackReactionUtils().is_reaction_on_main_message(data)
+                SlackReactionUtils().is_reaction_on_main_message(data, EventContext("channel", "ts"))
                 assert str(exc.exception) == "Event payload has no type 'reaction_added' or 'reaction_removed'"
 
     def test_reaction_is_out_of_desired_collection_results_false_main_message_not_exists(self):
@@ -35,7 +47,7 @@ class TestSlackUtils:
                 "reaction": "sos",
                 "item": {"type": "message", "channel": "BOGUS_CHANNEL_ID", "ts": "1650605980.394309"},
             }
-            assert not SlackReactionUtils().is_reaction_on_main_message(event)
+            assert not SlackReactionUtils().is_reaction_on_main_message(event, _context(event))
 
     def test_reaction_is_out_of_desired_collection_results_true_main_message_exists(self):
         with patch.object(Request, "get_request", return_value=Request()):
@@ -44,7 +56,7 @@ class TestSlackUtils:
                 "reaction": "sos",
                 "item": {"type": "message", "channel": "BOGUS_CHANNEL_ID", "ts": "1650605980.394309"},
             }
-            assert SlackReactionUtils().is_reaction_on_main_message(event)
+            assert SlackReactionUtils().is_reaction_on_main_message(event, _context(event))
 
     def test_add_start_work_reaction_to_request_results_reaction_added_and_status_changed(self, channel_properties):
         event: Dict = {
@@ -52,12 +64,15 @@ class TestSlackUtils:
             "reaction": "eyes",
             "user": "1",
             "item": {"type": "message", "channel": "BOGUS_CHANNEL_ID", "ts": "1650605980.394309"},
+            "event_ts": "1650606980.000100",
         }
         origin_request_user: str = "2"
-        with patch.object(Request, "get_request", return_value=Request(requestor_id=origin_request_user)):
+        record = Request(requestor_id=origin_request_user)
+        with patch.object(Request, "get_request", return_value=record):
             with patch.object(Request, "start_work") as start_work:
-                SlackReactionUtils().add_start_work_reaction_to_request(event, channel_properties)
-                start_work.assert_called_once()
+                SlackReactionUtils().add_start_work_reaction_to_request(event, channel_properties, _context(event))
+                # work starts when the reaction is added, not when the request was posted
+                start_work.assert_called_once_with(record=record, event_ts="1650606980.000100", commit=False)
 
     def test_add_start_work_reaction_to_request_results_reaction_hasnt_added_given_origin_user_cannot_start_work(
         self, channel_properties
@@ -71,7 +86,7 @@ class TestSlackUtils:
         }
         with patch.object(Request, "get_request", return_value=Request(requestor_id=origin_request_user)):
             with patch.object(Request, "start_work") as start_work:
-                SlackReactionUtils().add_start_work_reaction_to_request(event, channel_properties)
+                SlackReactionUtils().add_start_work_reaction_to_request(event, channel_properties, _context(event))
                 start_work.assert_not_called()
 
     def test_reaction_is_out_of_desired_collection_results_true_given_emoji_in_desired_collection(
@@ -97,14 +112,13 @@ class TestSlackUtils:
             "event_ts": event_ts,
             "item": {"channel": channel_id, "ts": event_ts},
         }
-        with patch.object(Request, "close_request", return_value=None) as test:
-            SlackReactionUtils.complete_request(event, channel_properties.completion_reactions)
-            test.assert_called_with(
-                channel_id=channel_id,
-                request_ts=event_ts,
-                reaction_ts=event_ts,
-                reaction=channel_properties.completion_reactions[0],
-            )
+        record = Request()
+        with patch.object(Request, "get_request", return_value=record):
+            with patch.object(Request, "close_record", return_value=None) as test:
+                SlackReactionUtils.complete_request(event, channel_properties.completion_reactions, _context(event))
+                test.assert_called_with(
+                    record=record, reaction_ts=event_ts, reaction=channel_properties.completion_reactions[0]
+                )
 
     def test_add_reaction_to_request_types(self, channel_properties, channel_id, event_ts):
         reaction: str = list(channel_properties.types.emojis.keys())[0]
@@ -114,9 +128,43 @@ class TestSlackUtils:
             "event_ts": event_ts,
             "item": {"channel": channel_id, "ts": event_ts},
         }
-        with patch.object(Request, "add_reaction_to_request_types", return_value=None) as test:
-            SlackReactionUtils.add_reaction_to_request_types(event, channel_properties)
-            test.assert_called_with(channel_id=channel_id, request_ts=event_ts, reaction=reaction)
+        record = Request()
+        with patch.object(Request, "get_request", return_value=record):
+            with patch.object(Request, "add_reaction_to_record_types", return_value=None) as test:
+                with patch.object(SlackReactionUtils, "_is_reaction_question_form_trigger", return_value=False):
+                    SlackReactionUtils.add_reaction_to_request_types(event, channel_properties, _context(event))
+                test.assert_called_with(record=record, reaction=reaction)
+
+    def test_add_reaction_to_request_types_results_question_form_posted_to_thread_ts_of_event(
+        self, channel_properties, channel_id, channel_name, event_ts
+    ):
+        reaction: str = list(channel_properties.types.emojis.keys())[0]
+        event: Dict = {
+            "type": "reaction_added",
+            "reaction": reaction,
+            "event_ts": event_ts,
+            "item": {"channel": channel_id, "ts": event_ts},
+        }
+        channel_properties.features.question_form.enabled = True
+        channel_properties.question_forms = QuestionForm(triggers=[reaction], questions=[Question("question1")])
+        # the stored event_ts is a Decimal, which the Slack client cannot serialize
+        record = Request(event_ts=Decimal(event_ts))
+        with patch.object(Request, "get_request", return_value=record), patch.object(db.session, "commit"):
+            with patch.object(Request, "add_reaction_to_record_types"), patch.object(
+                Request, "get_form_answers", return_value=None
+            ):
+                with patch.object(ControlPanel, "get_channel_name", return_value=channel_name), patch.object(
+                    ControlPanel, "get_channel_id_by_channel_name", return_value=channel_id
+                ), patch.object(ControlPanel, "get_channel_properties_by_channel_id", return_value=channel_properties):
+                    with patch.object(FormQuestionCollectorUtils, "get_multi_select_form", return_value=[]):
+                        with patch.object(FormQuestionCollectorUtils, "init_form_answers"):
+                            with patch.object(SlackWebclient, "send_post_message_to_thread") as send:
+                                SlackReactionUtils.add_reaction_to_request_types(
+                                    event, channel_properties, _context(event)
+                                )
+        send.assert_called_once()
+        assert send.call_args.args[2] == event_ts
+        assert isinstance(send.call_args.args[2], str)
 
     def test_remove_completion_reaction(self, channel_properties, channel_id, event_ts):
         reaction: str = channel_properties.completion_reactions[0]
@@ -126,9 +174,13 @@ class TestSlackUtils:
             "event_ts": event_ts,
             "item": {"channel": channel_id, "ts": event_ts},
         }
-        with patch.object(Request, "remove_completion_reaction", return_value=None) as test:
-            SlackReactionUtils.remove_completion_reaction(event, channel_properties.completion_reactions)
-            test.assert_called_with(channel_id=channel_id, request_ts=event_ts, reaction=reaction)
+        record = Request()
+        with patch.object(Request, "get_request", return_value=record):
+            with patch.object(Request, "remove_completion_reaction_from_record", return_value=None) as test:
+                SlackReactionUtils.remove_completion_reaction(
+                    event, channel_properties.completion_reactions, _context(event)
+                )
+                test.assert_called_with(record=record, reaction=reaction)
 
     def test_remove_reaction_from_request_types(self, channel_properties, channel_id, event_ts):
         reaction: str = list(channel_properties.types.emojis.keys())[0]
@@ -138,9 +190,11 @@ class TestSlackUtils:
             "event_ts": event_ts,
             "item": {"channel": channel_id, "ts": event_ts},
         }
-        with patch.object(Request, "remove_reaction_from_request_types", return_value=None) as test:
-            SlackReactionUtils.remove_reaction_from_request_types(event, channel_properties)
-            test.assert_called_with(channel_id=channel_id, request_ts=event_ts, reaction=reaction)
+        record = Request()
+        with patch.object(Request, "get_request", return_value=record):
+            with patch.object(Request, "remove_reaction_from_record_types", return_value=None) as test:
+                SlackReactionUtils.remove_reaction_from_request_types(event, channel_properties, _context(event))
+                test.assert_called_with(record=record, reaction=reaction)
 
     def test_reaction_json_attribute_is_none_results_true_given_attribute_is_missing(self):
         data_list: List[Dict] = [
@@ -167,12 +221,8 @@ class TestSlackUtils:
         event_list = [{"reaction": key} for key in channel_properties.types.emojis.keys()]
 
         for event in event_list:
-            assert event.get("reaction") == SlackReactionUtils()._get_cloud_reaction(
-                event, channel_properties.types.emojis
-            )
+            assert event.get("reaction") == SlackReactionUtils()._get_cloud_reaction(event, channel_properties)
 
         # reaction changed to cloud emoji alias value -> key
         for key, value in channel_properties.types.emojis.items():
-            assert key == SlackReactionUtils()._get_cloud_reaction(
-                {"reaction": value["alias"]}, channel_properties.types.emojis
-            )
+            assert key == SlackReactionUtils()._get_cloud_reaction({"reaction": value["alias"]}, channel_properties)
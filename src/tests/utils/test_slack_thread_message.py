@@ -5,9 +5,9 @@ from unittest.mock import patch
 
 import pytest
 
-from src.code.model.custom_enums import MessageType
 from src.code.model.request import Request
 from src.code.model.request import ThreadMessage
+from src.code.utils.classified_event import ClassifiedEvent
 from src.code.utils.slack_thread_message import SlackThreadMessage
 from src.code.utils.slack_utils import SlackUtils
 
@@ -18,33 +18,53 @@ class TestSlackThreadMessage:
     def test_deal_with_new_thread_message_result_saving_data_wo_errors_given_edit_thread(
         self, slack_event_types_folder, channel_id, blocks, event_ts, author
     ):
-        with open(os.path.join(slack_event_types_folder, "06_adding_new_thread.json")) as file:
-            with patch.object(SlackUtils, "get_channel_id", return_value=channel_id):
-                with patch.object(SlackUtils, "get_data_from_event", return_value=(blocks, None, event_ts, author)):
-                    with patch.object(ThreadMessage, "update_reply", return_value=event_ts) as test1:
-                        with patch.object(ThreadMessage, "add_reply", return_value=None) as test2:
-                            with patch.object(Request, "start_work", return_value=None) as test3:
-                                SlackThreadMessage().deal_with_thread_message(json.load(file), MessageType.THREAD_EDIT)
-                                test1.assert_called()
-                                test2.assert_not_called()
-                                test3.assert_not_called()
+        with open(os.path.join(slack_event_types_folder, "07_editing_thread.json")) as file:
+            with patch.object(Request, "get_request", return_value=None):
+                classified = ClassifiedEvent(json.load(file))
+            with patch.object(SlackUtils, "get_data_from_event", return_value=(blocks, None, event_ts, author)):
+                with patch.object(ThreadMessage, "update_reply", return_value=event_ts) as test1:
+                    with patch.object(ThreadMessage, "add_reply", return_value=None) as test2:
+                        with patch.object(Request, "start_work", return_value=None) as test3:
+                            SlackThreadMessage().deal_with_thread_message(classified)
+                            test1.assert_called()
+                            test2.assert_not_called()
+                            test3.assert_not_called()
 
     def test_deal_with_new_thread_message_result_saving_data_wo_errors_given_new_thread(
         self, slack_event_types_folder, channel_id, blocks, event_ts, author
     ):
-        with open(os.path.join(slack_event_types_folder, "07_editing_thread.json")) as file:
-            with patch.object(SlackUtils, "get_channel_id", return_value=channel_id):
-                with patch.object(SlackUtils, "get_data_from_event", return_value=(blocks, None, event_ts, author)):
-                    with patch.object(SlackUtils, "get_main_ts", return_value=event_ts):
-                        with patch.object(Request, "get_request_or_throw_exception", return_value=Request()):
-                            with patch.object(ThreadMessage, "add_reply", return_value=None) as test1:
-                                with patch.object(Request, "start_work", return_value=None) as test2:
-                                    SlackThreadMessage().deal_with_thread_message(
-                                        json.load(file), MessageType.THREAD_NEW
-                                    )
-                                    test1.assert_called()
-                                    test2.assert_called()
-
-    def test_deal_with_new_thread_message_result_throw_exception(self):
-        with pytest.raises(Exception):
-            SlackThreadMessage().deal_with_thread_message({}, MessageType.THREAD_NEW)
+        with open(os.path.join(slack_event_types_folder, "06_adding_new_thread.json")) as file:
+            classified = ClassifiedEvent(json.load(file))
+        with patch.object(SlackUtils, "get_data_from_event", return_value=(blocks, None, event_ts, author)):
+            with patch.object(Request, "get_request", return_value=Request()) as get_request:
+                with patch.object(ThreadMessage, "add_reply", return_value=None) as test1:
+                    with patch.object(Request, "start_work", return_value=None) as test2:
+                        SlackThreadMessage().deal_with_thread_message(classified)
+                        test1.assert_called()
+                        test2.assert_called()
+            get_request.assert_called_once_with(classified.channel_id, classified.main_ts)
+
+    def test_deal_with_new_thread_message_result_starting_work_at_main_ts_given_new_thread(
+        self, slack_event_types_folder, blocks, event_ts, author
+    ):
+        with open(os.path.join(slack_event_types_folder, "06_adding_new_thread.json")) as file:
+            classified = ClassifiedEvent(json.load(file))
+        record = Request()
+        with patch.object(SlackUtils, "get_data_from_event", return_value=(blocks, None, event_ts, author)):
+            with patch.object(Request, "get_request", return_value=record):
+                with patch.object(ThreadMessage, "add_reply", return_value=None):
+                    with patch.object(Request, "start_work", return_value=None) as start_work:
+                        SlackThreadMessage().deal_with_thread_message(classified)
+        assert classified.main_ts != event_ts
+        start_work.assert_called_once_with(record, classified.main_ts)
+
+    def test_deal_with_new_thread_message_result_throw_exception_given_request_not_found(
+        self, slack_event_types_folder
+    ):
+        with open(os.path.join(slack_event_types_folder, "06_adding_new_thread.json")) as file:
+            classified = ClassifiedEvent(json.load(file))
+        with patch.object(Request, "get_request", return_value=None):
+            with patch.object(ThreadMessage, "add_reply", return_value=None) as add_reply:
+                with pytest.raises(Exception):
+                    SlackThreadMessage().deal_with_thread_message(classified)
+        add_reply.assert_not_called()
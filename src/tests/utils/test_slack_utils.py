@@ -74,7 +74,7 @@ class TestSlackUtils:
     @pytest.mark.parametrize("item", channel_id_expected_results)
     def test_get_channel_id_results_channel_id(self, item, slack_event_types_folder):
         with open(os.path.join(slack_event_types_folder, item["name"])) as file:
-            with patch.object(Request, "get_request", return_value=item["mock"]):
+            with patch.object(Request, "request_exists", return_value=item["mock"] is not None):
                 assert SlackUtils.get_channel_id(json.load(file)) is not None
 
     def test_get_channel_id_results_throw_exception_given_channel_id_not_provided(self):
@@ -85,7 +85,7 @@ class TestSlackUtils:
     @pytest.mark.parametrize("item", channel_id_expected_results)
     def test_get_main_ts_results_return_main_ts(self, item, slack_event_types_folder):
         with open(os.path.join(slack_event_types_folder, item["name"])) as file:
-            with patch.object(Request, "get_request", return_value=item["mock"]):
+            with patch.object(Request, "request_exists", return_value=item["mock"] is not None):
                 assert SlackUtils.get_main_ts(json.load(file)) is not None
 
     def test_get_main_ts_results_results_throw_exception_given_main_ts_not_provided(self):
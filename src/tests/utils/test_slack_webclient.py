@@ -62,3 +62,15 @@ class TestSlackWebclient:
     def test_get_bot_id(self, web_client):
         with patch.object(WebClient, "auth_test", return_value={"user_id": "user_1"}):
             assert SlackWebclient.get_bot_id(web_client) == "user_1"
+
+    def test_get_bot_id_results_single_auth_test_call(self, web_client):
+        with patch.object(WebClient, "auth_test", return_value={"user_id": "user_1"}) as test:
+            assert SlackWebclient.get_bot_id(web_client) == "user_1"
+            assert SlackWebclient.get_bot_id(web_client) == "user_1"
+            test.assert_called_once()
+
+    def test_get_bot_id_results_new_bot_id_given_token_rotated(self, web_client):
+        with patch.object(WebClient, "auth_test", side_effect=[{"user_id": "user_1"}, {"user_id": "user_2"}]):
+            assert SlackWebclient.get_bot_id(web_client) == "user_1"
+            web_client.token = "xoxb-rotated"
+            assert SlackWebclient.get_bot_id(web_client) == "user_2"